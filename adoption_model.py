@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Adoption Likelihood Model
+Logistic regression of AdoptionLikelihood trained with mini-batch Adagrad, so newly
+ingested records refine the model without retraining, plus vectorized batch scoring
+"""
+
+import threading
+import numpy as np
+import pandas as pd
+
+CATEGORICAL_FEATURES = ['PetType', 'Breed', 'Color', 'Size']
+BINARY_FEATURES = ['Vaccinated', 'HealthCondition', 'PreviousOwner']
+NUMERIC_FEATURES = ['AgeMonths', 'WeightKg', 'TimeInShelterDays', 'AdoptionFee']
+TARGET = 'AdoptionLikelihood'
+
+
+class AdoptionModel:
+    """Streaming logistic regression over the pet_adoption.csv features"""
+
+    def __init__(self, categories, learning_rate=0.1, l2=1e-4, batch_size=256, seed=17):
+        # Category vocabularies are fixed at creation; unseen values encode as all-zero
+        self.categories = {col: list(values) for col, values in categories.items()}
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng(seed)
+        self.lock = threading.Lock()
+
+        self.feature_names = ([f"{col}={value}" for col in CATEGORICAL_FEATURES for value in self.categories[col]]
+                              + BINARY_FEATURES + NUMERIC_FEATURES)
+        n_features = len(self.feature_names)
+        self.weights = np.zeros(n_features)
+        self.bias = 0.0
+        self._grad_sq = np.full(n_features + 1, 1e-8)
+
+        # Running mean/variance (Welford) used to standardize numeric features
+        self.seen = 0
+        self._mean = np.zeros(len(NUMERIC_FEATURES))
+        self._m2 = np.zeros(len(NUMERIC_FEATURES))
+
+    @classmethod
+    def from_frame(cls, frame, epochs=30, **kwargs):
+        categories = {col: sorted(frame[col].dropna().unique()) for col in CATEGORICAL_FEATURES}
+        model = cls(categories, **kwargs)
+        model.partial_fit(frame, epochs=epochs)
+        return model
+
+    def _update_scaler(self, numeric):
+        # Chan et al. parallel update of mean/M2 with a whole batch
+        n_b = len(numeric)
+        if n_b == 0:
+            return
+        mean_b = numeric.mean(axis=0)
+        m2_b = ((numeric - mean_b) ** 2).sum(axis=0)
+        n_a = self.seen
+        total = n_a + n_b
+        delta = mean_b - self._mean
+        self._mean = self._mean + delta * n_b / total
+        self._m2 = self._m2 + m2_b + delta ** 2 * n_a * n_b / total
+        self.seen = total
+
+    def _scale(self, numeric):
+        std = np.sqrt(self._m2 / max(self.seen - 1, 1))
+        return (numeric - self._mean) / np.where(std > 0, std, 1.0)
+
+    # Design matrix: one-hot categoricals, binaries as-is, standardized numerics
+    def encode(self, frame):
+        blocks = []
+        for col in CATEGORICAL_FEATURES:
+            codes = pd.Categorical(frame[col], categories=self.categories[col]).codes
+            onehot = np.zeros((len(frame), len(self.categories[col])))
+            known = codes >= 0
+            onehot[np.flatnonzero(known), codes[known]] = 1.0
+            blocks.append(onehot)
+        blocks.append(frame[BINARY_FEATURES].to_numpy(dtype=float))
+        blocks.append(self._scale(frame[NUMERIC_FEATURES].to_numpy(dtype=float)))
+        return np.hstack(blocks)
+
+    # Mini-batch Adagrad on the logistic loss; safe to call with any number of new records
+    def partial_fit(self, frame, epochs=1):
+        if len(frame) == 0:
+            return self
+        with self.lock:
+            self._update_scaler(frame[NUMERIC_FEATURES].to_numpy(dtype=float))
+            X = self.encode(frame)
+            y = frame[TARGET].to_numpy(dtype=float)
+            for _ in range(epochs):
+                order = self.rng.permutation(len(X))
+                for start in range(0, len(X), self.batch_size):
+                    batch = order[start:start + self.batch_size]
+                    error = _sigmoid(X[batch] @ self.weights + self.bias) - y[batch]
+                    grad = np.append(X[batch].T @ error / len(batch) + self.l2 * self.weights, error.mean())
+                    self._grad_sq += grad ** 2
+                    step = self.learning_rate * grad / np.sqrt(self._grad_sq)
+                    self.weights -= step[:-1]
+                    self.bias -= step[-1]
+        return self
+
+    # Vectorized batch scoring: one matrix-vector product for the whole frame
+    def predict_proba(self, frame):
+        with self.lock:
+            return _sigmoid(self.encode(frame) @ self.weights + self.bias)
+
+    def coefficients(self):
+        with self.lock:
+            return pd.Series(self.weights, index=self.feature_names).sort_values()
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -30, 30)))
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""
+Stratified Sampling Service
+Seeded samples stratified by pet type and adoption outcome, built once per dataset version.
+Any filtered subsample is a prefix of one precomputed order, so repeated renders are
+reproducible and cost a mask lookup instead of a fresh df.sample
+"""
+
+import numpy as np
+
+SAMPLE_STRATA = ['PetType', 'AdoptionLikelihood']
+SAMPLE_SEED = 17
+
+
+class StratifiedSampler:
+    """Fixed sample order over one version of the data; smaller samples are prefixes of larger ones"""
+
+    def __init__(self, frame, strata=SAMPLE_STRATA, seed=SAMPLE_SEED):
+        n = len(frame)
+        # Draws are prefix-stable, so existing rows keep their keys when new records are appended
+        draws = np.random.default_rng(seed).random(n)
+        strata_ids = frame.groupby(strata, sort=True, observed=True).ngroup().to_numpy()
+
+        # Each row's shuffled position within its stratum, as a fraction of the stratum size;
+        # ordering by that fraction interleaves strata in proportion to their sizes
+        by_stratum = np.lexsort((draws, strata_ids))
+        sorted_ids = strata_ids[by_stratum]
+        starts = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+        sizes = np.diff(np.r_[starts, n])
+        rank = np.empty(n)
+        rank[by_stratum] = (np.arange(n) - np.repeat(starts, sizes) + 0.5) / np.repeat(sizes, sizes)
+        self.order = np.lexsort((draws, rank))
+
+    # Positions of up to n sampled rows among those selected by a boolean mask
+    def sample(self, mask, n):
+        mask = np.asarray(mask, dtype=bool)
+        return self.order[mask[self.order]][:n]
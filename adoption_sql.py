@@ -0,0 +1,420 @@
+# -*- coding: utf-8 -*-
+"""
+Embedded SQL Backend
+Indexed SQLite copy of pet_adoption.csv that answers the dashboard's filter + groupby work in SQL.
+Only aggregates leave the database, so a query's Python memory is bounded by the size of its result
+rather than the number of matching rows. The dashboard does not use it: every view there is answered
+from the in-memory store, which the benchmark shows is faster at every size measured
+
+Usage:
+    python adoption_sql.py build pet_adoption.csv pet_adoption.db
+    python adoption_sql.py benchmark --sizes 10000 100000 1000000
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from contextlib import closing
+import numpy as np
+import pandas as pd
+from adoption_store import (COLUMNS, CATEGORICAL_COLUMNS, FLOAT_COLUMNS, INTEGER_COLUMNS, CUBE_MEASURES,
+                            PRODUCT_PAIRS, PRODUCT_MEASURES, HISTOGRAM_BIN_WIDTHS)
+from adoption_stats import (rate_table, correlation_from_cells, rebin_histogram, box_summary, density_grid,
+                            kaplan_meier, kaplan_meier_from_counts, pivot_from_cells, feature_importance)
+from data_sources import CSV_CHUNK_ROWS, dashboard_predicates, predicate_mask, sql_where
+from data_validation import Quarantine, default_quarantine_path, validate_frame
+
+DEFAULT_TABLE = 'pets'
+
+# Columns behind the dashboard filters
+INDEXED_COLUMNS = ['PetType', 'Vaccinated', 'HealthCondition', 'AgeMonths']
+
+SQL_TYPES = {col: 'TEXT' if col in CATEGORICAL_COLUMNS else 'REAL' if col in FLOAT_COLUMNS else 'INTEGER'
+             for col in COLUMNS}
+
+# SQL aggregate of every cube measure, so grouped query results have the shape of cube cells
+MEASURE_SQL = {
+    'Count': 'COUNT(*)',
+    'Adopted': 'SUM("AdoptionLikelihood")',
+    'VaccinatedSum': 'SUM("Vaccinated")',
+    'FeeSum': 'SUM("AdoptionFee")',
+    'ShelterDaysSum': 'SUM("TimeInShelterDays")',
+    'WeightSum': 'SUM("WeightKg")',
+    'AgeSum': 'SUM("AgeMonths")'
+}
+MEASURE_SQL.update({name: f'SUM(CAST("{a}" AS REAL) * "{b}")' for (a, b), name in zip(PRODUCT_PAIRS, PRODUCT_MEASURES)})
+
+# Age groups of the Overview tab's age chart
+OVERVIEW_AGE_BINS = [0, 1, 3, 7, 15, 100]
+OVERVIEW_AGE_LABELS = ['0-1y', '1-3y', '3-7y', '7-15y', '15+y']
+OVERVIEW_DIMENSIONS = ['PetType', 'Vaccinated', 'HealthCondition', 'Size']
+
+# An index range scan fetches each matching row from the table by PetID, several times the cost of
+# reading it in a sequential scan, so an index only pays off for filters at least this selective
+INDEX_SELECTIVITY = 0.1
+
+BENCHMARK_SIZES = [10000, 100000, 1000000]
+
+
+# SQL floor() that does not depend on SQLite being built with its math functions
+def _floor_sql(expr):
+    return f'(CAST({expr} AS INTEGER) - ({expr} < CAST({expr} AS INTEGER)))'
+
+
+# CASE expression mapping AgeMonths to pd.cut(AgeMonths / 12, bins, labels) labels (right-closed bins)
+def _age_group_sql(bins, labels):
+    cases = ' '.join(f"""WHEN "AgeMonths" > {lo * 12} AND "AgeMonths" <= {hi * 12} THEN '{label.replace("'", "''")}'"""
+                     for lo, hi, label in zip(bins[:-1], bins[1:], labels))
+    return f'CASE {cases} END'
+
+
+# Dense fine-bin histogram in the layout of PetAdoptionStore.histogram from sparse (Bin, NotAdopted, Adopted) rows
+def _fine_histogram(column, sparse):
+    width = HISTOGRAM_BIN_WIDTHS[column]
+    if sparse.empty:
+        return pd.DataFrame(columns=['BinStart', 'BinEnd', 'Value', 'NotAdopted', 'Adopted'])
+    bins = sparse['Bin'].to_numpy(dtype=np.int64)
+    first = bins.min()
+    n_bins = bins.max() - first + 1
+    not_adopted_counts = np.zeros(n_bins, dtype=np.int64)
+    adopted_counts = np.zeros(n_bins, dtype=np.int64)
+    not_adopted_counts[bins - first] = sparse['NotAdopted'].to_numpy(dtype=np.int64)
+    adopted_counts[bins - first] = sparse['Adopted'].to_numpy(dtype=np.int64)
+    starts = (first + np.arange(n_bins)) * width
+    exact = column in INTEGER_COLUMNS and width == 1
+    return pd.DataFrame({
+        'BinStart': starts,
+        'BinEnd': starts + width,
+        'Value': starts if exact else starts + width / 2,
+        'NotAdopted': not_adopted_counts,
+        'Adopted': adopted_counts
+    })
+
+
+class AdoptionDatabase:
+    """SQLite table of pets with filter-column indexes; every chart aggregation runs as one SQL query.
+    filters is a (pet_type, age_range, vaccine_status, health_condition) tuple as sent by the dashboard"""
+
+    def __init__(self, path, table=DEFAULT_TABLE):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+        self.path = path
+        self.table = table
+        self._value_counts = {}
+
+    # Stream a CSV into a fresh table chunk by chunk, then index the filter columns.
+    # Duplicate PetIDs keep the last record, as in PetAdoptionStore.load_frame.
+    # Rows failing validation are left out and written to quarantine_path (default quarantine/<name>.rejected.csv)
+    @classmethod
+    def build(cls, csv_path, db_path, table=DEFAULT_TABLE, chunk_rows=CSV_CHUNK_ROWS, quarantine_path=None):
+        database = cls(db_path, table)
+        quarantine = Quarantine(quarantine_path or default_quarantine_path(csv_path))
+        columns_sql = ', '.join(f'"{col}" {SQL_TYPES[col]}' + (' PRIMARY KEY' if col == 'PetID' else '')
+                                for col in COLUMNS)
+        with closing(sqlite3.connect(db_path)) as connection:
+            # A half-built database is simply rebuilt, so skip the journal while loading
+            connection.execute('PRAGMA journal_mode = OFF')
+            connection.execute('PRAGMA synchronous = OFF')
+            connection.execute(f'DROP TABLE IF EXISTS "{table}"')
+            connection.execute(f'CREATE TABLE "{table}" ({columns_sql})')
+            for chunk in pd.read_csv(csv_path, usecols=COLUMNS, chunksize=chunk_rows):
+                chunk, rejected = validate_frame(chunk)
+                quarantine.add(rejected)
+                database._insert(connection, chunk)
+            for col in INDEXED_COLUMNS:
+                connection.execute(f'CREATE INDEX "{table}_{col}" ON "{table}" ("{col}")')
+            connection.execute('ANALYZE')
+            connection.commit()
+        if quarantine.rows:
+            print(f"⚠️ {quarantine.summary()}")
+        return database
+
+    def _insert(self, connection, frame):
+        frame = frame[COLUMNS].astype({col: str if col in CATEGORICAL_COLUMNS else float if col in FLOAT_COLUMNS
+                                       else np.int64 for col in COLUMNS})
+        placeholders = ', '.join('?' * len(COLUMNS))
+        connection.executemany(f'INSERT OR REPLACE INTO "{self.table}" VALUES ({placeholders})',
+                               frame.astype(object).to_numpy().tolist())
+
+    # Insert new intakes or replace existing PetIDs (e.g. records accepted by /api/ingest)
+    def upsert(self, frame):
+        with closing(sqlite3.connect(self.path)) as connection:
+            self._insert(connection, frame)
+            connection.commit()
+        self._value_counts = {}
+
+    def query(self, sql, params=()):
+        with closing(sqlite3.connect(self.path)) as connection:
+            return pd.read_sql_query(sql, connection, params=list(params))
+
+    # Rows per distinct value of an indexed column, read from its index and cached until the next upsert
+    def value_counts(self, col):
+        if col not in self._value_counts:
+            counts = self.query(f'SELECT "{col}" AS value, COUNT(*) AS n FROM "{self.table}" GROUP BY 1')
+            self._value_counts[col] = pd.Series(counts['n'].to_numpy(), index=counts['value'].to_numpy())
+        return self._value_counts[col]
+
+    # WHERE clause for the dashboard filters that lets SQLite use at most one index: the most selective
+    # filter column's, and only if it is selective enough. SQLite keeps no range statistics, so left to
+    # itself it walks the AgeMonths index even when the age slider spans every pet.
+    def _where(self, filters):
+        predicates = dashboard_predicates(*filters)
+        selectivity = {}
+        for col in dict.fromkeys(col for col, _, _ in predicates):
+            counts = self.value_counts(col)
+            mask = predicate_mask(pd.DataFrame({col: counts.index}), [p for p in predicates if p[0] == col])
+            selectivity[col] = counts.to_numpy()[mask].sum() / max(counts.sum(), 1)
+        best = min(selectivity, key=selectivity.get, default=None)
+        if best is not None and selectivity[best] > INDEX_SELECTIVITY:
+            best = None
+        return sql_where(predicates, unindexed=[col for col in selectivity if col != best])
+
+    def __len__(self):
+        return int(self.query(f'SELECT COUNT(*) AS n FROM "{self.table}"')['n'].iloc[0])
+
+    # Count, adoptions and adoption rate per group - the Overview charts'
+    # groupby(dimension)['AdoptionLikelihood'].agg(['count', 'sum', 'mean'])
+    def group_stats(self, dimension, filters=(), age_bins=OVERVIEW_AGE_BINS, age_labels=OVERVIEW_AGE_LABELS):
+        where, params = self._where(filters)
+        key = _age_group_sql(age_bins, age_labels) if dimension == 'AgeGroup' else f'"{dimension}"'
+        order = 'MIN("AgeMonths")' if dimension == 'AgeGroup' else '1'
+        stats = self.query(f'SELECT {key} AS "{dimension}", COUNT(*) AS "count", SUM("AdoptionLikelihood") AS "sum", '
+                           f'AVG("AdoptionLikelihood") AS "mean" FROM "{self.table}"{where} '
+                           f'GROUP BY 1 HAVING "{dimension}" IS NOT NULL ORDER BY {order}', params)
+        return stats.set_index(dimension)
+
+    # Cube measures summed per combination of the given dimensions (cube cells rolled up to them)
+    def cells(self, dimensions, filters=()):
+        where, params = self._where(filters)
+        keys = ', '.join(f'"{dim}"' for dim in dimensions)
+        measures = ', '.join(f'{MEASURE_SQL[name]} AS "{name}"' for name in CUBE_MEASURES)
+        sql = f'SELECT {keys + ", " if keys else ""}{measures} FROM "{self.table}"{where}'
+        if keys:
+            sql += f' GROUP BY {keys} ORDER BY {keys}'
+        cells = self.query(sql, params)
+        cells[CUBE_MEASURES] = cells[CUBE_MEASURES].astype(float).fillna(0.0)
+        return cells
+
+    def kpis(self, filters=()):
+        totals = self.cells([], filters).iloc[0]
+        count = totals['Count']
+        return {
+            'TotalPets': int(count),
+            'Adopted': int(totals['Adopted']),
+            'AdoptionRate': totals['Adopted'] / count if count else 0.0,
+            'VaccinationRate': totals['VaccinatedSum'] / count if count else 0.0,
+            'AvgAdoptionFee': totals['FeeSum'] / count if count else 0.0,
+            'AvgShelterDays': totals['ShelterDaysSum'] / count if count else 0.0,
+            'AvgAgeMonths': totals['AgeSum'] / count if count else 0.0
+        }
+
+    def rate_table(self, dimension, filters=()):
+        return rate_table(self.cells([dimension], filters), dimension)
+
+    def correlation(self, filters=()):
+        return correlation_from_cells(self.cells([], filters))
+
+    def pivot(self, rows, columns=None, measure='AdoptionRate', filters=(), age_bins=None, age_labels=None):
+        dimensions = ['AgeMonths' if dim == 'AgeGroup' else dim for dim in [rows, columns] if dim]
+        cells = self.cells(list(dict.fromkeys(dimensions)), filters)
+        return pivot_from_cells(cells, rows, columns, measure, age_bins, age_labels)
+
+    def feature_importance(self, dimensions, filters=(), age_bins=None, age_labels=None):
+        return feature_importance(self.cells(dimensions, filters), dimensions, age_bins, age_labels)
+
+    def _fine_counts(self, column, filters, group_by=None):
+        where, params = self._where(filters)
+        width = HISTOGRAM_BIN_WIDTHS[column]
+        bin_sql = f'"{column}"' if column in INTEGER_COLUMNS and width == 1 else _floor_sql(f'("{column}" / {float(width)})')
+        group = f'"{group_by}" AS "Group", ' if group_by else ''
+        return self.query(f'SELECT {group}{bin_sql} AS "Bin", SUM(1 - "AdoptionLikelihood") AS "NotAdopted", '
+                          f'SUM("AdoptionLikelihood") AS "Adopted" FROM "{self.table}"{where} '
+                          f'GROUP BY {"1, 2" if group_by else "1"} ORDER BY {"1, 2" if group_by else "1"}', params)
+
+    # Fine-bin histogram re-binned to n_bins, as the dashboard's filtered_histogram
+    def histogram(self, column, filters=(), n_bins=30):
+        return rebin_histogram(_fine_histogram(column, self._fine_counts(column, filters)), n_bins)
+
+    # Box plot statistics per group, as the dashboard's filtered_box_summaries
+    def box_summaries(self, column, group_by, filters=()):
+        summaries = {}
+        for group, sparse in self._fine_counts(column, filters, group_by).groupby('Group'):
+            summary = box_summary(_fine_histogram(column, sparse))
+            if summary is not None:
+                summaries[group] = summary
+        return summaries
+
+    # Counts and adoption rates on a fixed grid over the full-data ranges, as adoption_stats.density_grid
+    def density_grid(self, x_col, y_col, filters=(), bins=(60, 40)):
+        bounds = self.query(f'SELECT MIN("{x_col}") AS x0, MAX("{x_col}") AS x1, MIN("{y_col}") AS y0, '
+                            f'MAX("{y_col}") AS y1 FROM "{self.table}"').iloc[0]
+        edges, bin_sql = [], []
+        for col, lo, hi, n in [(x_col, bounds['x0'], bounds['x1'], bins[0]), (y_col, bounds['y0'], bounds['y1'], bins[1])]:
+            lo, hi = float(lo), float(hi)
+            if lo == hi:
+                lo, hi = lo - 0.5, hi + 0.5
+            edges.append(np.linspace(lo, hi, n + 1))
+            # Values are never below the table minimum, so truncation is floor; the right edge of
+            # the last bin is closed, as in np.histogram2d
+            bin_sql.append(f'MIN(CAST(("{col}" - {lo!r}) * {n / (hi - lo)!r} AS INTEGER), {n - 1})')
+        where, params = self._where(filters)
+        sparse = self.query(f'SELECT {bin_sql[0]} AS ix, {bin_sql[1]} AS iy, COUNT(*) AS n, '
+                            f'SUM("AdoptionLikelihood") AS adopted FROM "{self.table}"{where} GROUP BY 1, 2', params)
+        counts = np.zeros(bins)
+        adopted_counts = np.zeros(bins)
+        counts[sparse['ix'], sparse['iy']] = sparse['n']
+        adopted_counts[sparse['ix'], sparse['iy']] = sparse['adopted']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rates = np.where(counts > 0, adopted_counts / counts, np.nan)
+        return {'counts': counts.T, 'rates': rates.T, 'x_edges': edges[0], 'y_edges': edges[1]}
+
+    # Kaplan-Meier curves from per-(group, day) counts, as the dashboard's filtered_survival_curves;
+    # AgeGroup is derived from AgeMonths as in group_stats
+    def survival_curves(self, group_by=None, filters=(), age_bins=OVERVIEW_AGE_BINS, age_labels=OVERVIEW_AGE_LABELS):
+        where, params = self._where(filters)
+        if group_by == 'AgeGroup':
+            group = _age_group_sql(age_bins, age_labels)
+        else:
+            group = f'"{group_by}"' if group_by else "'All'"
+        table = self.query(f'SELECT {group} AS "Group", "TimeInShelterDays" AS "Time", COUNT(*) AS "Total", '
+                           f'SUM("AdoptionLikelihood") AS "Events" FROM "{self.table}"{where} '
+                           f'GROUP BY 1, 2 HAVING "Group" IS NOT NULL ORDER BY 1, 2', params)
+        # An empty result comes back with object columns, which the cumulative sums cannot take
+        table = table.astype({'Time': np.int64, 'Total': np.int64, 'Events': float})
+        return kaplan_meier_from_counts(table.set_index(['Group', 'Time']))
+
+
+# The dashboard's in-memory path for one filter state: apply_filters, then each chart's groupby
+def pandas_chart_work(frame, filters, ranges):
+    filtered = frame[predicate_mask(frame, dashboard_predicates(*filters))]
+    results = {dim: filtered.groupby(dim)['AdoptionLikelihood'].agg(['count', 'sum', 'mean'])
+               for dim in OVERVIEW_DIMENSIONS}
+    age_groups = pd.cut(filtered['AgeMonths'] / 12, bins=OVERVIEW_AGE_BINS, labels=OVERVIEW_AGE_LABELS)
+    results['AgeGroup'] = filtered.groupby(age_groups, observed=True)['AdoptionLikelihood'].agg(['count', 'sum', 'mean'])
+    results['fee_histogram'] = np.histogram(filtered['AdoptionFee'], bins=30)
+    results['density'] = density_grid(filtered['WeightKg'], filtered['AdoptionFee'], filtered['AdoptionLikelihood'],
+                                      *ranges)
+    results['survival'] = kaplan_meier(filtered, 'PetType')
+    return results
+
+
+# The same charts answered by the database
+def sql_chart_work(database, filters):
+    results = {dim: database.group_stats(dim, filters) for dim in OVERVIEW_DIMENSIONS}
+    results['AgeGroup'] = database.group_stats('AgeGroup', filters)
+    results['fee_histogram'] = database.histogram('AdoptionFee', filters)
+    results['density'] = database.density_grid('WeightKg', 'AdoptionFee', filters)
+    results['survival'] = database.survival_curves('PetType', filters)
+    return results
+
+
+# CSV of `rows` pets resampled from a source CSV with fresh PetIDs, written in chunks
+def synthetic_csv(source_csv, rows, path, seed=17, chunk_rows=CSV_CHUNK_ROWS):
+    base = pd.read_csv(source_csv, usecols=COLUMNS)
+    rng = np.random.default_rng(seed)
+    for start in range(0, rows, chunk_rows):
+        n = min(chunk_rows, rows - start)
+        chunk = base.iloc[rng.integers(0, len(base), n)].copy()
+        chunk['PetID'] = np.arange(start, start + n)
+        chunk.to_csv(path, mode='w' if start == 0 else 'a', header=start == 0, index=False)
+    return path
+
+
+def _peak_mb(func, *args):
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+# Load + per-filter-state query time and peak Python heap of both paths at several data sizes.
+# SQLite's own page cache lives outside the Python heap and is capped by its cache_size (about 2 MB by default).
+def benchmark(source_csv, sizes=BENCHMARK_SIZES, presets=None, workdir=None):
+    from figure_export import FILTER_PRESETS
+
+    presets = [FILTER_PRESETS[name] for name in (presets or FILTER_PRESETS)]
+    rows = []
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for size in sizes:
+            csv_path = synthetic_csv(source_csv, size, os.path.join(tmp, f'pets_{size}.csv'))
+
+            start = time.perf_counter()
+            frame = pd.read_csv(csv_path)
+            pandas_load = time.perf_counter() - start
+            ranges = [(float(frame[col].min()), float(frame[col].max())) for col in ['WeightKg', 'AdoptionFee']]
+            pandas_times = []
+            for filters in presets:
+                start = time.perf_counter()
+                pandas_chart_work(frame, filters, ranges)
+                pandas_times.append(time.perf_counter() - start)
+            del frame
+            pandas_peak = _peak_mb(lambda: [pandas_chart_work(pd.read_csv(csv_path), filters, ranges)
+                                            for filters in presets[:1]])
+
+            start = time.perf_counter()
+            database = AdoptionDatabase.build(csv_path, os.path.join(tmp, f'pets_{size}.db'))
+            sql_build = time.perf_counter() - start
+            sql_times = []
+            for filters in presets:
+                start = time.perf_counter()
+                sql_chart_work(database, filters)
+                sql_times.append(time.perf_counter() - start)
+            sql_peak = _peak_mb(lambda: [sql_chart_work(database, filters) for filters in presets[:1]])
+
+            rows.append({
+                'rows': size,
+                'pandas_load_s': pandas_load,
+                'pandas_query_ms': 1000 * float(np.median(pandas_times)),
+                'pandas_peak_mb': pandas_peak,
+                'sqlite_build_s': sql_build,
+                'sqlite_query_ms': 1000 * float(np.median(sql_times)),
+                'sqlite_peak_mb': sql_peak
+            })
+            print_benchmark_row(rows[-1])
+    return rows
+
+
+def print_benchmark_row(row):
+    print(f"{row['rows']:>10,} rows | pandas: load {row['pandas_load_s']:6.2f}s, {row['pandas_query_ms']:8.1f} ms/filter, "
+          f"peak {row['pandas_peak_mb']:7.1f} MB | sqlite: build {row['sqlite_build_s']:6.2f}s, "
+          f"{row['sqlite_query_ms']:8.1f} ms/filter, peak {row['sqlite_peak_mb']:6.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the indexed SQLite database and benchmark it against pandas")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="load a CSV into an indexed SQLite database")
+    build.add_argument('csv', help="source CSV (pet_adoption.csv schema)")
+    build.add_argument('db', help="SQLite database file to (re)create")
+    build.add_argument('--table', default=DEFAULT_TABLE)
+    build.add_argument('--chunk-rows', type=int, default=CSV_CHUNK_ROWS)
+    build.add_argument('--quarantine', help="CSV for rows failing validation (default: quarantine/<name>.rejected.csv)")
+    bench = commands.add_parser('benchmark', help="compare the SQL and in-memory pandas paths at several sizes")
+    bench.add_argument('--csv', default='pet_adoption.csv', help="CSV the synthetic datasets are resampled from")
+    bench.add_argument('--sizes', type=int, nargs='+', default=BENCHMARK_SIZES)
+    bench.add_argument('--preset', nargs='+', help="figure_export filter presets to time (default: all)")
+    bench.add_argument('--workdir', help="directory for the temporary CSV and database files")
+    bench.add_argument('--json', help="also write the results to this file")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        database = AdoptionDatabase.build(args.csv, args.db, args.table, args.chunk_rows, args.quarantine)
+        print(f"🗄️ {len(database):,} pets in {args.db}:{args.table} ({time.perf_counter() - start:.1f}s), "
+              f"indexed on {', '.join(INDEXED_COLUMNS)}")
+        return
+
+    rows = benchmark(args.csv, args.sizes, args.preset, args.workdir)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
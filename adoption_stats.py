@@ -0,0 +1,373 @@
+# -*- coding: utf-8 -*-
+"""
+Adoption Statistics
+Vectorized statistics computed from cube sufficient statistics rather than raw rows
+"""
+
+import numpy as np
+import pandas as pd
+from adoption_store import CUBE_MEASURES, CORRELATION_COLUMNS, SUM_MEASURE_OF, PRODUCT_PAIRS, PRODUCT_MEASURES
+
+POSTERIOR_DRAWS = 4000
+POSTERIOR_SEED = 17
+
+
+# Jeffreys intervals for many adoption rates at once.
+# The bounds of a group with k adoptions out of n are quantiles of its Jeffreys posterior
+# Beta(k + 1/2, n - k + 1/2), estimated from one (groups x draws) matrix of samples - no Python loops.
+# Small all-or-nothing groups (k = 0 or k = n) get the wide interval their size warrants.
+def jeffreys_rate_intervals(counts, adopted, draws=POSTERIOR_DRAWS, confidence=0.95, seed=POSTERIOR_SEED):
+    counts = np.asarray(counts, dtype=float)
+    adopted = np.asarray(adopted, dtype=float)
+    rates = np.divide(adopted, counts, out=np.zeros(len(counts)), where=counts > 0)
+
+    rng = np.random.default_rng(seed)
+    samples = rng.beta(adopted[:, None] + 0.5, (counts - adopted)[:, None] + 0.5, size=(len(counts), draws))
+
+    alpha = (1 - confidence) / 2
+    lower, upper = np.quantile(samples, [alpha, 1 - alpha], axis=1)
+    return rates, lower, upper
+
+
+# Adoption rate per group of one dimension with Jeffreys interval bounds, from (filtered) cube cells
+def rate_table(cells, dimension, **interval_kwargs):
+    grouped = cells.groupby(dimension)[['Count', 'Adopted']].sum()
+    grouped = grouped[grouped['Count'] > 0]
+    rates, lower, upper = jeffreys_rate_intervals(grouped['Count'].to_numpy(), grouped['Adopted'].to_numpy(),
+                                                  **interval_kwargs)
+    return pd.DataFrame({
+        'Count': grouped['Count'].astype(int).to_numpy(),
+        'Adopted': grouped['Adopted'].astype(int).to_numpy(),
+        'Rate': rates,
+        'Lower': lower,
+        'Upper': upper
+    }, index=grouped.index)
+
+
+# Kaplan-Meier curves for every group in one sort-based pass.
+# Adopted animals are events at TimeInShelterDays; everyone else is censored there.
+# Returns one row per (group, distinct time) with AtRisk, Events, Censored and Survival.
+def kaplan_meier(frame, group_by=None, duration='TimeInShelterDays', event='AdoptionLikelihood'):
+    groups = frame[group_by] if group_by else pd.Series('All', index=frame.index)
+    table = pd.DataFrame({
+        'Group': groups.to_numpy(),
+        'Time': frame[duration].to_numpy(),
+        'Events': frame[event].to_numpy(dtype=float)
+    })
+    table = table.groupby(['Group', 'Time'], sort=True).agg(Total=('Events', 'size'), Events=('Events', 'sum'))
+    return kaplan_meier_from_counts(table)
+
+
+# Kaplan-Meier curves from per-(Group, Time) Total and Events counts, indexed and sorted by (Group, Time)
+def kaplan_meier_from_counts(table):
+    by_group = table.groupby(level='Group')
+
+    # At risk at t = group size minus everyone who left strictly before t
+    group_size = by_group['Total'].transform('sum')
+    left_before = by_group['Total'].cumsum() - table['Total']
+    table['AtRisk'] = group_size - left_before
+    table['Censored'] = table['Total'] - table['Events']
+
+    # S(t) = prod(1 - d/n), accumulated as a sum of logs per group
+    with np.errstate(divide='ignore'):
+        log_terms = np.log1p(-table['Events'] / table['AtRisk'])
+    table['Survival'] = np.exp(log_terms.groupby(level='Group').cumsum())
+    return table.drop(columns='Total').reset_index()
+
+
+# Survival probability of each group at the given days (step function lookup)
+def survival_at(curves, days):
+    rows = {}
+    for group, curve in curves.groupby('Group'):
+        idx = np.searchsorted(curve['Time'].to_numpy(), days, side='right') - 1
+        survival = curve['Survival'].to_numpy()
+        rows[group] = [survival[i] if i >= 0 else 1.0 for i in idx]
+    return pd.DataFrame.from_dict(rows, orient='index', columns=[f"Day {d}" for d in days])
+
+
+# Pearson correlation matrix of CORRELATION_COLUMNS from summed cube cells:
+# cov(x, y) = (sum xy - sum x * sum y / n) / (n - 1)
+def correlation_from_cells(cells):
+    totals = pd.Series(cells[CUBE_MEASURES].to_numpy().sum(axis=0), index=CUBE_MEASURES)
+    n = totals['Count']
+    k = len(CORRELATION_COLUMNS)
+    if n < 2:
+        return pd.DataFrame(np.full((k, k), np.nan), index=CORRELATION_COLUMNS, columns=CORRELATION_COLUMNS)
+
+    sums = np.array([totals[SUM_MEASURE_OF[col]] for col in CORRELATION_COLUMNS])
+    products = np.zeros((k, k))
+    for (a, b), name in zip(PRODUCT_PAIRS, PRODUCT_MEASURES):
+        i, j = CORRELATION_COLUMNS.index(a), CORRELATION_COLUMNS.index(b)
+        products[i, j] = products[j, i] = totals[name]
+
+    cov = (products - np.outer(sums, sums) / n) / (n - 1)
+    std = np.sqrt(np.clip(np.diag(cov), 0, None))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = cov / np.outer(std, std)
+    return pd.DataFrame(corr, index=CORRELATION_COLUMNS, columns=CORRELATION_COLUMNS)
+
+
+# Re-bin a fine histogram (PetAdoptionStore.histogram) into at most n_bins equal-width bins.
+# Each coarse bin is a whole number of fine bins, so merged counts stay exact.
+def rebin_histogram(fine, n_bins=30):
+    if fine.empty:
+        # Typed empty columns: plotly rejects the object-dtype ones an empty merge comes back with
+        return pd.DataFrame({
+            'BinStart': np.empty(0),
+            'BinEnd': np.empty(0),
+            'NotAdopted': np.empty(0, dtype=np.int64),
+            'Adopted': np.empty(0, dtype=np.int64),
+            'Count': np.empty(0, dtype=np.int64)
+        })
+    fine_width = float(fine['BinEnd'].iloc[0] - fine['BinStart'].iloc[0])
+    lo, hi = fine['BinStart'].min(), fine['BinEnd'].max()
+    factor = max(int(np.ceil((hi - lo) / fine_width / n_bins)), 1)
+
+    group = np.rint((fine['BinStart'].to_numpy() - lo) / fine_width).astype(np.int64) // factor
+    coarse = fine.groupby(group)[['NotAdopted', 'Adopted']].sum()
+    starts = lo + coarse.index.to_numpy() * factor * fine_width
+    return pd.DataFrame({
+        'BinStart': starts,
+        'BinEnd': starts + factor * fine_width,
+        'NotAdopted': coarse['NotAdopted'].to_numpy(),
+        'Adopted': coarse['Adopted'].to_numpy(),
+        'Count': (coarse['NotAdopted'] + coarse['Adopted']).to_numpy()
+    })
+
+
+# Weighted quantiles of a merged fine histogram, using numpy's default linear interpolation
+# between order statistics - exact for integer columns with unit bins, within half a bin otherwise
+def histogram_quantiles(hist, quantiles):
+    counts = (hist['NotAdopted'] + hist['Adopted']).to_numpy(dtype=np.int64)
+    values = hist['Value'].to_numpy(dtype=float)
+    nonzero = counts > 0
+    counts, values = counts[nonzero], values[nonzero]
+    n = counts.sum()
+    if n == 0:
+        return np.full(len(quantiles), np.nan)
+
+    cumulative = np.cumsum(counts)
+    positions = np.asarray(quantiles, dtype=float) * (n - 1)
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.ceil(positions).astype(np.int64)
+    lower_values = values[np.searchsorted(cumulative, lower, side='right')]
+    upper_values = values[np.searchsorted(cumulative, upper, side='right')]
+    return lower_values + (upper_values - lower_values) * (positions - lower)
+
+
+# Box plot statistics (Tukey whiskers) from a merged fine histogram - fixed size whatever the row count
+def box_summary(hist):
+    q1, median, q3 = histogram_quantiles(hist, [0.25, 0.5, 0.75])
+    counts = (hist['NotAdopted'] + hist['Adopted']).to_numpy()
+    values = hist['Value'].to_numpy(dtype=float)[counts > 0]
+    counts = counts[counts > 0]
+    if len(values) == 0:
+        return None
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    return {
+        'n': int(counts.sum()),
+        'mean': float((values * counts).sum() / counts.sum()),
+        'q1': float(q1),
+        'median': float(median),
+        'q3': float(q3),
+        'lowerfence': float(inside.min()),
+        'upperfence': float(inside.max()),
+        'min': float(values.min()),
+        'max': float(values.max())
+    }
+
+
+# Deterministic 2D aggregation of every point: per-cell count and adoption rate on a fixed grid
+def density_grid(x, y, adopted, x_range, y_range, bins=(60, 40)):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    adopted = np.asarray(adopted, dtype=float)
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins, range=[x_range, y_range])
+    adopted_counts, _, _ = np.histogram2d(x, y, bins=bins, range=[x_range, y_range], weights=adopted)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rates = np.where(counts > 0, adopted_counts / counts, np.nan)
+    # Transpose so rows follow y and columns follow x, as image/heatmap traces expect
+    return {'counts': counts.T, 'rates': rates.T, 'x_edges': x_edges, 'y_edges': y_edges}
+
+
+# Indices of at most `budget` points spread over a coarse spatial grid: every occupied cell keeps
+# its highest-priority points up to a common quota, so sparse regions survive decimation
+def stratified_decimation(x, y, budget, x_range, y_range, priority=None, grid=(48, 48)):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= budget:
+        return np.arange(n)
+    if priority is None:
+        priority = np.arange(n)
+
+    def grid_index(values, bounds, size):
+        span = max(bounds[1] - bounds[0], 1e-12)
+        return np.clip(((values - bounds[0]) / span * size).astype(int), 0, size - 1)
+
+    cell = grid_index(x, x_range, grid[0]) * grid[1] + grid_index(y, y_range, grid[1])
+    order = np.lexsort((priority, cell))
+    sorted_cells = cell[order]
+    starts = np.flatnonzero(np.r_[True, sorted_cells[1:] != sorted_cells[:-1]])
+    counts = np.diff(np.r_[starts, n])
+    rank = np.arange(n) - np.repeat(starts, counts)
+
+    # Largest per-cell quota that fits the budget, then fill the remainder from the next rank
+    low, high = 0, int(counts.max())
+    while low < high:
+        mid = (low + high + 1) // 2
+        if np.minimum(counts, mid).sum() <= budget:
+            low = mid
+        else:
+            high = mid - 1
+    keep = rank < low
+    extra = np.flatnonzero(rank == low)
+    remaining = budget - int(keep.sum())
+    if remaining > 0 and len(extra):
+        keep[extra[np.argsort(priority[order][extra], kind='stable')[:remaining]]] = True
+    return np.sort(order[keep])
+
+
+# Rank attributes by their association with adoption for the cells of one filter state.
+# Every score comes from a (levels x adopted/not) table of cube counts, so cost scales with cells, not pets.
+def feature_importance(cells, dimensions, age_bins=None, age_labels=None, min_count=10):
+    rows = []
+    for dimension in dimensions:
+        key = cells[dimension]
+        if dimension == 'AgeMonths' and age_bins is not None:
+            key = pd.cut(cells['AgeMonths'] / 12, bins=age_bins, labels=age_labels)
+        table = cells.groupby(key, observed=True)[['Count', 'Adopted']].sum()
+        table = table[table['Count'] > 0]
+        if len(table) < 2:
+            continue
+        counts = table['Count'].to_numpy(dtype=float)
+        adopted = table['Adopted'].to_numpy(dtype=float)
+        observed = np.column_stack([adopted, counts - adopted])
+        total = observed.sum()
+        outcome_totals = observed.sum(axis=0)
+        if total == 0 or (outcome_totals == 0).any():
+            continue
+
+        expected = np.outer(counts, outcome_totals) / total
+        chi_square = float(((observed - expected) ** 2 / expected).sum())
+        joint = observed / total
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mutual_info = float(np.nansum(joint * np.log2(joint / np.outer(counts / total, outcome_totals / total))))
+
+        # Rate spread only over levels with enough pets to be meaningful
+        rates = pd.Series(adopted / counts, index=table.index)[counts >= min_count]
+        if rates.empty:
+            rates = pd.Series(adopted / counts, index=table.index)
+        rows.append({
+            'Attribute': 'AgeGroup' if dimension == 'AgeMonths' and age_bins is not None else dimension,
+            'Levels': len(table),
+            'MutualInfo': mutual_info,
+            'ChiSquare': chi_square,
+            'CramersV': np.sqrt(chi_square / total),
+            'RateSpread': rates.max() - rates.min(),
+            'BestLevel': rates.idxmax(),
+            'BestRate': rates.max(),
+            'WorstLevel': rates.idxmin(),
+            'WorstRate': rates.min()
+        })
+    ranking = pd.DataFrame(rows, columns=['Attribute', 'Levels', 'MutualInfo', 'ChiSquare', 'CramersV', 'RateSpread',
+                                          'BestLevel', 'BestRate', 'WorstLevel', 'WorstRate'])
+    return ranking.sort_values('MutualInfo', ascending=False, ignore_index=True)
+
+
+class FrequencyTable:
+    """Counts of a bounded integer column stored as an offset bincount; tables from any chunks merge by addition"""
+
+    def __init__(self, offset=0, counts=None):
+        self.offset = int(offset)
+        self.counts = np.zeros(0, dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+
+    @classmethod
+    def from_values(cls, values):
+        values = np.asarray(values)
+        if values.dtype.kind not in 'iu':
+            # Float input (e.g. an integer column with missing values): drop NaN, require whole numbers
+            values = values.astype(float)
+            values = values[~np.isnan(values)]
+            if not np.array_equal(values, np.floor(values)):
+                raise ValueError("FrequencyTable needs integer values")
+            values = values.astype(np.int64)
+        if len(values) == 0:
+            return cls()
+        offset = values.min()
+        if offset >= 0:
+            # Non-negative values can be counted in place; only the leading empty bins are dropped
+            return cls(offset, np.bincount(values)[offset:])
+        return cls(offset, np.bincount(values - offset))
+
+    # Align both tables on the union of their value ranges and add the counts
+    def merge(self, other):
+        if len(other.counts) == 0:
+            return FrequencyTable(self.offset, self.counts.copy())
+        if len(self.counts) == 0:
+            return FrequencyTable(other.offset, other.counts.copy())
+        offset = min(self.offset, other.offset)
+        end = max(self.offset + len(self.counts), other.offset + len(other.counts))
+        counts = np.zeros(end - offset, dtype=np.int64)
+        counts[self.offset - offset:self.offset - offset + len(self.counts)] += self.counts
+        counts[other.offset - offset:other.offset - offset + len(other.counts)] += other.counts
+        return FrequencyTable(offset, counts)
+
+    def __add__(self, other):
+        return self.merge(other)
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    # Observed values in ascending order with Count and Percent (the value_counts(normalize=True) * 100 figures)
+    def table(self):
+        present = np.flatnonzero(self.counts)
+        counts = self.counts[present]
+        return pd.DataFrame({
+            'Value': present + self.offset,
+            'Count': counts,
+            'Percent': counts / max(self.total, 1) * 100
+        })
+
+    # k most frequent values, ties broken by the smaller value so the order is stable
+    def top(self, k=10):
+        table = self.table()
+        order = np.lexsort((table['Value'].to_numpy(), -table['Count'].to_numpy()))[:k]
+        return table.iloc[order].reset_index(drop=True)
+
+    # Share of pets at or below each value
+    def cumulative(self):
+        table = self.table()
+        table['CumulativePercent'] = table['Count'].cumsum() / max(self.total, 1) * 100
+        return table
+
+
+# Pivot measure -> (numerator, denominator) cube measures; no denominator means a plain sum
+PIVOT_MEASURES = {
+    'AdoptionRate': ('Adopted', 'Count'),
+    'Count': ('Count', None),
+    'MeanFee': ('FeeSum', 'Count'),
+    'MeanShelterDays': ('ShelterDaysSum', 'Count'),
+    'MeanAgeMonths': ('AgeSum', 'Count'),
+    'MeanWeightKg': ('WeightSum', 'Count')
+}
+
+
+# Any rows x columns pivot of a measure from cube cells (the pd.pivot_table result without touching rows).
+# 'AgeGroup' is derived from the AgeMonths dimension with the given bins. Returns (values, counts) tables.
+def pivot_from_cells(cells, rows, columns=None, measure='AdoptionRate', age_bins=None, age_labels=None):
+    def key(dimension):
+        if dimension == 'AgeGroup':
+            return pd.cut(cells['AgeMonths'] / 12, bins=age_bins, labels=age_labels).rename('AgeGroup')
+        return cells[dimension]
+
+    numerator, denominator = PIVOT_MEASURES[measure]
+    keys = [key(rows)] + ([key(columns)] if columns and columns != rows else [])
+    grouped = cells.groupby(keys, observed=True)[list(dict.fromkeys([numerator, 'Count']))].sum()
+    values = grouped[numerator] if denominator is None else grouped[numerator] / grouped['Count'].where(grouped['Count'] > 0)
+    counts = grouped['Count'].astype(np.int64)
+    if len(keys) == 1:
+        return values.to_frame(measure), counts.to_frame('Count')
+    return values.unstack(), counts.unstack(fill_value=0)
@@ -0,0 +1,399 @@
+# -*- coding: utf-8 -*-
+"""
+Pet Adoption Data Store
+Append-only column store plus an incrementally maintained adoption cube,
+so new intakes and outcome updates are reflected without rescanning history
+"""
+
+import threading
+import numpy as np
+import pandas as pd
+
+# Schema of pet_adoption.csv
+COLUMNS = ['PetID', 'PetType', 'Breed', 'AgeMonths', 'Color', 'Size', 'WeightKg', 'Vaccinated',
+           'HealthCondition', 'TimeInShelterDays', 'AdoptionFee', 'PreviousOwner', 'AdoptionLikelihood']
+CATEGORICAL_COLUMNS = ['PetType', 'Breed', 'Color', 'Size']
+FLOAT_COLUMNS = ['WeightKg']
+INTEGER_COLUMNS = [col for col in COLUMNS if col not in CATEGORICAL_COLUMNS + FLOAT_COLUMNS]
+
+# Cube dimensions - every dashboard filter and groupby can be answered from these
+# (AgeMonths is kept at full resolution so the age slider filters exactly)
+CUBE_DIMENSIONS = ['PetType', 'Breed', 'Color', 'Size', 'Vaccinated',
+                   'HealthCondition', 'PreviousOwner', 'AgeMonths']
+
+# Additive measures stored per cube cell
+BASE_MEASURES = ['Count', 'Adopted', 'VaccinatedSum', 'FeeSum', 'ShelterDaysSum', 'WeightSum', 'AgeSum']
+
+# Numeric columns whose correlation matrix is assembled from cube cells,
+# with the measure holding each column's sum
+CORRELATION_COLUMNS = ['AgeMonths', 'WeightKg', 'TimeInShelterDays', 'AdoptionFee', 'AdoptionLikelihood']
+SUM_MEASURE_OF = {
+    'AgeMonths': 'AgeSum',
+    'WeightKg': 'WeightSum',
+    'TimeInShelterDays': 'ShelterDaysSum',
+    'AdoptionFee': 'FeeSum',
+    'AdoptionLikelihood': 'Adopted'
+}
+
+# Squared sums and cross-products (upper triangle) for the correlation columns
+PRODUCT_PAIRS = [(a, b) for i, a in enumerate(CORRELATION_COLUMNS) for b in CORRELATION_COLUMNS[i:]]
+PRODUCT_MEASURES = [f"{a}*{b}" for a, b in PRODUCT_PAIRS]
+
+CUBE_MEASURES = BASE_MEASURES + PRODUCT_MEASURES
+
+# Fine bin widths for the per-cell histograms (charts re-bin from these)
+HISTOGRAM_BIN_WIDTHS = {
+    'AgeMonths': 1,
+    'WeightKg': 0.5,
+    'TimeInShelterDays': 1,
+    'AdoptionFee': 1
+}
+
+
+# Convert one incoming record to the CSV schema types, raising ValueError on bad input
+# (a blank CSV cell parses as NaN, which would poison every cube sum it is added to)
+def coerce_record(record):
+    missing = [col for col in COLUMNS if col not in record]
+    if missing:
+        raise ValueError(f"Record is missing columns: {', '.join(missing)}")
+
+    clean = {}
+    for col in COLUMNS:
+        value = record[col]
+        if col in CATEGORICAL_COLUMNS:
+            clean[col] = str(value)
+            continue
+        number = float(value)
+        if not np.isfinite(number):
+            raise ValueError(f"{col} must be a finite number, got {value!r}")
+        clean[col] = number if col in FLOAT_COLUMNS else int(value)
+    return clean
+
+
+# Measure vector contributed by one record
+def record_measures(record):
+    return np.array([
+        1.0,
+        record['AdoptionLikelihood'],
+        record['Vaccinated'],
+        record['AdoptionFee'],
+        record['TimeInShelterDays'],
+        record['WeightKg'],
+        record['AgeMonths']
+    ] + [record[a] * record[b] for a, b in PRODUCT_PAIRS], dtype=float)
+
+
+# Measure matrix contributed by a whole frame (same column order as record_measures)
+def frame_measures(frame):
+    measures = pd.DataFrame({
+        'Count': 1.0,
+        'Adopted': frame['AdoptionLikelihood'].astype(float),
+        'VaccinatedSum': frame['Vaccinated'].astype(float),
+        'FeeSum': frame['AdoptionFee'].astype(float),
+        'ShelterDaysSum': frame['TimeInShelterDays'].astype(float),
+        'WeightSum': frame['WeightKg'].astype(float),
+        'AgeSum': frame['AgeMonths'].astype(float)
+    }, index=frame.index)
+    for (a, b), name in zip(PRODUCT_PAIRS, PRODUCT_MEASURES):
+        measures[name] = frame[a].astype(float) * frame[b].astype(float)
+    return measures
+
+
+class ColumnStore:
+    """Append-only columnar storage with amortised O(1) appends and PetID lookup"""
+
+    def __init__(self, capacity=1024):
+        self.size = 0
+        self.version = 0
+        self.row_of_pet = {}
+        self.columns = {col: self._empty(col, capacity) for col in COLUMNS}
+        self._frame = None
+        self._frame_version = -1
+
+    @staticmethod
+    def _empty(col, capacity):
+        if col in CATEGORICAL_COLUMNS:
+            return np.empty(capacity, dtype=object)
+        if col in FLOAT_COLUMNS:
+            return np.zeros(capacity, dtype=float)
+        return np.zeros(capacity, dtype=np.int64)
+
+    def _reserve(self, needed):
+        capacity = len(self.columns['PetID'])
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for col, values in self.columns.items():
+            grown = self._empty(col, capacity)
+            grown[:self.size] = values[:self.size]
+            self.columns[col] = grown
+
+    def append_frame(self, frame):
+        n = len(frame)
+        self._reserve(self.size + n)
+        for col in COLUMNS:
+            self.columns[col][self.size:self.size + n] = frame[col].to_numpy()
+        for offset, pet_id in enumerate(frame['PetID'].to_numpy()):
+            self.row_of_pet[int(pet_id)] = self.size + offset
+        self.size += n
+        self.version += 1
+
+    def append(self, record):
+        self._reserve(self.size + 1)
+        row = self.size
+        for col in COLUMNS:
+            self.columns[col][row] = record[col]
+        self.row_of_pet[record['PetID']] = row
+        self.size += 1
+        self.version += 1
+        return row
+
+    def update(self, row, record):
+        for col in COLUMNS:
+            self.columns[col][row] = record[col]
+        self.version += 1
+
+    def row(self, row):
+        return {col: self.columns[col][row].item() if col not in CATEGORICAL_COLUMNS
+                else self.columns[col][row] for col in COLUMNS}
+
+    def to_frame(self):
+        # Rebuilt at most once per version, shared by every reader
+        if self._frame_version != self.version:
+            self._frame = pd.DataFrame({col: self.columns[col][:self.size].copy() for col in COLUMNS})
+            self._frame_version = self.version
+        return self._frame
+
+
+class AdoptionCube:
+    """Additive measures keyed by CUBE_DIMENSIONS, updated in O(1) per record"""
+
+    def __init__(self, capacity=1024):
+        self.cell_of_key = {}
+        self.keys = []
+        self.measures = np.zeros((capacity, len(CUBE_MEASURES)))
+        self.totals = np.zeros(len(CUBE_MEASURES))
+        self.version = 0
+        self._frame = None
+        self._frame_version = -1
+
+    @staticmethod
+    def key_of(record):
+        return tuple(record[dim] for dim in CUBE_DIMENSIONS)
+
+    def _cell(self, key):
+        cell = self.cell_of_key.get(key)
+        if cell is None:
+            cell = len(self.keys)
+            if cell >= len(self.measures):
+                grown = np.zeros((2 * len(self.measures), len(CUBE_MEASURES)))
+                grown[:cell] = self.measures[:cell]
+                self.measures = grown
+            self.cell_of_key[key] = cell
+            self.keys.append(key)
+        return cell
+
+    def add(self, record, sign=1):
+        key = self.key_of(record)
+        cell = self._cell(key)
+        delta = sign * record_measures(record)
+        self.measures[cell] += delta
+        self.totals += delta
+        self.version += 1
+        return {'key': list(key), 'delta': delta.tolist()}
+
+    def add_frame(self, frame):
+        grouped = frame_measures(frame).groupby([frame[dim] for dim in CUBE_DIMENSIONS]).sum()
+        for key, values in zip(grouped.index, grouped.to_numpy()):
+            cell = self._cell(tuple(k.item() if hasattr(k, 'item') else k for k in key))
+            self.measures[cell] += values
+        self.totals += grouped.to_numpy().sum(axis=0)
+        self.version += 1
+
+    # Cell index of every row of a frame already added to the cube
+    def cells_of_frame(self, frame):
+        keys = zip(*[frame[dim].tolist() for dim in CUBE_DIMENSIONS])
+        return np.fromiter((self.cell_of_key[key] for key in keys), dtype=np.int64, count=len(frame))
+
+    def to_frame(self):
+        # One row per non-empty cell: cell index, dimensions, then measures
+        if self._frame_version != self.version:
+            n = len(self.keys)
+            cells = pd.DataFrame(self.keys, columns=CUBE_DIMENSIONS)
+            cells.insert(0, 'Cell', np.arange(n))
+            cells[CUBE_MEASURES] = self.measures[:n]
+            self._frame = cells[cells['Count'] > 0].reset_index(drop=True)
+            self._frame_version = self.version
+        return self._frame
+
+
+class CellHistograms:
+    """Sparse fine-bin histograms per cube cell, split by adoption outcome and mergeable across cells"""
+
+    def __init__(self, bin_widths=HISTOGRAM_BIN_WIDTHS):
+        self.bin_widths = dict(bin_widths)
+        # column -> {(cell, bin, adopted): count}
+        self.counts = {col: {} for col in self.bin_widths}
+        self.version = 0
+        self._arrays = {}
+        self._arrays_version = -1
+
+    def add(self, cell, record, sign=1):
+        adopted = record['AdoptionLikelihood']
+        for col, width in self.bin_widths.items():
+            key = (cell, int(np.floor(record[col] / width)), adopted)
+            table = self.counts[col]
+            table[key] = table.get(key, 0) + sign
+            if table[key] == 0:
+                del table[key]
+        self.version += 1
+
+    def add_frame(self, cells, frame):
+        for col, width in self.bin_widths.items():
+            grouped = pd.DataFrame({
+                'Cell': cells,
+                'Bin': np.floor(frame[col].to_numpy(dtype=float) / width).astype(np.int64),
+                'Adopted': frame['AdoptionLikelihood'].to_numpy()
+            }).groupby(['Cell', 'Bin', 'Adopted']).size()
+            table = self.counts[col]
+            for (cell, b, adopted), count in zip(grouped.index, grouped.to_numpy()):
+                key = (int(cell), int(b), int(adopted))
+                table[key] = table.get(key, 0) + int(count)
+        self.version += 1
+
+    def _as_arrays(self, col):
+        # Long-form (cell, bin, adopted, count) arrays, rebuilt once per version
+        if self._arrays_version != self.version:
+            self._arrays = {}
+            self._arrays_version = self.version
+        if col not in self._arrays:
+            table = self.counts[col]
+            keys = np.array(list(table.keys()), dtype=np.int64).reshape(-1, 3)
+            self._arrays[col] = (keys[:, 0], keys[:, 1], keys[:, 2], np.fromiter(table.values(), dtype=np.int64, count=len(table)))
+        return self._arrays[col]
+
+    # Fine-bin histogram of one column merged over the given cube cells.
+    # Value is the representative of each bin: exact for integer columns with unit bins, else the midpoint.
+    def merged(self, col, cell_ids):
+        cell, bins, adopted, counts = self._as_arrays(col)
+        mask = np.isin(cell, np.asarray(cell_ids, dtype=np.int64))
+        width = self.bin_widths[col]
+        if not mask.any():
+            return pd.DataFrame(columns=['BinStart', 'BinEnd', 'Value', 'NotAdopted', 'Adopted'])
+        bins, adopted, counts = bins[mask], adopted[mask], counts[mask]
+        first = bins.min()
+        n_bins = bins.max() - first + 1
+        not_adopted_counts = np.bincount(bins - first, weights=counts * (adopted == 0), minlength=n_bins)
+        adopted_counts = np.bincount(bins - first, weights=counts * (adopted == 1), minlength=n_bins)
+        starts = (first + np.arange(n_bins)) * width
+        exact = col in INTEGER_COLUMNS and width == 1
+        return pd.DataFrame({
+            'BinStart': starts,
+            'BinEnd': starts + width,
+            'Value': starts if exact else starts + width / 2,
+            'NotAdopted': not_adopted_counts.astype(np.int64),
+            'Adopted': adopted_counts.astype(np.int64)
+        })
+
+
+class PetAdoptionStore:
+    """Column store + adoption cube + per-cell histograms kept consistent under one lock"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.columns = ColumnStore()
+        self.cube = AdoptionCube()
+        self.histograms = CellHistograms()
+
+    @classmethod
+    def from_csv(cls, path):
+        store = cls()
+        store.load_frame(pd.read_csv(path))
+        return store
+
+    # Load from any data_sources backend (CSV, Parquet, SQLite)
+    @classmethod
+    def from_source(cls, source):
+        store = cls()
+        store.load_frame(source.read(COLUMNS))
+        return store
+
+    @property
+    def version(self):
+        return self.columns.version
+
+    # Bulk load - one vectorized pass, used for the initial CSV
+    def load_frame(self, frame):
+        frame = frame[COLUMNS].drop_duplicates('PetID', keep='last')
+        with self.lock:
+            self.columns.append_frame(frame)
+            self.cube.add_frame(frame)
+            self.histograms.add_frame(self.cube.cells_of_frame(frame), frame)
+
+    def _apply(self, record, sign):
+        delta = self.cube.add(record, sign)
+        self.histograms.add(self.cube.cell_of_key[self.cube.key_of(record)], record, sign)
+        return delta
+
+    # Ingest new intakes or outcome updates; existing PetIDs are applied as deltas
+    def ingest(self, records):
+        # The whole batch is coerced before anything is changed, so a bad record leaves the store untouched
+        records = [coerce_record(record) for record in records]
+        inserted, updated, deltas = 0, 0, []
+        with self.lock:
+            for record in records:
+                row = self.columns.row_of_pet.get(record['PetID'])
+                if row is None:
+                    self.columns.append(record)
+                    deltas.append(self._apply(record, 1))
+                    inserted += 1
+                else:
+                    old = self.columns.row(row)
+                    deltas.append(self._apply(old, -1))
+                    self.columns.update(row, record)
+                    deltas.append(self._apply(record, 1))
+                    updated += 1
+        return {'inserted': inserted, 'updated': updated, 'records': records, 'deltas': deltas,
+                'version': self.version, 'kpis': self.kpis()}
+
+    def to_frame(self):
+        with self.lock:
+            return self.columns.to_frame()
+
+    def cube_frame(self):
+        with self.lock:
+            return self.cube.to_frame()
+
+    # Fine-bin histogram of a numeric column over the given cube cells
+    def histogram(self, col, cell_ids):
+        with self.lock:
+            return self.histograms.merged(col, cell_ids)
+
+    def kpis(self):
+        totals = dict(zip(CUBE_MEASURES, self.cube.totals))
+        count = totals['Count']
+        return {
+            'TotalPets': int(count),
+            'Adopted': int(totals['Adopted']),
+            'AdoptionRate': totals['Adopted'] / count if count else 0.0,
+            'VaccinationRate': totals['VaccinatedSum'] / count if count else 0.0,
+            'AvgAdoptionFee': totals['FeeSum'] / count if count else 0.0,
+            'AvgShelterDays': totals['ShelterDaysSum'] / count if count else 0.0,
+            'AvgAgeMonths': totals['AgeSum'] / count if count else 0.0
+        }
+
+
+# Cube cells matching the dashboard filters (same semantics as apply_filters on raw rows)
+def filter_cells(cells, pet_type='All', age_range=None, vaccine_status='All', health_condition='All'):
+    mask = np.ones(len(cells), dtype=bool)
+    if pet_type != 'All':
+        mask &= (cells['PetType'] == pet_type).to_numpy()
+    if age_range:
+        age_years = cells['AgeMonths'].to_numpy() / 12
+        mask &= (age_years >= age_range[0]) & (age_years <= age_range[1])
+    if vaccine_status != 'All':
+        mask &= (cells['Vaccinated'] == vaccine_status).to_numpy()
+    if health_condition != 'All':
+        mask &= (cells['HealthCondition'] == health_condition).to_numpy()
+    return cells[mask]
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Server-side Table Views
+Sort permutations of every table column are built once per dataset version. A view (filter mask,
+sort column, direction) is one permutation restricted to the mask, and any page of it is a slice,
+so browsing page 1 or page 10,000 of any sorted, filtered view costs the same
+"""
+
+import re
+import numpy as np
+import pandas as pd
+
+TABLE_PAGE_SIZES = [25, 50, 100, 500]
+
+# One term of a DataTable filter_query: {column} operator value, with optional s/i case prefix
+FILTER_TERM = re.compile(r'^\{(?P<column>[^{}]+)\}\s+(?P<case>[si]?)(?P<op>!=|<=|>=|=|<|>|eq|ne|le|ge|lt|gt|contains|'
+                         r'datestartswith)\s+(?P<value>.+)$')
+FILTER_OP_ALIASES = {'eq': '=', 'ne': '!=', 'le': '<=', 'ge': '>=', 'lt': '<', 'gt': '>'}
+
+
+# DataTable filter_query -> [(column, op, value, case_insensitive)]; terms on unknown columns are ignored
+def parse_filter_query(query, columns):
+    conditions = []
+    for term in (query or '').split(' && '):
+        match = FILTER_TERM.match(term.strip())
+        if not match or match['column'] not in columns:
+            continue
+        value = match['value'].strip()
+        if len(value) > 1 and value[0] == value[-1] and value[0] in '"\'`':
+            value = value[1:-1]
+        conditions.append((match['column'], FILTER_OP_ALIASES.get(match['op'], match['op']), value, match['case'] == 'i'))
+    return conditions
+
+
+# Boolean mask of the rows of a frame matching every parsed filter term (numbers compare numerically)
+def filter_mask(frame, conditions):
+    mask = np.ones(len(frame), dtype=bool)
+    for col, op, value, case_insensitive in conditions:
+        series = frame[col]
+        if pd.api.types.is_numeric_dtype(series.dtype) and op not in ('contains', 'datestartswith'):
+            try:
+                value = float(value)
+            except ValueError:
+                # A number column compared with text matches nothing
+                return np.zeros(len(frame), dtype=bool)
+            values = series.to_numpy()
+        else:
+            values = series.astype(str)
+            if case_insensitive:
+                values, value = values.str.lower(), value.lower()
+            if op == 'contains':
+                mask &= values.str.contains(value, regex=False).to_numpy()
+                continue
+            if op == 'datestartswith':
+                mask &= values.str.startswith(value).to_numpy()
+                continue
+            values = values.to_numpy()
+        if op == '=':
+            mask &= values == value
+        elif op == '!=':
+            mask &= values != value
+        elif op == '<':
+            mask &= values < value
+        elif op == '<=':
+            mask &= values <= value
+        elif op == '>':
+            mask &= values > value
+        elif op == '>=':
+            mask &= values >= value
+    return mask
+
+
+class SortedTable:
+    """Stable ascending and descending sort permutations per column of one data version, plus paging over views"""
+
+    def __init__(self, frame, columns):
+        self.frame = frame[columns].reset_index(drop=True)
+        self.orders = {}
+        for col in columns:
+            values = self.frame[col]
+            # Text columns sort by their factorized codes, which sorts integers instead of Python strings
+            keys = pd.factorize(values, sort=True)[0] if not pd.api.types.is_numeric_dtype(values.dtype) else values.to_numpy()
+            # Both directions keep tied rows in their original order, so pages are the same after a reload
+            self.orders[col, False] = np.argsort(keys, kind='stable')
+            self.orders[col, True] = np.argsort(-keys, kind='stable')
+
+    def __len__(self):
+        return len(self.frame)
+
+    # Row positions of a view in display order: a sort permutation restricted to the rows selected by a boolean mask
+    def view(self, mask, sort_by=None, descending=False):
+        order = self.orders[sort_by, descending] if sort_by else np.arange(len(self.frame))
+        return order[np.asarray(mask, dtype=bool)[order]]
+
+    # Records of one page of a view
+    def page(self, positions, page_current, page_size):
+        start = page_current * page_size
+        return self.frame.iloc[positions[start:start + page_size]].to_dict('records')
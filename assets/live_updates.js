@@ -0,0 +1,210 @@
+// Live updates for the Overview tab
+// Subscribes to /api/stream and applies adoption-cube deltas to the KPI cards and rate charts in place
+
+(function () {
+    var OVERVIEW_GRAPHS = [
+        'pet-type-adoption-overview',
+        'vaccine-adoption-overview',
+        'health-adoption-overview',
+        'age-adoption-overview',
+        'size-adoption-overview'
+    ];
+
+    // Recent delta events, oldest first. A render carries the store version its totals include, and
+    // only newer events are applied to it - also when the render arrives after the events did
+    var MAX_EVENTS = 256;
+    var events = [];
+
+    // Current filter, base totals and their store version rendered by the server (reset on every re-render)
+    function readState() {
+        var el = document.getElementById('live-filter-state');
+        if (!el) {
+            return null;
+        }
+        // React may reuse the element across renders, so re-parse whenever the attribute changes
+        var source = el.getAttribute('data-state');
+        if (el.__liveSource !== source) {
+            el.__liveSource = source;
+            el.__liveState = JSON.parse(source);
+            el.__liveState.applied = el.__liveState.version;
+        }
+        return el.__liveState;
+    }
+
+    function matchesFilter(cell, filter) {
+        var ageYears = cell.AgeMonths / 12;
+        return (filter.PetType === 'All' || cell.PetType === filter.PetType) &&
+            (filter.Vaccinated === 'All' || cell.Vaccinated === filter.Vaccinated) &&
+            (filter.HealthCondition === 'All' || cell.HealthCondition === filter.HealthCondition) &&
+            (!filter.AgeRange || (ageYears >= filter.AgeRange[0] && ageYears <= filter.AgeRange[1]));
+    }
+
+    // Deltas of one event that fall inside the filter, as {cell, delta} with measures by name
+    function matchingDeltas(event, filter) {
+        var matching = [];
+        event.deltas.forEach(function (d) {
+            var cell = {};
+            var delta = {};
+            event.dimensions.forEach(function (name, i) { cell[name] = d.key[i]; });
+            if (!matchesFilter(cell, filter)) {
+                return;
+            }
+            event.measures.forEach(function (name, i) { delta[name] = d.delta[i]; });
+            matching.push({cell: cell, delta: delta});
+        });
+        return matching;
+    }
+
+    // Matching deltas of every buffered event newer than `version`, and the newest version seen
+    function deltasSince(version, filter) {
+        var matching = [];
+        events.forEach(function (event) {
+            if (event.version > version) {
+                matching = matching.concat(matchingDeltas(event, filter));
+                version = event.version;
+            }
+        });
+        return {deltas: matching, version: version};
+    }
+
+    function updateKpis(base) {
+        var set = function (id, text) {
+            var el = document.getElementById(id);
+            if (el) {
+                el.textContent = text;
+            }
+        };
+        var count = base.Count || 1;
+        set('kpi-total-pets', base.Count.toLocaleString());
+        set('kpi-adoption-rate', (100 * base.Adopted / count).toFixed(1) + '%');
+        set('kpi-vaccination-rate', (100 * base.VaccinatedSum / count).toFixed(1) + '%');
+        set('kpi-avg-fee', '$' + (base.FeeSum / count).toFixed(0));
+    }
+
+    // Position of the group a cell falls into, or -1 when the chart has no such group
+    function groupIndex(meta, cell) {
+        if (meta.bins) {
+            var ageYears = cell.AgeMonths / 12;
+            for (var i = 0; i < meta.bins.length - 1; i++) {
+                if (ageYears > meta.bins[i] && ageYears <= meta.bins[i + 1]) {
+                    return meta.groups.indexOf(meta.labels ? meta.labels[i] : meta.groups[i]);
+                }
+            }
+            return -1;
+        }
+        return meta.groups.indexOf(cell[meta.dimension]);
+    }
+
+    // Graphs are drawn after the rest of a render, so each trace remembers the version it has reached
+    function updateGraph(graphId, state) {
+        var container = document.getElementById(graphId);
+        var plot = container && container.querySelector('.js-plotly-plot');
+        if (!plot || !plot.data || !plot.data.length || !plot.data[0].meta) {
+            return;
+        }
+        var trace = plot.data[0];
+        if (trace.__liveVersion === undefined) {
+            trace.__liveVersion = state.version;
+        }
+        var pending = deltasSince(trace.__liveVersion, state.filter);
+        trace.__liveVersion = pending.version;
+        var changed = false;
+        pending.deltas.forEach(function (item) {
+            var i = groupIndex(trace.meta, item.cell);
+            if (i < 0) {
+                return;
+            }
+            trace.customdata[i][0] += item.delta.Count;
+            trace.customdata[i][1] += item.delta.Adopted;
+            changed = true;
+        });
+        if (!changed) {
+            return;
+        }
+        var rates = trace.customdata.map(function (row) {
+            return row[0] > 0 ? 100 * row[1] / row[0] : 0;
+        });
+        var update = {customdata: [trace.customdata]};
+        update[trace.orientation === 'h' ? 'x' : 'y'] = [rates];
+        if (trace.type === 'bar') {
+            update.text = [rates.map(function (r) { return r.toFixed(1) + '%'; })];
+        }
+        window.Plotly.restyle(plot, update, [0]);
+    }
+
+    // Bring the rendered KPIs and charts up to the newest buffered event
+    function catchUp() {
+        var state = readState();
+        if (!state || !events.length) {
+            return;
+        }
+        var pending = deltasSince(state.applied, state.filter);
+        state.applied = pending.version;
+        pending.deltas.forEach(function (item) {
+            state.base.Count += item.delta.Count;
+            state.base.Adopted += item.delta.Adopted;
+            state.base.VaccinatedSum += item.delta.VaccinatedSum;
+            state.base.FeeSum += item.delta.FeeSum;
+        });
+        if (pending.deltas.length) {
+            updateKpis(state.base);
+        }
+        OVERVIEW_GRAPHS.forEach(function (graphId) { updateGraph(graphId, state); });
+    }
+
+    function receive(event) {
+        events.push(event);
+        if (events.length > MAX_EVENTS) {
+            events.shift();
+        }
+        catchUp();
+    }
+
+    // Re-rendered tabs and graphs drawn after an event arrived still need the newer deltas
+    function watchRenders() {
+        var scheduled = false;
+        new MutationObserver(function () {
+            if (scheduled || !events.length) {
+                return;
+            }
+            scheduled = true;
+            window.requestAnimationFrame(function () {
+                scheduled = false;
+                catchUp();
+            });
+        }).observe(document.body, {childList: true, subtree: true, attributes: true, attributeFilter: ['data-state']});
+    }
+
+    function connect() {
+        watchRenders();
+        if (!window.EventSource) {
+            return;
+        }
+        var source = new EventSource('/api/stream');
+        var resync = false;
+        source.onmessage = function (message) {
+            receive(JSON.parse(message.data));
+        };
+        // Sent when the server dropped this client for falling behind; the stream then ends and
+        // EventSource reconnects on its own
+        source.addEventListener('resync', function () {
+            resync = true;
+        });
+        // Deltas were missed, so once reconnected bump the refresh store, an input of the tab callback,
+        // to re-render the current tab with fresh totals
+        source.onopen = function () {
+            var missed = resync;
+            resync = false;
+            if (!missed || !window.dash_clientside || !window.dash_clientside.set_props) {
+                return;
+            }
+            window.dash_clientside.set_props('live-refresh', {data: Date.now()});
+        };
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', connect);
+    } else {
+        connect();
+    }
+})();
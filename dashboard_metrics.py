@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+Dashboard Metrics
+Lightweight timing histograms and counters for callbacks, chart builders and the request time
+spent outside callbacks, exposed in Prometheus text format on /metrics
+"""
+
+import bisect
+import functools
+import threading
+import time
+from flask import Response, g, has_request_context, request
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTE_BUCKETS = (1e3, 1e4, 5e4, 1e5, 2.5e5, 5e5, 1e6, 2.5e6, 5e6, 1e7)
+
+
+# Label value escaped as the Prometheus text format requires: backslash, double quote and newline
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(label_names, label_values, extra=None):
+    pairs = list(zip(label_names, label_values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label(value)}"' for name, value in pairs) + '}'
+
+
+class Histogram:
+    """Prometheus-style histogram; observe() is a bisect plus three additions under a lock"""
+
+    def __init__(self, name, help_text, label_names=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        slot = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(label_values)
+            if series is None:
+                series = self.series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][slot] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            snapshot = {labels: (list(s[0]), s[1], s[2]) for labels, s in self.series.items()}
+        for label_values, (counts, total, count) in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, label_values, ('le', le))} {cumulative}")
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1, *label_values):
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            snapshot = dict(self.values)
+        for label_values, value in sorted(snapshot.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, label_values)} {value}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds every metric and renders them together"""
+
+    def __init__(self):
+        self.metrics = []
+
+    def histogram(self, *args, **kwargs):
+        metric = Histogram(*args, **kwargs)
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, *args, **kwargs):
+        metric = Counter(*args, **kwargs)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+callback_seconds = registry.histogram(
+    'dash_callback_duration_seconds', 'Time spent inside Dash callback functions', ['callback'])
+stage_seconds = registry.histogram(
+    'dash_stage_duration_seconds', 'Time spent in shared pipeline stages such as apply_filters', ['stage'])
+chart_seconds = registry.histogram(
+    'dash_chart_build_duration_seconds', 'Time spent building each figure', ['chart'])
+overhead_seconds = registry.histogram(
+    'dash_request_overhead_seconds', 'Request time outside the callback function (Dash dispatch, JSON encoding, Flask)',
+    ['output'])
+request_seconds = registry.histogram(
+    'dash_request_duration_seconds', 'Total server time per callback request', ['output'])
+response_bytes = registry.histogram(
+    'dash_response_bytes', 'Callback response payload size in bytes', ['output'], buckets=BYTE_BUCKETS)
+response_bytes_total = registry.counter(
+    'dash_response_bytes_total', 'Total callback response bytes sent', ['output'])
+callback_errors = registry.counter(
+    'dash_callback_errors_total', 'Callback requests that did not return 200', ['output'])
+
+
+# Decorator factory: time the wrapped function into a histogram labelled with its name
+def _timed(histogram, remember_in_request=False):
+    def decorator(func):
+        label = func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                histogram.observe(elapsed, label)
+                if remember_in_request and has_request_context():
+                    g.dash_callback_seconds = getattr(g, 'dash_callback_seconds', 0.0) + elapsed
+        return wrapper
+    return decorator
+
+
+timed_callback = _timed(callback_seconds, remember_in_request=True)
+timed_stage = _timed(stage_seconds)
+timed_chart = _timed(chart_seconds)
+
+
+# Request hooks for callback payload size and time outside the callback, plus the /metrics endpoint.
+# The output label only takes the app's registered callback outputs, so clients cannot create new series.
+def register_metrics_endpoint(app, path='/metrics'):
+    server = app.server
+
+    @server.before_request
+    def start_request_timer():
+        if request.path.endswith('/_dash-update-component'):
+            g.dash_request_start = time.perf_counter()
+
+    @server.after_request
+    def record_request_metrics(response):
+        start = getattr(g, 'dash_request_start', None)
+        if start is None:
+            return response
+        payload = request.get_json(silent=True) or {}
+        output = payload.get('output')
+        if not isinstance(output, str) or output not in app.callback_map:
+            output = 'unknown'
+        total = time.perf_counter() - start
+        request_seconds.observe(total, output)
+        overhead_seconds.observe(max(total - getattr(g, 'dash_callback_seconds', 0.0), 0.0), output)
+        if response.status_code != 200:
+            callback_errors.inc(1, output)
+        if not response.direct_passthrough:
+            size = response.calculate_content_length() or 0
+            response_bytes.observe(size, output)
+            response_bytes_total.inc(size, output)
+        return response
+
+    @server.route(path)
+    def metrics():
+        return Response(registry.render(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Pet Adoption Data Sources
+CSV, Parquet and SQLite backends behind one read(columns, predicates) interface, chosen by URI.
+Each backend pushes the dashboard filters and the needed columns down to the storage layer,
+so views that touch 3 of the 13 columns only read those columns and the matching rows.
+Rows failing validation are written to a quarantine CSV (option ?quarantine=path, default
+quarantine/<name>.rejected.csv) and never reach the caller. Only rows the backend reads are validated:
+CSV checks every row before filtering, Parquet the row groups its statistics did not prune, SQLite the
+rows matching the WHERE clause. An unfiltered read, as the dashboard does, quarantines the same rows
+on every backend
+
+URIs:
+    pet_adoption.csv                      (scheme inferred from the extension)
+    csv://data/pet_adoption.csv
+    parquet://data/pet_adoption.parquet   (needs pyarrow)
+    sqlite://data/pets.db?table=pets      (use sqlite:///abs/path.db for absolute paths)
+"""
+
+import os
+import sqlite3
+from urllib.parse import parse_qs
+import numpy as np
+import pandas as pd
+from adoption_store import COLUMNS
+from data_validation import Quarantine, default_quarantine_path, validate_frame
+
+PREDICATE_OPS = ('==', '>=', '<=', 'in')
+EXTENSION_SCHEMES = {'.csv': 'csv', '.parquet': 'parquet', '.pq': 'parquet', '.db': 'sqlite', '.sqlite': 'sqlite'}
+CSV_CHUNK_ROWS = 100000
+
+
+# Dashboard filter values as (column, op, value) predicates - same semantics as apply_filters
+# (AgeYears = AgeMonths / 12, so the age range is pushed down on AgeMonths)
+def dashboard_predicates(pet_type='All', age_range=None, vaccine_status='All', health_condition='All'):
+    predicates = []
+    if pet_type != 'All':
+        predicates.append(('PetType', '==', pet_type))
+    if age_range:
+        predicates.append(('AgeMonths', '>=', age_range[0] * 12))
+        predicates.append(('AgeMonths', '<=', age_range[1] * 12))
+    if vaccine_status != 'All':
+        predicates.append(('Vaccinated', '==', vaccine_status))
+    if health_condition != 'All':
+        predicates.append(('HealthCondition', '==', health_condition))
+    return predicates
+
+
+def _check(columns, predicates):
+    for col, op, _ in predicates:
+        if col not in COLUMNS or op not in PREDICATE_OPS:
+            raise ValueError(f"Unsupported predicate: {col} {op}")
+    columns = list(columns) if columns else list(COLUMNS)
+    unknown = [col for col in columns if col not in COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+    # Columns to read: requested ones plus any only needed for filtering
+    needed = columns + [col for col, _, _ in predicates if col not in columns]
+    return columns, needed
+
+
+# Boolean mask of the rows of a frame satisfying every predicate
+def predicate_mask(frame, predicates):
+    mask = np.ones(len(frame), dtype=bool)
+    for col, op, value in predicates:
+        values = frame[col]
+        if op == '==':
+            mask &= (values == value).to_numpy()
+        elif op == '>=':
+            mask &= (values >= value).to_numpy()
+        elif op == '<=':
+            mask &= (values <= value).to_numpy()
+        else:
+            mask &= values.isin(value).to_numpy()
+    return mask
+
+
+# Parameterized SQL WHERE clause (with leading ' WHERE ', or '' when unfiltered) for a list of predicates.
+# Columns in `unindexed` are written as +"col", which stops SQLite from using their indexes.
+def sql_where(predicates, unindexed=()):
+    clauses, params = [], []
+    for col, op, value in predicates:
+        ref = f'+"{col}"' if col in unindexed else f'"{col}"'
+        if op == 'in':
+            values = list(value)
+            clauses.append(f'{ref} IN ({", ".join("?" * len(values))})')
+            params.extend(values)
+        else:
+            clauses.append(f'{ref} {"=" if op == "==" else op} ?')
+            params.append(value)
+    return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+
+class DataSource:
+    """Base class: read(columns, predicates) returns only the requested columns of the matching rows"""
+
+    def __init__(self, location, options=None):
+        self.location = location
+        self.options = options or {}
+
+    def read(self, columns=None, predicates=()):
+        raise NotImplementedError
+
+    # Validate a raw frame of the given columns: invalid rows go to the quarantine, the clean typed rows are returned
+    def _validated(self, frame, columns, quarantine):
+        clean, rejected = validate_frame(frame, columns)
+        quarantine.add(rejected)
+        return clean
+
+    def _quarantine(self):
+        return Quarantine(self.options.get('quarantine') or default_quarantine_path(self.location))
+
+    @staticmethod
+    def _report(quarantine):
+        if quarantine.rows:
+            print(f"⚠️ {quarantine.summary()}")
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.location!r})"
+
+
+class CSVSource(DataSource):
+    """Parses only the needed columns, in chunks, keeping valid matching rows of each chunk"""
+
+    def read(self, columns=None, predicates=()):
+        columns, needed = _check(columns, predicates)
+        quarantine = self._quarantine()
+        chunks = pd.read_csv(self.location, usecols=needed, chunksize=int(self.options.get('chunksize', CSV_CHUNK_ROWS)))
+        kept = []
+        for chunk in chunks:
+            # Validate before filtering, so predicates compare typed values
+            chunk = self._validated(chunk, needed, quarantine)
+            kept.append(chunk[predicate_mask(chunk, predicates)])
+        self._report(quarantine)
+        frame = pd.concat(kept, ignore_index=True) if kept else validate_frame(pd.DataFrame(columns=needed))[0]
+        return frame[columns]
+
+
+class ParquetSource(DataSource):
+    """Column projection and row-group filtering done by pyarrow"""
+
+    def read(self, columns=None, predicates=()):
+        columns, needed = _check(columns, predicates)
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("Parquet sources need pyarrow: pip install pyarrow")
+        filters = [(col, op, list(value) if op == 'in' else value) for col, op, value in predicates] or None
+        frame = pd.read_parquet(self.location, columns=needed, filters=filters)
+        quarantine = self._quarantine()
+        frame = self._validated(frame, needed, quarantine)
+        self._report(quarantine)
+        # Row-group statistics only prune whole groups; apply the predicates exactly on what was read
+        frame = frame[predicate_mask(frame, predicates)].reset_index(drop=True)
+        return frame[columns]
+
+
+class SQLiteSource(DataSource):
+    """Predicates become a parameterized WHERE clause and columns the SELECT list"""
+
+    def read(self, columns=None, predicates=()):
+        columns, needed = _check(columns, predicates)
+        table = self.options.get('table', 'pets')
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+        where, params = sql_where(predicates)
+        select_list = ', '.join(f'"{col}"' for col in needed)
+        query = f'SELECT {select_list} FROM "{table}"{where}'
+        with sqlite3.connect(self.location) as connection:
+            frame = pd.read_sql_query(query, connection, params=params)
+        quarantine = self._quarantine()
+        frame = self._validated(frame, needed, quarantine)
+        self._report(quarantine)
+        return frame[columns].reset_index(drop=True)
+
+
+SOURCE_TYPES = {'csv': CSVSource, 'parquet': ParquetSource, 'sqlite': SQLiteSource}
+
+
+# Data source for a URI (scheme://path?options) or a plain path with a known extension
+def open_source(uri):
+    scheme, sep, rest = uri.partition('://')
+    if not sep:
+        scheme, rest = EXTENSION_SCHEMES.get(os.path.splitext(uri)[1].lower()), uri
+        if scheme is None:
+            raise ValueError(f"Cannot infer the data source type of {uri}; use csv://, parquet:// or sqlite://")
+    if scheme not in SOURCE_TYPES:
+        raise ValueError(f"Unknown data source scheme: {scheme}")
+    location, _, query = rest.partition('?')
+    options = {key: values[-1] for key, values in parse_qs(query).items()}
+    return SOURCE_TYPES[scheme](location, options)
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Load-time Data Validation
+Every cleaning rule is checked in one vectorized pass over the columns of a parsed frame:
+missing values, non-numeric or fractional numbers, negative ages and measurements, Vaccinated /
+HealthCondition / PreviousOwner codes outside {0, 1} and a non-binary AdoptionLikelihood.
+Failing rows go to a quarantine CSV with their reason codes; the rest continue as a clean frame
+typed to the pet_adoption.csv schema
+"""
+
+import os
+from collections import Counter
+import numpy as np
+import pandas as pd
+from adoption_store import COLUMNS, CATEGORICAL_COLUMNS, FLOAT_COLUMNS, INTEGER_COLUMNS
+
+QUARANTINE_DIR = 'quarantine'
+
+NONNEGATIVE_COLUMNS = ['AgeMonths', 'WeightKg', 'TimeInShelterDays', 'AdoptionFee']
+
+# Reason code for a value outside {0, 1} in each binary column
+BINARY_CODE_REASONS = {
+    'Vaccinated': 'BAD_VACCINATED_CODE',
+    'HealthCondition': 'BAD_HEALTH_CODE',
+    'PreviousOwner': 'BAD_OWNER_CODE',
+    'AdoptionLikelihood': 'NON_BINARY_ADOPTION'
+}
+
+
+# Missing-value mask of a text column. pandas' python-backed str dtype keeps NaN in a plain object
+# array, where the NaN != NaN test is several times faster than isna()
+def _missing_text(series):
+    dtype = series.dtype
+    if isinstance(dtype, pd.StringDtype) and dtype.storage == 'python' and dtype.na_value is np.nan:
+        values = np.asarray(series.array)
+        return values != values
+    return series.isna().to_numpy()
+
+
+# Split a parsed frame into (clean, rejected): clean holds the valid rows of the checked columns with
+# schema types, rejected the raw invalid rows plus a Reasons column such as "MISSING_VALUE(WeightKg);NEGATIVE_AGE".
+# Each failed (rule, column) sets one bit of a per-row mask, so rows are never visited one at a time.
+def validate_frame(frame, columns=None):
+    columns = [col for col in (columns or COLUMNS) if col in frame.columns]
+    failures = np.zeros(len(frame), dtype=np.uint64)
+    reasons = []
+    typed = {}
+
+    def flag(mask, reason):
+        nonlocal failures
+        if mask.any():
+            failures |= mask.astype(np.uint64) << np.uint64(len(reasons))
+            reasons.append(reason)
+
+    for col in columns:
+        series = frame[col]
+        if col in CATEGORICAL_COLUMNS:
+            flag(_missing_text(series), f"MISSING_VALUE({col})")
+            if series.dtype.kind == 'O':
+                typed[col] = series.astype(str)
+            continue
+
+        values = series.to_numpy()
+        if values.dtype.kind in 'iub':
+            # Parsed as integers: nothing missing, non-numeric or fractional
+            values = values.astype(np.int64 if col in INTEGER_COLUMNS else float, copy=False)
+        else:
+            # inf is not a usable number either: it would turn every sum it enters into inf or NaN
+            if values.dtype.kind != 'f':
+                missing = series.isna().to_numpy()
+                values = pd.to_numeric(series, errors='coerce').to_numpy(dtype=float)
+                flag((np.isnan(values) & ~missing) | np.isinf(values), f"NOT_NUMERIC({col})")
+            else:
+                missing = np.isnan(values)
+                flag(np.isinf(values), f"NOT_NUMERIC({col})")
+            flag(missing, f"MISSING_VALUE({col})")
+            values = np.where(np.isfinite(values), values, 0.0)
+            # A fractional binary code is reported by its code rule below
+            if col in INTEGER_COLUMNS and col not in BINARY_CODE_REASONS:
+                flag(values != np.floor(values), f"NOT_INTEGER({col})")
+
+        if col == 'AgeMonths':
+            flag(values < 0, "NEGATIVE_AGE")
+        elif col in NONNEGATIVE_COLUMNS:
+            flag(values < 0, f"NEGATIVE_VALUE({col})")
+        elif col in BINARY_CODE_REASONS:
+            flag((values != 0) & (values != 1), BINARY_CODE_REASONS[col])
+        if col in INTEGER_COLUMNS:
+            values = values.astype(np.int64, copy=False)
+        if values.dtype != series.dtype:
+            typed[col] = values
+
+    # Columns already parsed with their schema type are passed on as they are
+    bad = failures != 0
+    clean = frame[columns].assign(**typed) if typed else frame[columns]
+    if not bad.any():
+        return clean, frame.iloc[:0].assign(Reasons=pd.Series(dtype=object))
+
+    # Reason text per distinct failure mask, not per row
+    masks, inverse = np.unique(failures[bad], return_inverse=True)
+    labels = np.array([';'.join(reason for bit, reason in enumerate(reasons) if int(mask) >> bit & 1)
+                       for mask in masks], dtype=object)
+    rejected = frame[bad].assign(Reasons=labels[inverse])
+    return clean[~bad], rejected
+
+
+# Reason code -> number of rejected rows carrying it
+def reason_counts(rejected):
+    return Counter(reason for reasons in rejected['Reasons'] for reason in reasons.split(';'))
+
+
+def default_quarantine_path(location):
+    name = os.path.splitext(os.path.basename(location))[0] or 'data'
+    return os.path.join(QUARANTINE_DIR, f"{name}.rejected.csv")
+
+
+class Quarantine:
+    """Rejected rows of one load appended to a CSV (source row, raw values, reasons), created on first reject"""
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self.reasons = Counter()
+
+    def add(self, rejected):
+        if rejected.empty:
+            return
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        rejected.to_csv(self.path, mode='a' if self.rows else 'w', header=not self.rows, index_label='SourceRow')
+        self.rows += len(rejected)
+        self.reasons.update(reason_counts(rejected))
+
+    def summary(self):
+        reasons = ', '.join(f"{reason} {count}" for reason, count in self.reasons.most_common())
+        return f"{self.rows:,} invalid rows quarantined to {self.path} ({reasons})"
@@ -0,0 +1,574 @@
+# -*- coding: utf-8 -*-
+"""
+Batch EDA Report
+Headless version of the worksheet_7_team_17.py analysis: every worksheet statistic is derived
+from one pass over each shelter's data (the adoption cube), charts are rendered to files in
+parallel by a process pool - each worker reusing one Agg figure per chart shape and only updating
+its artists - and each shelter gets a single HTML and/or Markdown report.
+CSVs are read in fixed-size row partitions whose partial results are cached by content hash,
+so a rerun after appending intakes only rescans the new (and last modified) partitions
+
+Usage:
+    python eda_report.py pet_adoption.csv
+    python eda_report.py shelters/ --out reports --workers 8 --format html md
+"""
+
+import argparse
+import functools
+import glob
+import hashlib
+import html
+import io
+import itertools
+import os
+import pickle
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from adoption_store import PetAdoptionStore, CUBE_DIMENSIONS, CUBE_MEASURES
+from adoption_stats import rate_table, correlation_from_cells, rebin_histogram, FrequencyTable
+from data_validation import Quarantine, reason_counts, validate_frame
+
+RATE_DIMENSIONS = ['PetType', 'Color', 'Breed', 'Size']
+BINARY_EFFECTS = {
+    'Vaccinated': ('Vaccinated', 'Not vaccinated'),
+    'HealthCondition': ('Health issues', 'Healthy'),
+    'PreviousOwner': ('Previous owner', 'No previous owner')
+}
+SUMMARY_COLUMNS = ['TimeInShelterDays', 'AdoptionFee']
+SUM_MEASURES = {'TimeInShelterDays': 'ShelterDaysSum', 'AdoptionFee': 'FeeSum'}
+PARTITION_ROWS = 50000
+# Part of the cached partial file names; bump when partition_partials changes so older caches are not reused
+PARTIAL_VERSION = 2
+
+
+# Adoption rate of a subset of cube cells
+def _rate(cells):
+    count = cells['Count'].sum()
+    return cells['Adopted'].sum() / count if count else np.nan
+
+
+# Mergeable partial results for one partition of rows: cube cells, frequency tables, fine weight histogram,
+# plus the rows failing validation (numbered within the partition), which are left out of everything else
+def partition_partials(frame):
+    frame, rejected = validate_frame(frame)
+    store = PetAdoptionStore()
+    store.load_frame(frame)
+    rows = store.to_frame()
+    cells = store.cube_frame()
+    return {
+        'rows': len(rows),
+        'pet_ids': rows['PetID'].to_numpy(),
+        'cells': cells.drop(columns='Cell'),
+        'frequencies': {col: FrequencyTable.from_values(rows[col].to_numpy()) for col in SUMMARY_COLUMNS},
+        'weight_fine': store.histogram('WeightKg', cells['Cell']),
+        'age_fee': rows[['AgeMonths', 'AdoptionFee']].to_numpy(),
+        'rejected': rejected
+    }
+
+
+def merge_partials(partials):
+    return {
+        'rows': sum(p['rows'] for p in partials),
+        'pet_ids': np.concatenate([p['pet_ids'] for p in partials]),
+        'cells': pd.concat([p['cells'] for p in partials]).groupby(CUBE_DIMENSIONS, as_index=False)[CUBE_MEASURES].sum(),
+        'frequencies': {col: functools.reduce(FrequencyTable.merge, [p['frequencies'][col] for p in partials])
+                        for col in SUMMARY_COLUMNS},
+        'weight_fine': pd.concat([p['weight_fine'] for p in partials]).groupby(
+            ['BinStart', 'BinEnd', 'Value'], as_index=False)[['NotAdopted', 'Adopted']].sum(),
+        'age_fee': np.concatenate([p['age_fee'] for p in partials]),
+        'rejected': pd.concat([p['rejected'] for p in partials])
+    }
+
+
+# Raw CSV bytes in blocks of `rows` lines, each prefixed with the header so it parses on its own
+def csv_partitions(path, rows=PARTITION_ROWS):
+    with open(path, 'rb') as f:
+        header = f.readline()
+        while True:
+            lines = list(itertools.islice(f, rows))
+            if not lines:
+                return
+            yield header + b''.join(lines)
+
+
+# Cached partial of a partition, or None when it is missing or unreadable (e.g. left truncated by an old crash)
+def _load_partial(cache_path):
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+# Write a partial to a temporary file next to its cache path and rename it into place,
+# so a worker killed mid-dump never leaves a truncated cache entry behind
+def _store_partial(cache_path, partial):
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(partial, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+# Partials of every partition of a CSV; with reuse, partitions whose content hash was seen before are loaded,
+# not parsed. Freshly computed partials are always written back, so a --full run also repairs the cache.
+def shelter_partials(path, partial_dir=None, rows=PARTITION_ROWS, reuse=True):
+    partials, rescanned = [], 0
+    for number, block in enumerate(csv_partitions(path, rows)):
+        cache_path = partial_dir and os.path.join(partial_dir, f"{hashlib.sha256(block).hexdigest()}.v{PARTIAL_VERSION}.pkl")
+        partial = _load_partial(cache_path) if cache_path and reuse else None
+        if partial is None:
+            partial = partition_partials(pd.read_csv(io.BytesIO(block)))
+            rescanned += 1
+            if cache_path:
+                _store_partial(cache_path, partial)
+        # Number rejected rows within the file rather than the partition
+        partial['rejected'].index += number * rows
+        partials.append(partial)
+
+    if not partials:
+        # Header-only file: no partitions to merge
+        return partition_partials(pd.read_csv(path)), 0, 0
+    merged = merge_partials(partials)
+    if len(np.unique(merged['pet_ids'])) < len(merged['pet_ids']):
+        # A PetID repeated across partitions is an outcome update: partials are not additive, rescan whole file
+        merged = partition_partials(pd.read_csv(path))
+        rescanned = len(partials)
+    return merged, len(partials), rescanned
+
+
+def _kpis(cells):
+    totals = cells[CUBE_MEASURES].sum()
+    count = totals['Count']
+    return {
+        'TotalPets': int(count),
+        'Adopted': int(totals['Adopted']),
+        'AdoptionRate': totals['Adopted'] / count if count else 0.0,
+        'VaccinationRate': totals['VaccinatedSum'] / count if count else 0.0,
+        'AvgAdoptionFee': totals['FeeSum'] / count if count else 0.0,
+        'AvgShelterDays': totals['ShelterDaysSum'] / count if count else 0.0,
+        'AvgAgeMonths': totals['AgeSum'] / count if count else 0.0
+    }
+
+
+# Mean/std from cube sums and sums of squares, min/max from the frequency tables
+def _summaries(cells, frequencies):
+    count = cells['Count'].sum()
+    rows = {}
+    for col in SUMMARY_COLUMNS:
+        total = cells[SUM_MEASURES[col]].sum()
+        squares = cells[f"{col}*{col}"].sum()
+        values = frequencies[col].table()['Value']
+        rows[col] = {
+            'mean': total / count,
+            'std': np.sqrt(max(squares - total ** 2 / count, 0) / (count - 1)) if count > 1 else np.nan,
+            'min': values.iloc[0],
+            'max': values.iloc[-1]
+        }
+    return pd.DataFrame(rows).T
+
+
+# All worksheet statistics for one shelter, computed from merged partition partials
+def shelter_statistics(path, partial_dir=None, partition_rows=PARTITION_ROWS, reuse=True):
+    merged, partitions, rescanned = shelter_partials(path, partial_dir, partition_rows, reuse)
+    cells = merged['cells']
+    frequencies = merged['frequencies']
+    count = cells['Count'].sum()
+    name = os.path.splitext(os.path.basename(path))[0]
+
+    # No valid rows (an empty file, or every row quarantined): the report only says so
+    if count == 0:
+        return {'name': name, 'partitions': partitions, 'rescanned': rescanned, 'empty': True,
+                'kpis': _kpis(cells), 'rejected': merged['rejected']}
+
+    summaries = _summaries(cells, frequencies)
+
+    rates = {dim: rate_table(cells, dim) for dim in RATE_DIMENSIONS}
+    effects = {}
+    for col, (one_label, zero_label) in BINARY_EFFECTS.items():
+        table = rate_table(cells, col)
+        table.index = [one_label if level == 1 else zero_label for level in table.index]
+        effects[col] = table
+
+    # Age effect: younger than the average age vs the rest, alone and crossed with vaccination
+    average_age = cells['AgeSum'].sum() / count
+    younger = cells['AgeMonths'] < average_age
+    vaccinated = cells['Vaccinated'] == 1
+    age_effect = pd.DataFrame({
+        'All': [_rate(cells[younger]), _rate(cells[~younger])],
+        'Vaccinated': [_rate(cells[vaccinated & younger]), _rate(cells[vaccinated & ~younger])],
+        'Not vaccinated': [_rate(cells[~vaccinated & younger]), _rate(cells[~vaccinated & ~younger])]
+    }, index=['Younger than average', 'Average age or older'])
+
+    by_type_size = cells.groupby(['PetType', 'Size'])[['Count', 'Adopted']].sum()
+    size_within_type = (by_type_size['Adopted'] / by_type_size['Count']).unstack()
+    by_type_owner = cells.groupby(['PetType', 'PreviousOwner'])[['Count', 'FeeSum']].sum()
+    fee_pivot = (by_type_owner['FeeSum'] / by_type_owner['Count']).unstack()
+    fee_pivot = fee_pivot.rename(columns={0: 'No previous owner', 1: 'Previous owner'})
+
+    # Fee by outcome from the fee*adoption product measure: no second pass over rows
+    adopted = cells['Adopted'].sum()
+    fee_adopted = cells['AdoptionFee*AdoptionLikelihood'].sum()
+    fee = {
+        'correlation': correlation_from_cells(cells).loc['AdoptionFee', 'AdoptionLikelihood'],
+        'avg_adopted': fee_adopted / adopted if adopted else np.nan,
+        'avg_not_adopted': (cells['FeeSum'].sum() - fee_adopted) / (count - adopted) if count > adopted else np.nan
+    }
+
+    return {
+        'name': name,
+        'partitions': partitions,
+        'rescanned': rescanned,
+        'empty': False,
+        'kpis': _kpis(cells),
+        'summaries': summaries,
+        'frequencies': frequencies,
+        'rates': rates,
+        'effects': effects,
+        'average_age': average_age,
+        'age_effect': age_effect,
+        'size_within_type': size_within_type,
+        'fee_pivot': fee_pivot,
+        'fee': fee,
+        'weight_hist': rebin_histogram(merged['weight_fine'], 20),
+        'age_fee': merged['age_fee'],
+        'rejected': merged['rejected']
+    }
+
+
+# Small picklable descriptions of every chart, so rendering can run in worker processes
+def chart_specs(stats, chart_dir):
+    if stats['empty']:
+        return []
+    base = os.path.join(chart_dir, stats['name'])
+    specs = [
+        {'kind': 'histogram', 'path': f"{base}_weight_hist.png", 'title': "Pets' Weight Distribution",
+         'xlabel': "Weight (kg)", 'edges': np.r_[stats['weight_hist']['BinStart'], stats['weight_hist']['BinEnd'].iloc[-1]],
+         'counts': stats['weight_hist']['Count'].to_numpy()},
+        {'kind': 'scatter', 'path': f"{base}_age_fee_scatter.png", 'title': "Age vs Adoption Fee",
+         'xlabel': "AgeMonths", 'ylabel': "Adoption Fee", 'points': stats['age_fee']}
+    ]
+    for dim, cmap, horizontal in [('PetType', 'viridis', False), ('Color', 'magma', False),
+                                  ('Breed', 'coolwarm', True), ('Size', 'cividis', False)]:
+        table = stats['rates'][dim].sort_values('Rate') if horizontal else stats['rates'][dim]
+        specs.append({'kind': 'rate_bar', 'path': f"{base}_rate_by_{dim.lower()}.png",
+                      'title': f"Adoption Rate by {dim}", 'label': dim, 'cmap': cmap, 'horizontal': horizontal,
+                      'labels': [str(level) for level in table.index], 'rates': table['Rate'].to_numpy()})
+    effects = pd.concat(stats['effects'].values())
+    specs.append({'kind': 'rate_bar', 'path': f"{base}_binary_effects.png", 'title': "Adoption Rate by Condition",
+                  'label': "Condition", 'cmap': 'Set2', 'horizontal': True,
+                  'labels': list(effects.index), 'rates': effects['Rate'].to_numpy()})
+    return specs
+
+
+# zlib level for chart PNGs: level 1 encodes several times faster than the default for ~50% larger files
+PNG_COMPRESS_LEVEL = 1
+
+
+class ChartRenderer:
+    """Agg figures kept per chart shape; later charts of a shape update the existing artists
+    (bar geometry, colors, offsets, texts) and only re-run the layout when labels or limits change"""
+
+    def __init__(self):
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        self.plt = plt
+        self.canvases = {}
+
+    @staticmethod
+    def shape(spec):
+        if spec['kind'] == 'histogram':
+            return ('histogram', len(spec['counts']))
+        if spec['kind'] == 'scatter':
+            return ('scatter',)
+        return ('rate_bar', spec['horizontal'], len(spec['rates']))
+
+    def _create(self, spec):
+        fig, ax = self.plt.subplots(figsize=(6, 4), dpi=100)
+        canvas = {'fig': fig, 'ax': ax, 'layout': None}
+        if spec['kind'] == 'histogram':
+            n = len(spec['counts'])
+            canvas['bars'] = ax.bar(np.arange(n), np.zeros(n), align='edge', edgecolor='black').patches
+            ax.set_ylabel("Count")
+        elif spec['kind'] == 'scatter':
+            canvas['points'] = ax.scatter([], [], alpha=0.5)
+        else:
+            n = len(spec['rates'])
+            positions = np.arange(n)
+            if spec['horizontal']:
+                canvas['bars'] = ax.barh(positions, np.zeros(n)).patches
+                ax.set_xlim(0, 1)
+                ax.set_xlabel("Adoption Rate (fraction adopted)")
+                canvas['texts'] = [ax.text(0, i, '', va='center') for i in positions]
+            else:
+                canvas['bars'] = ax.bar(positions, np.zeros(n)).patches
+                ax.set_ylim(0, 1)
+                ax.set_ylabel("Adoption Rate (fraction adopted)")
+                canvas['texts'] = [ax.text(i, 0, '', ha='center') for i in positions]
+        return canvas
+
+    def _update(self, canvas, spec):
+        ax = canvas['ax']
+        if spec['kind'] == 'histogram':
+            edges = spec['edges']
+            for bar, left, width, count in zip(canvas['bars'], edges[:-1], np.diff(edges), spec['counts']):
+                bar.set_x(left)
+                bar.set_width(width)
+                bar.set_height(count)
+            ax.relim()
+            ax.autoscale_view()
+            ax.set_xlabel(spec['xlabel'])
+            labels = ()
+        elif spec['kind'] == 'scatter':
+            points = spec['points']
+            canvas['points'].set_offsets(points)
+            ax.ignore_existing_data_limits = True
+            ax.update_datalim(points)
+            ax.autoscale_view()
+            ax.set_xlabel(spec['xlabel'])
+            ax.set_ylabel(spec['ylabel'])
+            labels = ()
+        else:
+            rates = spec['rates']
+            colors = self.plt.get_cmap(spec['cmap'])(np.linspace(0.15, 0.85, len(rates)))
+            positions = np.arange(len(rates))
+            for i, (bar, text, v) in enumerate(zip(canvas['bars'], canvas['texts'], rates)):
+                bar.set_facecolor(colors[i])
+                text.set_text(f"{v*100:.1f}%")
+                if spec['horizontal']:
+                    bar.set_width(v)
+                    text.set_position((v + 0.01, i))
+                else:
+                    bar.set_height(v)
+                    text.set_position((i, v + 0.02))
+            if spec['horizontal']:
+                ax.set_yticks(positions, spec['labels'])
+            else:
+                ax.set_xticks(positions, spec['labels'])
+                ax.set_xlabel(spec['label'])
+            labels = tuple(spec['labels'])
+        ax.set_title(spec['title'])
+
+        # Tight layout only depends on the texts around the axes and the tick labels the limits produce
+        layout = (spec['title'], ax.get_xlabel(), ax.get_ylabel(), labels, ax.get_xlim(), ax.get_ylim())
+        if layout != canvas['layout']:
+            canvas['fig'].tight_layout()
+            canvas['layout'] = layout
+
+    # Draw one chart and write it as PNG straight from the Agg buffer; returns (path, seconds, reused)
+    def render(self, spec):
+        from PIL import Image
+
+        start = time.perf_counter()
+        key = self.shape(spec)
+        reused = key in self.canvases
+        if not reused:
+            self.canvases[key] = self._create(spec)
+        canvas = self.canvases[key]
+        self._update(canvas, spec)
+        fig = canvas['fig']
+        fig.canvas.draw()
+        Image.frombuffer('RGBA', fig.canvas.get_width_height(), fig.canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1) \
+            .save(spec['path'], compress_level=PNG_COMPRESS_LEVEL)
+        return spec['path'], time.perf_counter() - start, reused
+
+    def close(self):
+        for canvas in self.canvases.values():
+            self.plt.close(canvas['fig'])
+        self.canvases = {}
+
+
+# Worker: render a batch of charts with one renderer; returns [(path, seconds, reused)]
+def render_batch(specs):
+    renderer = ChartRenderer()
+    try:
+        return [renderer.render(spec) for spec in specs]
+    finally:
+        renderer.close()
+
+
+# Chart specs split into one batch per worker, charts of the same shape kept together so they share figures
+def chart_batches(specs, n):
+    specs = sorted(specs, key=lambda spec: repr(ChartRenderer.shape(spec)))
+    size = max(1, -(-len(specs) // n))
+    return [specs[i:i + size] for i in range(0, len(specs), size)]
+
+
+def _percent(value):
+    return f"{value*100:.2f}%"
+
+
+# Report sections as (heading, text, table) tuples shared by the HTML and Markdown writers
+def report_sections(stats):
+    kpis = stats['kpis']
+    rate_columns = lambda table: table.assign(Rate=table['Rate'].map(_percent),
+                                              CI=[f"{lo*100:.1f}–{hi*100:.1f}%" for lo, hi in zip(table['Lower'], table['Upper'])]
+                                              )[['Count', 'Adopted', 'Rate', 'CI']]
+    if stats['empty']:
+        sections = [("Overview", "No valid rows to analyse, so this report has no statistics or charts.", None)]
+    else:
+        sections = [
+            ("Overview", f"{kpis['TotalPets']:,} pets, adoption rate {_percent(kpis['AdoptionRate'])}, "
+                         f"vaccination rate {_percent(kpis['VaccinationRate'])}, average fee ${kpis['AvgAdoptionFee']:.2f}, "
+                         f"average stay {kpis['AvgShelterDays']:.1f} days.", None),
+            ("Summary statistics", None, stats['summaries'].round(2))
+        ]
+    rejected = stats['rejected']
+    if len(rejected):
+        reasons = pd.Series(reason_counts(rejected), name='Rows').rename_axis('Reason').sort_values(ascending=False)
+        sections.insert(1, ("Data quality", f"{len(rejected):,} rows failed validation and were left out of this report "
+                                            f"(quarantine/{stats['name']}.rejected.csv).", reasons.to_frame()))
+    if stats['empty']:
+        return sections
+    for col, frequencies in stats['frequencies'].items():
+        sections.append((f"{col}: most frequent values", f"{len(frequencies.table())} distinct values.",
+                         frequencies.top(10).set_index('Value').round(2)))
+    for dim in RATE_DIMENSIONS:
+        sections.append((f"Adoption rate by {dim}", None, rate_columns(stats['rates'][dim])))
+    sections.append(("Adoption rate by Size within each PetType (%)", None, (stats['size_within_type'] * 100).round(1)))
+    for col, table in stats['effects'].items():
+        sections.append((f"{col} effect", None, rate_columns(table)))
+    sections.append(("Age effect", f"Average age: {stats['average_age']:.2f} months.", (stats['age_effect'] * 100).round(2)))
+    sections.append(("Average adoption fee by PetType and PreviousOwner ($)", None, stats['fee_pivot'].round(2)))
+    fee = stats['fee']
+    sections.append(("Adoption fee effect", f"Correlation between AdoptionFee and AdoptionLikelihood: {fee['correlation']:.4f}. "
+                                            f"Average fee ${fee['avg_adopted']:.2f} for adopted pets vs "
+                                            f"${fee['avg_not_adopted']:.2f} for pets not adopted.", None))
+    return sections
+
+
+def _markdown_table(table):
+    header = [str(table.index.name or '')] + [str(col) for col in table.columns]
+    lines = ['| ' + ' | '.join(header) + ' |', '|' + '---|' * len(header)]
+    for index, *row in table.itertuples():
+        lines.append('| ' + ' | '.join([str(index)] + [str(value) for value in row]) + ' |')
+    return '\n'.join(lines)
+
+
+def write_markdown(stats, charts, path):
+    lines = [f"# Pet Adoption EDA Report: {stats['name']}", '']
+    for heading, text, table in report_sections(stats):
+        lines.append(f"## {heading}")
+        if text:
+            lines.append(text)
+        if table is not None:
+            lines.append(_markdown_table(table))
+        lines.append('')
+    if charts:
+        lines.append("## Charts")
+    lines.extend(f"![{os.path.basename(chart)}]({os.path.relpath(chart, os.path.dirname(path))})" for chart in charts)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def write_html(stats, charts, path):
+    parts = [f"<html><head><meta charset='utf-8'><title>{html.escape(stats['name'])} EDA Report</title>",
+             "<style>body{font-family:sans-serif;max-width:960px;margin:auto;color:#2c3e50}"
+             "table{border-collapse:collapse;margin-bottom:10px}td,th{border:1px solid #e1e8ed;padding:4px 10px}"
+             "img{max-width:48%;margin:1%}</style></head><body>",
+             f"<h1>Pet Adoption EDA Report: {html.escape(stats['name'])}</h1>"]
+    for heading, text, table in report_sections(stats):
+        parts.append(f"<h2>{html.escape(heading)}</h2>")
+        if text:
+            parts.append(f"<p>{html.escape(text)}</p>")
+        if table is not None:
+            parts.append(table.to_html())
+    if charts:
+        parts.append("<h2>Charts</h2>")
+    parts.extend(f"<img src='{html.escape(os.path.relpath(chart, os.path.dirname(path)))}'>" for chart in charts)
+    parts.append("</body></html>")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(parts))
+
+
+def input_files(paths):
+    files = []
+    for path in paths:
+        files.extend(sorted(glob.glob(os.path.join(path, '*.csv'))) if os.path.isdir(path) else [path])
+    return files
+
+
+# Statistics per shelter, then every chart of every shelter, on one shared process pool
+def build_reports(paths, out_dir, workers=None, formats=('html', 'md'), partition_rows=PARTITION_ROWS, incremental=True):
+    chart_dir = os.path.join(out_dir, 'charts')
+    os.makedirs(chart_dir, exist_ok=True)
+    # Non-incremental runs rescan every partition but still refresh the cache
+    partial_dir = os.path.join(out_dir, '.partials')
+    os.makedirs(partial_dir, exist_ok=True)
+    workers = workers or os.cpu_count()
+    timings = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        start = time.perf_counter()
+        all_stats = list(pool.map(functools.partial(shelter_statistics, partial_dir=partial_dir, reuse=incremental,
+                                                    partition_rows=partition_rows), paths))
+        timings['statistics'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        specs = [chart_specs(stats, chart_dir) for stats in all_stats]
+        batches = chart_batches([spec for shelter in specs for spec in shelter], workers)
+        rendered = [chart for batch in pool.map(render_batch, batches) for chart in batch]
+        timings['charts'] = time.perf_counter() - start
+    pd.DataFrame(rendered, columns=['Chart', 'Seconds', 'ReusedFigure']).to_csv(
+        os.path.join(chart_dir, 'render_times.csv'), index=False)
+    for stats in all_stats:
+        Quarantine(os.path.join(out_dir, 'quarantine', f"{stats['name']}.rejected.csv")).add(stats['rejected'])
+
+    start = time.perf_counter()
+    reports = []
+    for stats, shelter_specs in zip(all_stats, specs):
+        charts = [spec['path'] for spec in shelter_specs]
+        if 'html' in formats:
+            reports.append(os.path.join(out_dir, f"{stats['name']}.html"))
+            write_html(stats, charts, reports[-1])
+        if 'md' in formats:
+            reports.append(os.path.join(out_dir, f"{stats['name']}.md"))
+            write_markdown(stats, charts, reports[-1])
+    timings['reports'] = time.perf_counter() - start
+    return reports, rendered, timings, all_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate worksheet EDA reports for one or many shelter CSV files")
+    parser.add_argument('inputs', nargs='+', help="CSV files or directories of CSV files (one per shelter)")
+    parser.add_argument('--out', default='reports', help="output directory")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--format', nargs='+', choices=['html', 'md'], default=['html', 'md'])
+    parser.add_argument('--partition-rows', type=int, default=PARTITION_ROWS, help="rows per cached partition")
+    parser.add_argument('--full', action='store_true', help="rescan every partition instead of loading cached results (the cache is rewritten)")
+    args = parser.parse_args()
+
+    paths = input_files(args.inputs)
+    start = time.perf_counter()
+    reports, rendered, timings, all_stats = build_reports(paths, args.out, args.workers, args.format,
+                                                          args.partition_rows, incremental=not args.full)
+    total = time.perf_counter() - start
+
+    print(f"📊 {len(paths)} shelter(s), {len(rendered)} charts, {len(reports)} report files in {total:.1f}s")
+    print(f"   {sum(stats['rescanned'] for stats in all_stats)} of {sum(stats['partitions'] for stats in all_stats)} "
+          f"partitions rescanned")
+    for stats in all_stats:
+        if stats['empty']:
+            print(f"   ⚠️ {stats['name']}: no valid rows, its report has no statistics or charts")
+        if len(stats['rejected']):
+            print(f"   ⚠️ {stats['name']}: {len(stats['rejected']):,} invalid rows quarantined to "
+                  f"{os.path.join(args.out, 'quarantine', stats['name'] + '.rejected.csv')}")
+    print("   " + ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in timings.items())
+          + f" (chart CPU time {sum(seconds for _, seconds, _ in rendered):.2f}s)")
+    reused = [seconds for _, seconds, was_reused in rendered if was_reused]
+    new = [seconds for _, seconds, was_reused in rendered if not was_reused]
+    print(f"   per chart: {1000 * np.mean(new):.1f} ms on {len(new)} new figures"
+          + (f", {1000 * np.mean(reused):.1f} ms on {len(reused)} reused" if reused else "")
+          + f" (all times in {os.path.join(args.out, 'charts', 'render_times.csv')})")
+    for report in reports:
+        print(f"   {report}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Dashboard Figure Export
+Headless export of the attempt-8 dashboard charts to PNG/SVG for every shelter and filter preset.
+Figures come from the dashboard's own create_* builders; rendering runs in a pool of processes
+(one kaleido browser each) and outputs are cached by (figure JSON hash, format, size), so only
+charts whose figure changed are rendered again
+
+Usage:
+    python figure_export.py                                       # pet_adoption.csv, all presets, PNG
+    python figure_export.py shelters/*.csv --format png svg --workers 4
+    python figure_export.py "sqlite://shelters.db?table=north"
+    python figure_export.py --preset all dogs --chart correlation_matrix --width 1200 --height 800
+"""
+
+import argparse
+import hashlib
+import importlib
+import os
+import shutil
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs
+
+DEFAULT_APP_MODULE = '第8次尝试_交互式筛选dashboard'
+EXPORT_DIR = 'exports'
+
+# (pet_type, age_range, vaccine_status, health_condition) as sent by the dashboard filters
+FILTER_PRESETS = {
+    'all': ('All', [0, 20], 'All', 'All'),
+    'dogs': ('Dog', [0, 20], 'All', 'All'),
+    'cats': ('Cat', [0, 20], 'All', 'All'),
+    'birds': ('Bird', [0, 20], 'All', 'All'),
+    'rabbits': ('Rabbit', [0, 20], 'All', 'All'),
+    'vaccinated': ('All', [0, 20], 1, 'All'),
+    'healthy': ('All', [0, 20], 'All', 0),
+    'young': ('All', [0, 3], 'All', 'All')
+}
+
+# Chart name -> figure from the dashboard module and a filter preset, using the same inputs as the tabs
+EXPORT_CHARTS = {
+    'pet_type_adoption_overview': lambda d, f: d.create_pet_type_adoption_overview(d.apply_filters(d.current_data(), *f)),
+    'vaccine_adoption_overview': lambda d, f: d.create_vaccine_adoption_overview(d.apply_filters(d.current_data(), *f)),
+    'health_adoption_overview': lambda d, f: d.create_health_adoption_overview(d.apply_filters(d.current_data(), *f)),
+    'age_adoption_overview': lambda d, f: d.create_age_adoption_overview(d.apply_filters(d.current_data(), *f)),
+    'size_adoption_overview': lambda d, f: d.create_size_adoption_overview(d.apply_filters(d.current_data(), *f)),
+    'pet_type_adoption_rates': lambda d, f: d.create_pet_type_adoption_rates(d.filtered_rate_table('PetType', *f)),
+    'color_adoption_rates': lambda d, f: d.create_color_adoption_rates(d.filtered_rate_table('Color', *f)),
+    'breed_adoption_rates': lambda d, f: d.create_breed_adoption_rates(d.filtered_rate_table('Breed', *f)),
+    'age_adoption_trend': lambda d, f: d.create_age_adoption_trend(d.apply_filters(d.current_data(), *f)),
+    'age_distribution': lambda d, f: d.create_age_distribution(d.filtered_histogram('AgeMonths', *f)),
+    'weight_distribution': lambda d, f: d.create_weight_distribution(d.filtered_histogram('WeightKg', *f)),
+    'adoption_fee_analysis': lambda d, f: d.create_adoption_fee_analysis(d.filtered_histogram('AdoptionFee', *f)),
+    'shelter_days_distribution': lambda d, f: d.create_shelter_days_distribution(d.filtered_histogram('TimeInShelterDays', *f)),
+    'shelter_time_analysis': lambda d, f: d.create_shelter_time_analysis(d.filtered_box_summaries('TimeInShelterDays', 'PetType', *f)),
+    'fee_box_plot': lambda d, f: d.create_fee_box_plot(d.filtered_box_summaries('AdoptionFee', 'PetType', *f)),
+    'age_box_plot': lambda d, f: d.create_age_box_plot(d.filtered_box_summaries('AgeMonths', 'PetType', *f)),
+    'weight_fee_scatter': lambda d, f: d.create_weight_fee_scatter(d.filtered_density_grid('WeightKg', 'AdoptionFee', *f)),
+    'weight_age_analysis': lambda d, f: d.create_weight_age_analysis(d.filtered_density_grid('AgeMonths', 'WeightKg', *f)),
+    'age_weight_fee_3d': lambda d, f: d.create_age_weight_fee_3d(d.filtered_sample(300, *f)),
+    'correlation_matrix': lambda d, f: d.create_correlation_matrix(
+        d.correlation_from_cells(d.filter_cells(d.store.cube_frame(), f[0], f[1], f[2], f[3]))),
+    'survival_curves': lambda d, f: d.create_survival_curves(d.filtered_survival_curves('PetType', *f)),
+    'vaccine_health_interaction': lambda d, f: d.create_vaccine_health_interaction(d.apply_filters(d.current_data(), *f))
+}
+
+
+# Export directory name of a source: the file stem, plus the table of a SQLite URI
+# (sqlite://shelters.db?table=north -> shelters-north), so tables of one database do not collide
+def shelter_name(source):
+    location, _, query = source.partition('?')
+    name = os.path.splitext(os.path.basename(location))[0]
+    table = parse_qs(query).get('table')
+    return f"{name}-{table[-1]}" if table else name
+
+
+def cache_key(figure_json, fmt, width, height, scale):
+    digest = hashlib.sha256(figure_json.encode('utf-8'))
+    digest.update(f"|{fmt}|{width}x{height}@{scale}".encode('utf-8'))
+    return digest.hexdigest()
+
+
+# Worker (one process per shelter): import the dashboard on that shelter's data source and serialize every figure.
+# Returns [(shelter, preset, chart, figure_json or None, error)].
+def build_figures(module_name, source_uri, shelter, presets, charts):
+    os.environ['PET_ADOPTION_SOURCE'] = source_uri
+    dashboard = importlib.import_module(module_name)
+    figures = []
+    for preset in presets:
+        for chart in charts:
+            try:
+                figure = EXPORT_CHARTS[chart](dashboard, FILTER_PRESETS[preset])
+                figures.append((shelter, preset, chart, figure.to_json(), None))
+            except Exception as error:
+                figures.append((shelter, preset, chart, None, f"{type(error).__name__}: {error}"))
+    return figures
+
+
+# Worker: render a batch of figures with one kaleido session; returns the cache files written
+def render_batch(jobs):
+    import plotly.io as pio
+
+    figures = [pio.from_json(job['figure_json'], skip_invalid=True) for job in jobs]
+    pio.write_images(figures, [job['cache_path'] for job in jobs], format=[job['format'] for job in jobs],
+                     width=[job['width'] for job in jobs], height=[job['height'] for job in jobs],
+                     scale=[job['scale'] for job in jobs])
+    return [job['cache_path'] for job in jobs]
+
+
+def _batches(jobs, n):
+    size = max(1, -(-len(jobs) // n))
+    return [jobs[i:i + size] for i in range(0, len(jobs), size)]
+
+
+def export_figures(sources, out_dir=EXPORT_DIR, presets=None, charts=None, formats=('png',),
+                   width=1000, height=600, scale=1, workers=None, module_name=DEFAULT_APP_MODULE):
+    presets = presets or list(FILTER_PRESETS)
+    charts = charts or list(EXPORT_CHARTS)
+    cache_dir = os.path.join(out_dir, '.cache')
+    os.makedirs(cache_dir, exist_ok=True)
+    workers = workers or os.cpu_count()
+    names = [shelter_name(source) for source in sources]
+    duplicates = sorted(name for name, count in Counter(names).items() if count > 1)
+    if duplicates:
+        raise ValueError(f"Sources would export to the same directory: {', '.join(duplicates)}")
+    report = {'figures': 0, 'rendered': 0, 'cached': 0, 'errors': [], 'timings': {}}
+
+    # Figures: one fresh process per shelter, since the dashboard module loads its data on import
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as pool:
+        futures = [pool.submit(build_figures, module_name, source, name, presets, charts)
+                   for source, name in zip(sources, names)]
+        built = [figure for future in futures for figure in future.result()]
+    report['timings']['figures'] = time.perf_counter() - start
+
+    # Jobs whose (figure, format, size) has never been rendered; everything else is a cache hit
+    outputs, pending, queued = [], [], set()
+    for shelter, preset, chart, figure_json, error in built:
+        if error:
+            report['errors'].append(f"{shelter}/{preset}/{chart}: {error}")
+            continue
+        for fmt in formats:
+            key = cache_key(figure_json, fmt, width, height, scale)
+            cache_path = os.path.join(cache_dir, f"{key}.{fmt}")
+            outputs.append((cache_path, os.path.join(out_dir, shelter, preset, f"{chart}.{fmt}")))
+            report['figures'] += 1
+            if os.path.exists(cache_path) or cache_path in queued:
+                report['cached'] += 1
+                continue
+            queued.add(cache_path)
+            pending.append({'figure_json': figure_json, 'cache_path': cache_path, 'format': fmt,
+                            'width': width, 'height': height, 'scale': scale})
+
+    start = time.perf_counter()
+    if pending:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+            for written in pool.map(render_batch, _batches(pending, workers)):
+                report['rendered'] += len(written)
+    report['timings']['render'] = time.perf_counter() - start
+
+    for cache_path, output_path in outputs:
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        shutil.copyfile(cache_path, output_path)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export dashboard charts to static images for shelters and filter presets")
+    parser.add_argument('inputs', nargs='*', default=['pet_adoption.csv'],
+                        help="shelter data sources: CSV paths or csv:// parquet:// sqlite:// URIs")
+    parser.add_argument('--out', default=EXPORT_DIR, help="output directory (render cache in <out>/.cache)")
+    parser.add_argument('--preset', nargs='+', choices=list(FILTER_PRESETS), help="filter presets (default: all)")
+    parser.add_argument('--chart', nargs='+', choices=list(EXPORT_CHARTS), help="charts (default: all)")
+    parser.add_argument('--format', nargs='+', choices=['png', 'svg'], default=['png'])
+    parser.add_argument('--width', type=int, default=1000)
+    parser.add_argument('--height', type=int, default=600)
+    parser.add_argument('--scale', type=float, default=1)
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--module', default=DEFAULT_APP_MODULE, help="dashboard module providing the create_* builders")
+    args = parser.parse_args()
+
+    try:
+        report = export_figures(args.inputs, args.out, args.preset, args.chart, args.format,
+                                args.width, args.height, args.scale, args.workers, args.module)
+    except ValueError as error:
+        parser.error(str(error))
+    print(f"🖼️ {report['figures']} images: {report['rendered']} rendered, {report['cached']} from cache "
+          f"(figures {report['timings']['figures']:.1f}s, render {report['timings']['render']:.1f}s)")
+    for error in report['errors']:
+        print(f"   ⚠️ {error}")
+
+
+if __name__ == '__main__':
+    main()
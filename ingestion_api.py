@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Pet Adoption Ingestion API
+Flask routes that accept pet_adoption.csv records and apply them to the store incrementally
+"""
+
+import io
+import pandas as pd
+from flask import request, jsonify
+from data_validation import validate_frame, reason_counts
+
+
+# Parse the request body: JSON list, {"records": [...]}, or CSV text with the pet_adoption.csv header
+def parse_records(req):
+    if req.mimetype in ('text/csv', 'text/plain'):
+        frame = pd.read_csv(io.StringIO(req.get_data(as_text=True)))
+        return frame.to_dict('records')
+
+    payload = req.get_json(silent=True)
+    if isinstance(payload, dict):
+        payload = payload.get('records', [payload] if 'PetID' in payload else None)
+    if not isinstance(payload, list):
+        raise ValueError("Expected a JSON list of records, {\"records\": [...]} or CSV text")
+    return payload
+
+
+# Register ingestion routes on the Dash app's Flask server
+def register_ingestion_routes(server, store, on_ingest=None):
+
+    @server.route('/api/ingest', methods=['POST'])
+    def ingest_records():
+        try:
+            records = parse_records(request)
+            # Same rules as every load path; a batch with any invalid record is rejected as a whole
+            _, rejected = validate_frame(pd.DataFrame(records))
+            if not rejected.empty:
+                return jsonify({
+                    'error': f"{len(rejected)} invalid record(s), nothing ingested",
+                    'reasons': dict(reason_counts(rejected)),
+                    'rows': [{'row': int(row), 'reasons': reasons.split(';')}
+                             for row, reasons in rejected['Reasons'].items()]
+                }), 400
+            result = store.ingest(records)
+        except (ValueError, TypeError, pd.errors.ParserError) as error:
+            return jsonify({'error': str(error)}), 400
+
+        if on_ingest is not None:
+            on_ingest(result)
+        return jsonify({key: result[key] for key in ('inserted', 'updated', 'version', 'kpis')})
+
+    @server.route('/api/kpis', methods=['GET'])
+    def current_kpis():
+        with store.lock:
+            return jsonify({'version': store.version, 'kpis': store.kpis()})
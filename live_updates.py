@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Live Update Channel
+Server-Sent Events stream that broadcasts small adoption-cube deltas to every open dashboard,
+so the cost of an update is paid once per ingest instead of once per client poll
+"""
+
+import json
+import queue
+import threading
+from flask import Response
+from adoption_store import CUBE_DIMENSIONS, CUBE_MEASURES
+
+
+class DeltaBroadcaster:
+    """Fan-out of pre-serialized delta events to subscriber queues"""
+
+    def __init__(self, max_pending=256):
+        self.max_pending = max_pending
+        self.subscribers = set()
+        self.lock = threading.Lock()
+
+    def subscribe(self):
+        subscriber = queue.Queue(maxsize=self.max_pending)
+        with self.lock:
+            self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    # Serialize once, enqueue the same bytes for everyone
+    def publish(self, event):
+        message = f"data: {json.dumps(event)}\n\n"
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                self._drop(subscriber)
+
+    # Client fell too far behind: replace its backlog with the None sentinel, which ends its stream;
+    # the browser reconnects after `retry` and re-renders instead of replaying the missed deltas
+    def _drop(self, subscriber):
+        self.unsubscribe(subscriber)
+        while True:
+            try:
+                while True:
+                    subscriber.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                subscriber.put_nowait(None)
+                return
+            except queue.Full:
+                # A concurrent publish refilled the queue between draining and the put
+                continue
+
+    def stream(self, subscriber, keepalive_seconds=15):
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    message = subscriber.get(timeout=keepalive_seconds)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                if message is None:
+                    yield "event: resync\ndata: {}\n\n"
+                    return
+                yield message
+        finally:
+            self.unsubscribe(subscriber)
+
+
+# Compact event for one ingest result: KPI totals plus the per-cell deltas
+def delta_event(result):
+    return {
+        'version': result['version'],
+        'kpis': result['kpis'],
+        'dimensions': CUBE_DIMENSIONS,
+        'measures': CUBE_MEASURES,
+        'deltas': result['deltas']
+    }
+
+
+# Register the SSE endpoint and return the ingest hook that feeds it
+def register_live_updates(server, broadcaster):
+
+    @server.route('/api/stream')
+    def stream_deltas():
+        subscriber = broadcaster.subscribe()
+        return Response(broadcaster.stream(subscriber), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+    def on_ingest(result):
+        broadcaster.publish(delta_event(result))
+
+    return on_ingest
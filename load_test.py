@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""
+Dashboard Load Test
+Replays concurrent filter interactions against the attempt-8 dashboard and reports
+throughput, p50/p95/p99 latency and error rate per callback. Each simulated user posts the
+tab-content callback and every callback the current tab mounts (scatter views, survival curves,
+pivot, data-table pages), and changes those tabs' controls, as a browser would. The dashboard runs in its own
+process, so the client threads do not share its GIL
+
+Usage:
+    python load_test.py --sessions 20 --duration 30
+    python load_test.py --url http://127.0.0.1:8050 --sessions 50
+    python load_test.py --in-process --sessions 5        # quick smoke run, latencies skewed by the shared GIL
+"""
+
+import argparse
+import importlib
+import json
+import logging
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+import numpy as np
+
+DEFAULT_APP_MODULE = '第8次尝试_交互式筛选dashboard'
+
+TABS = ['overview', 'adoption-rates', 'trends', 'deep-analysis', 'length-of-stay', 'pivot', 'data-table', 'insights']
+PET_TYPES = ['All', 'Bird', 'Cat', 'Dog', 'Rabbit']
+VACCINE_STATES = ['All', 1, 0]
+HEALTH_STATES = ['All', 0, 1]
+
+# Filter inputs shared by every callback, as (component id, property, session state key)
+FILTER_INPUTS = [('pet-type-filter', 'value', 'pet_type'), ('age-filter', 'value', 'age'),
+                 ('vaccine-filter', 'value', 'vaccine'), ('health-filter', 'value', 'health')]
+
+# tab-content's inputs around the filter inputs: the tab before them, the live-update refresh trigger after
+TAB_CONTENT_INPUTS = ([('tabs', 'value', 'tab')], [('live-refresh', 'data', None)])
+
+# Callbacks mounted by each tab besides tab-content: (outputs, inputs before the filter inputs).
+# Inputs are (component id, property, session state key), with None for props a user never sets
+TAB_CALLBACKS = {
+    'deep-analysis': [
+        ([('weight-fee-scatter', 'figure')],
+         [('scatter-mode', 'value', 'scatter_mode'), ('weight-fee-scatter', 'relayoutData', None)]),
+        ([('weight-age-analysis', 'figure')],
+         [('scatter-mode', 'value', 'scatter_mode'), ('weight-age-analysis', 'relayoutData', None)])
+    ],
+    'length-of-stay': [
+        ([('survival-content', 'children')], [('survival-group-by', 'value', 'group_by')])
+    ],
+    'pivot': [
+        ([('pivot-content', 'children')], [('pivot-rows', 'value', 'pivot_rows'), ('pivot-columns', 'value', 'pivot_columns'),
+                                           ('pivot-measure', 'value', 'pivot_measure')])
+    ],
+    'data-table': [
+        ([('data-table', 'data'), ('data-table', 'page_count'), ('data-table', 'page_current'), ('data-table', 'page_size'),
+          ('data-table-summary', 'children')],
+         [('data-table', 'page_current', 'page_current'), ('data-table-page-size', 'value', 'page_size'),
+          ('data-table', 'sort_by', 'sort_by'), ('data-table', 'filter_query', 'filter_query')])
+    ]
+}
+
+PIVOT_DIMENSIONS = ['PetType', 'Breed', 'Color', 'Size', 'AgeGroup', 'Vaccinated', 'HealthCondition', 'PreviousOwner']
+
+# Starting value and choices of every tab control a session can change
+CONTROLS = {
+    'scatter_mode': ('density', ['density', 'points']),
+    'group_by': ('PetType', ['PetType', 'Breed', 'Size', 'AgeGroup', 'Vaccinated', 'HealthCondition', 'PreviousOwner']),
+    'pivot_rows': ('PetType', PIVOT_DIMENSIONS),
+    'pivot_columns': ('Size', ['None'] + PIVOT_DIMENSIONS),
+    'pivot_measure': ('AdoptionRate', ['AdoptionRate', 'Count', 'MeanFee', 'MeanShelterDays', 'MeanAgeMonths', 'MeanWeightKg']),
+    # Pages past the end of a view are clamped by the server, so deep pages of small views are fine
+    'page_current': (0, [0, 1, 2, 5, 10, 20, 40, 80, 200, 1000]),
+    'page_size': (25, [25, 50, 100, 500]),
+    'sort_by': (None, [None] + [[{'column_id': col, 'direction': direction}]
+                                for col in ('PetID', 'PetType', 'Breed', 'AgeMonths', 'WeightKg', 'AdoptionFee')
+                                for direction in ('asc', 'desc')]),
+    'filter_query': ('', ['', '{PetType} contains Dog', '{AgeMonths} > 24', '{Breed} icontains "lab"',
+                          '{Size} = Large && {AdoptionFee} >= 200', '{WeightKg} < 5'])
+}
+
+
+# Start the dashboard in a background thread of this process and return its base URL
+def start_local_app(module_name, port):
+    from werkzeug.serving import make_server
+
+    dashboard = importlib.import_module(module_name)
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', port, dashboard.app.server, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{port}", server
+
+
+# Start the dashboard in a child process and wait until it answers; returns its base URL and the process
+def start_app_process(module_name, port, startup_timeout=120):
+    code = ("import importlib, logging, sys; logging.getLogger('werkzeug').setLevel(logging.ERROR); "
+            "importlib.import_module(sys.argv[1]).app.run(host='127.0.0.1', port=int(sys.argv[2]), debug=False)")
+    process = subprocess.Popen([sys.executable, '-c', code, module_name, str(port)], stdout=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.perf_counter() + startup_timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{module_name} exited with code {process.returncode} during startup")
+        try:
+            with urllib.request.urlopen(base_url + '/', timeout=1):
+                return base_url, process
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"{module_name} did not answer on {base_url} within {startup_timeout}s")
+
+
+def _output_key(outputs):
+    keys = [f"{component}.{prop}" for component, prop in outputs]
+    return keys[0] if len(keys) == 1 else '..' + '...'.join(keys) + '..'
+
+
+# Body of a _dash-update-component request; `changed` is the triggering prop, or None when a component mounts.
+# `inputs` come before the filter inputs and `after` behind them
+def callback_payload(outputs, inputs, state, changed, after=()):
+    output_specs = [{'id': component, 'property': prop} for component, prop in outputs]
+    return {
+        'output': _output_key(outputs),
+        'outputs': output_specs[0] if len(output_specs) == 1 else output_specs,
+        'inputs': [{'id': component, 'property': prop, 'value': state.get(key) if key else None}
+                   for component, prop, key in inputs + FILTER_INPUTS + list(after)],
+        'changedPropIds': [changed] if changed else [],
+        'state': []
+    }
+
+
+# Name a callback is reported under: its output, plus the number of further outputs
+def callback_label(outputs):
+    component, prop = outputs[0]
+    return f"{component}.{prop}" + (f" +{len(outputs) - 1}" if len(outputs) > 1 else "")
+
+
+# (label, payload) of every request a browser sends for one change: tab-content when the tab or a filter
+# changed, then each callback of the tab whose inputs include the change (all of them when the tab mounts)
+def requests_for(state, changed):
+    requests = []
+    mounting = changed == 'tabs.value'
+    if mounting or changed.endswith('-filter.value'):
+        before, after = TAB_CONTENT_INPUTS
+        requests.append((f"tab-content.children [{state['tab']}]",
+                         callback_payload([('tab-content', 'children')], before, state, changed, after)))
+    for outputs, inputs in TAB_CALLBACKS.get(state['tab'], []):
+        props = [f"{component}.{prop}" for component, prop, _ in inputs + FILTER_INPUTS]
+        if mounting or changed in props:
+            requests.append((callback_label(outputs), callback_payload(outputs, inputs, state, None if mounting else changed)))
+    return requests
+
+
+# Control of the current tab a session can change, as (state key, changed prop id)
+def tab_controls(tab):
+    return sorted({(key, f"{component}.{prop}") for _, inputs in TAB_CALLBACKS.get(tab, [])
+                   for component, prop, key in inputs if key in CONTROLS})
+
+
+# One user: random filter clicks and tab control changes, with the occasional slider drag sending a burst of updates
+def session_actions(rng):
+    state = {'tab': 'overview', 'pet_type': 'All', 'age': [0, 20], 'vaccine': 'All', 'health': 'All'}
+    state.update({key: start for key, (start, _) in CONTROLS.items()})
+    while True:
+        controls = tab_controls(state['tab'])
+        action = rng.choice(['tab', 'pet_type', 'vaccine', 'health', 'slider'] + (['control'] * 2 if controls else []))
+        if action == 'control':
+            key, changed = rng.choice(controls)
+            state[key] = rng.choice(CONTROLS[key][1])
+            yield state, changed
+            continue
+        if action == 'slider':
+            low = float(rng.choice(np.arange(0, 10, 0.5)))
+            for high in np.arange(low + 2, min(low + 8, 20) + 0.5, 0.5):
+                state['age'] = [low, float(high)]
+                yield state, 'age-filter.value'
+            continue
+        if action == 'tab':
+            state['tab'] = rng.choice(TABS)
+            # A remounted tab starts from its controls' initial values
+            state.update({key: start for key, (start, _) in CONTROLS.items()})
+            changed = 'tabs.value'
+        elif action == 'pet_type':
+            state['pet_type'] = rng.choice(PET_TYPES)
+            changed = 'pet-type-filter.value'
+        elif action == 'vaccine':
+            state['vaccine'] = rng.choice(VACCINE_STATES)
+            changed = 'vaccine-filter.value'
+        else:
+            state['health'] = rng.choice(HEALTH_STATES)
+            changed = 'health-filter.value'
+        yield state, changed
+
+
+def post_json(url, payload, timeout):
+    data = json.dumps(payload).encode('utf-8')
+    req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        response.read()
+        return response.status
+
+
+def run_session(base_url, seed, deadline, think_time, timeout, results, lock):
+    rng = random.Random(seed)
+    url = base_url + '/_dash-update-component'
+    for state, changed in session_actions(rng):
+        for callback_name, payload in requests_for(state, changed):
+            if time.perf_counter() >= deadline:
+                return
+            start = time.perf_counter()
+            try:
+                ok = post_json(url, payload, timeout) == 200
+            except (urllib.error.URLError, OSError):
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                results[callback_name].append((elapsed, ok))
+        if think_time:
+            time.sleep(rng.uniform(0, think_time))
+
+
+def summarize(results, wall_time):
+    rows = []
+    for name in sorted(results):
+        latencies = np.array([elapsed for elapsed, _ in results[name]]) * 1000
+        errors = sum(1 for _, ok in results[name] if not ok)
+        rows.append({
+            'callback': name,
+            'requests': len(latencies),
+            'throughput': len(latencies) / wall_time,
+            'p50': np.percentile(latencies, 50),
+            'p95': np.percentile(latencies, 95),
+            'p99': np.percentile(latencies, 99),
+            'error_rate': errors / len(latencies)
+        })
+    return rows
+
+
+def print_report(rows, wall_time, sessions):
+    total = sum(row['requests'] for row in rows)
+    print(f"\n📊 Load test: {sessions} sessions, {wall_time:.1f}s, {total} requests, {total / wall_time:.1f} req/s")
+    print(f"{'callback':<40}{'reqs':>7}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>9}")
+    for row in rows:
+        print(f"{row['callback']:<40}{row['requests']:>7}{row['throughput']:>9.1f}{row['p50']:>9.1f}"
+              f"{row['p95']:>9.1f}{row['p99']:>9.1f}{row['error_rate']*100:>8.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay concurrent filter interactions against the dashboard")
+    parser.add_argument('--sessions', type=int, default=10, help="number of concurrent simulated users")
+    parser.add_argument('--duration', type=float, default=20, help="test length in seconds")
+    parser.add_argument('--think-time', type=float, default=0.0, help="max random pause between actions (s)")
+    parser.add_argument('--timeout', type=float, default=30, help="per-request timeout (s)")
+    parser.add_argument('--url', help="target an already running dashboard instead of starting one")
+    parser.add_argument('--module', default=DEFAULT_APP_MODULE, help="dashboard module to start locally")
+    parser.add_argument('--in-process', action='store_true',
+                        help="serve the dashboard from a thread of this process (shares the GIL with the clients)")
+    parser.add_argument('--port', type=int, default=8060)
+    parser.add_argument('--seed', type=int, default=17)
+    parser.add_argument('--json', help="also write the per-callback results to this file")
+    args = parser.parse_args()
+
+    server = process = None
+    base_url = args.url
+    if base_url is None and args.in_process:
+        base_url, server = start_local_app(args.module, args.port)
+        print(f"🚀 Started {args.module} in-process at {base_url} (latencies include client contention)")
+    elif base_url is None:
+        base_url, process = start_app_process(args.module, args.port)
+        print(f"🚀 Started {args.module} in a separate process at {base_url}")
+
+    results = defaultdict(list)
+    lock = threading.Lock()
+    start = time.perf_counter()
+    deadline = start + args.duration
+    threads = [threading.Thread(target=run_session,
+                                args=(base_url, args.seed + i, deadline, args.think_time, args.timeout, results, lock))
+               for i in range(args.sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall_time = time.perf_counter() - start
+
+    rows = summarize(results, wall_time)
+    print_report(rows, wall_time, args.sessions)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'sessions': args.sessions, 'wall_time': wall_time, 'callbacks': rows}, f, indent=2)
+
+    if server is not None:
+        server.shutdown()
+    if process is not None:
+        process.terminate()
+        process.wait()
+
+
+if __name__ == '__main__':
+    main()
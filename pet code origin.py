@@ -1,8 +1,13 @@
+import os
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+from data_sources import open_source
 
-df = pd.read_csv("/Users/apple/Desktop/python bootcamp/210 data/pet_adoption_data.csv")
+# Any CSV / Parquet / SQLite URI; only the columns used below are read
+df = open_source(os.environ.get("PET_ADOPTION_SOURCE", "pet_adoption.csv")).read(
+    ["TimeInShelterDays", "AdoptionFee", "WeightKg", "AgeMonths", "PetType", "PreviousOwner",
+     "Vaccinated", "AdoptionLikelihood"])
 
 # TimeInShelterDays
 print("TimeInShelterDays mean:", df["TimeInShelterDays"].mean())
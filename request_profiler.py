@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+On-Demand Request Profiler
+Opt-in profiling of single Dash callback requests (admin only). Each profiled request writes
+a flame graph (folded stacks + SVG) from a stack sampler and a cProfile call tree,
+named by callback and filter state
+"""
+
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+from datetime import datetime
+from flask import g, request
+
+PROFILE_DIR = os.environ.get('DASHBOARD_PROFILE_DIR', 'profiles')
+ADMIN_TOKEN_ENV = 'DASHBOARD_ADMIN_TOKEN'
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval and folds identical stacks"""
+
+    def __init__(self, thread_id, interval=0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def folded(self):
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+# Minimal self-contained flame graph renderer for folded stacks
+def render_flame_svg(stacks, title, width=1200, row_height=16):
+    root = {'name': 'all', 'value': 0, 'children': {}}
+    for stack, count in stacks.items():
+        root['value'] += count
+        node = root
+        for name in stack.split(';'):
+            child = node['children'].setdefault(name, {'name': name, 'value': 0, 'children': {}})
+            child['value'] += count
+            node = child
+
+    rects = []
+
+    def layout(node, x, depth, scale):
+        w = node['value'] * scale
+        if w < 0.5:
+            return
+        rects.append((x, depth, w, node['name'], node['value']))
+        offset = x
+        for child in sorted(node['children'].values(), key=lambda c: c['name']):
+            layout(child, offset, depth + 1, scale)
+            offset += child['value'] * scale
+
+    total = max(root['value'], 1)
+    layout(root, 0, 0, width / total)
+    max_depth = max((r[1] for r in rects), default=0)
+    height = (max_depth + 2) * row_height + 30
+
+    out = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" font-family="monospace" font-size="11">',
+           f'<text x="5" y="18" font-size="14">{_escape(title)} ({total} samples)</text>']
+    for x, depth, w, name, value in rects:
+        y = height - (depth + 1) * row_height
+        hue = 20 + (zlib.crc32(name.encode('utf-8')) % 40)
+        label = name if w > 7 * len(name) else name[:max(int(w / 7) - 2, 0)] + ('..' if w > 21 else '')
+        out.append(f'<g><title>{_escape(name)} ({value} samples, {100 * value / total:.1f}%)</title>'
+                   f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row_height - 1}" fill="hsl({hue},90%,60%)"/>'
+                   f'<text x="{x + 3:.1f}" y="{y + row_height - 4}">{_escape(label)}</text></g>')
+    out.append('</svg>')
+    return '\n'.join(out)
+
+
+def _escape(text):
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+# File stem from the callback name and the filter values sent with the request
+def profile_name(callback_name, payload):
+    parts = [callback_name]
+    for item in payload.get('inputs', []):
+        if isinstance(item, dict) and 'id' in item:
+            value = item.get('value')
+            value = '-'.join(str(v) for v in value) if isinstance(value, list) else str(value)
+            parts.append(f"{item['id']}={value}")
+    stem = re.sub(r'[^A-Za-z0-9=._-]+', '_', '__'.join(parts))[:180]
+    return f"{stem}__{datetime.now().strftime('%Y%m%dT%H%M%S%f')}"
+
+
+def _is_admin():
+    expected = os.environ.get(ADMIN_TOKEN_ENV)
+    supplied = request.headers.get('X-Admin-Token', '')
+    return bool(expected) and hmac.compare_digest(expected, supplied)
+
+
+def _wants_profile():
+    return request.headers.get('X-Profile') == '1' or request.args.get('profile') == '1'
+
+
+# Profile Dash callback requests that carry X-Profile: 1 (or ?profile=1) and a valid X-Admin-Token
+def register_profiling(app, output_dir=PROFILE_DIR):
+    server = app.server
+
+    @server.before_request
+    def start_profiling():
+        if not request.path.endswith('/_dash-update-component') or not _wants_profile() or not _is_admin():
+            return
+        sampler = StackSampler(threading.get_ident())
+        profiler = cProfile.Profile()
+        g.request_profile = (sampler, profiler, time.perf_counter())
+        sampler.start()
+        profiler.enable()
+
+    @server.teardown_request
+    def stop_profiling(error=None):
+        active = g.pop('request_profile', None)
+        if active is None:
+            return
+        sampler, profiler, start = active
+        profiler.disable()
+        sampler.stop()
+        elapsed = time.perf_counter() - start
+
+        payload = request.get_json(silent=True) or {}
+        output = payload.get('output', 'unknown')
+        spec = app.callback_map.get(output, {})
+        callback_name = getattr(spec.get('callback'), '__name__', output)
+        stem = os.path.join(output_dir, profile_name(callback_name, payload))
+        os.makedirs(output_dir, exist_ok=True)
+
+        with open(stem + '.folded', 'w') as f:
+            f.write(sampler.folded())
+        with open(stem + '.svg', 'w') as f:
+            f.write(render_flame_svg(sampler.stacks, f"{callback_name} {elapsed * 1000:.0f} ms"))
+        profiler.dump_stats(stem + '.prof')
+        text = io.StringIO()
+        stats = pstats.Stats(profiler, stream=text).sort_stats('cumulative')
+        stats.print_stats(60)
+        stats.print_callees(30)
+        with open(stem + '.calltree.txt', 'w') as f:
+            f.write(text.getvalue())
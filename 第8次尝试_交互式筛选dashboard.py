@@ -4,27 +4,248 @@ Interactive Pet Adoption Analysis Dashboard - Business Edition
 High-end business dashboard with interactive filtering and relationship analysis
 """
 
+import json
+import os
 import dash
-from dash import dcc, html, Input, Output, callback
+from dash import dcc, html, dash_table, Input, Output, callback, ctx, no_update
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 import warnings
+from functools import lru_cache
+from adoption_store import PetAdoptionStore, filter_cells, COLUMNS, CATEGORICAL_COLUMNS, CUBE_DIMENSIONS
+from adoption_stats import (rate_table, kaplan_meier, survival_at, correlation_from_cells, rebin_histogram, box_summary,
+                           density_grid, stratified_decimation, feature_importance, pivot_from_cells)
+from adoption_model import AdoptionModel
+from data_sources import open_source
+from adoption_sampling import StratifiedSampler
+from adoption_table import SortedTable, parse_filter_query, filter_mask, TABLE_PAGE_SIZES
+from ingestion_api import register_ingestion_routes
+from live_updates import DeltaBroadcaster, register_live_updates
+from dashboard_metrics import register_metrics_endpoint, timed_callback, timed_chart, timed_stage
+from request_profiler import register_profiling
 warnings.filterwarnings('ignore')
 
-# Load data
-df = pd.read_csv("pet_adoption.csv")
+# Load data into the incremental store (new records arrive through /api/ingest);
+# PET_ADOPTION_SOURCE takes a CSV / Parquet / SQLite URI (PET_ADOPTION_CSV is still honoured).
+# The source is read once, unfiltered and with every column: the cube and column store answer every
+# filter state from memory and include ingested records, which a predicate read of the source would miss
+DATA_SOURCE = os.environ.get('PET_ADOPTION_SOURCE', os.environ.get('PET_ADOPTION_CSV', "pet_adoption.csv"))
+store = PetAdoptionStore.from_source(open_source(DATA_SOURCE))
+
+# Adoption likelihood model, refined with every ingested batch
+model = AdoptionModel.from_frame(store.to_frame())
+
+AGE_GROUP_BINS = [0, 1, 3, 7, 15, 100]
+AGE_GROUP_LABELS = ['Young (0-1y)', 'Youth (1-3y)', 'Adult (3-7y)', 'Middle (7-15y)', 'Senior (15+y)']
 
 # Data preprocessing
-df['AgeYears'] = df['AgeMonths'] / 12
-df['AgeGroup'] = pd.cut(df['AgeYears'], bins=[0, 1, 3, 7, 15, 100], 
-                        labels=['Young (0-1y)', 'Youth (1-3y)', 'Adult (3-7y)', 'Middle (7-15y)', 'Senior (15+y)'])
+def preprocess(data):
+    data = data.copy()
+    data['AgeYears'] = data['AgeMonths'] / 12
+    data['AgeGroup'] = pd.cut(data['AgeYears'], bins=AGE_GROUP_BINS, labels=AGE_GROUP_LABELS)
+    data['PredictedLikelihood'] = model.predict_proba(data)
+    return data
+
+# Preprocessed frame, rebuilt only when the store or the model changes
+_data_cache = {'version': None, 'data': None}
+
+def current_data():
+    return current_snapshot()[0]
+
+# Preprocessed frame together with the store version it was built from
+def current_snapshot():
+    with store.lock:
+        version = (store.version, model.seen)
+        if _data_cache['version'] != version:
+            _data_cache['data'] = preprocess(store.to_frame())
+            _data_cache['version'] = version
+        return _data_cache['data'], version[0]
+
+df = current_data()
+
+# Per-group adoption rates with Jeffreys intervals, cached per filter state and store version
+@lru_cache(maxsize=256)
+def _cached_rate_table(dimension, pet_type, age_range, vaccine_status, health_condition, version):
+    cells = filter_cells(store.cube_frame(), pet_type, age_range, vaccine_status, health_condition)
+    return rate_table(cells, dimension)
+
+def filtered_rate_table(dimension, pet_type, age_range, vaccine_status, health_condition):
+    age_range = tuple(age_range) if age_range else None
+    return _cached_rate_table(dimension, pet_type, age_range, vaccine_status, health_condition, store.version)
+
+# Histogram of a numeric column merged from per-cell fine bins, cached per filter state and store version
+@lru_cache(maxsize=256)
+def _cached_histogram(column, n_bins, pet_type, age_range, vaccine_status, health_condition, version):
+    cells = filter_cells(store.cube_frame(), pet_type, age_range, vaccine_status, health_condition)
+    return rebin_histogram(store.histogram(column, cells['Cell']), n_bins)
+
+def filtered_histogram(column, pet_type, age_range, vaccine_status, health_condition, n_bins=30):
+    age_range = tuple(age_range) if age_range else None
+    return _cached_histogram(column, n_bins, pet_type, age_range, vaccine_status, health_condition, store.version)
+
+# Box plot statistics per group from merged per-cell histograms, cached like the histograms
+@lru_cache(maxsize=256)
+def _cached_box_summaries(column, group_by, pet_type, age_range, vaccine_status, health_condition, version):
+    cells = filter_cells(store.cube_frame(), pet_type, age_range, vaccine_status, health_condition)
+    summaries = {}
+    for group, group_cells in cells.groupby(group_by):
+        summary = box_summary(store.histogram(column, group_cells['Cell']))
+        if summary is not None:
+            summaries[group] = summary
+    return summaries
+
+def filtered_box_summaries(column, group_by, pet_type, age_range, vaccine_status, health_condition):
+    age_range = tuple(age_range) if age_range else None
+    return _cached_box_summaries(column, group_by, pet_type, age_range, vaccine_status, health_condition, store.version)
+
+# 2D density grid over all filtered points on a fixed full-data range, cached per filter state
+@lru_cache(maxsize=128)
+def _cached_density_grid(x_col, y_col, pet_type, age_range, vaccine_status, health_condition, version):
+    data = current_data()
+    filtered_df = apply_filters(data, pet_type, list(age_range) if age_range else None, vaccine_status, health_condition)
+    x_range = (float(data[x_col].min()), float(data[x_col].max()))
+    y_range = (float(data[y_col].min()), float(data[y_col].max()))
+    return density_grid(filtered_df[x_col], filtered_df[y_col], filtered_df['AdoptionLikelihood'], x_range, y_range)
+
+def filtered_density_grid(x_col, y_col, pet_type, age_range, vaccine_status, health_condition):
+    age_range = tuple(age_range) if age_range else None
+    return _cached_density_grid(x_col, y_col, pet_type, age_range, vaccine_status, health_condition, store.version)
+
+# Point mode for the scatter views: WebGL traces above the threshold, never more than the budget
+SCATTER_POINT_BUDGET = 4000
+WEBGL_THRESHOLD = 1000
+
+# Decimated points inside the visible range, cached per view, filter state and store version
+@lru_cache(maxsize=256)
+def _cached_scatter_points(x_col, y_col, x_view, y_view, pet_type, age_range, vaccine_status, health_condition, version):
+    data = current_data()
+    filtered_df = apply_filters(data, pet_type, list(age_range) if age_range else None, vaccine_status, health_condition)
+    x_view = x_view or (float(data[x_col].min()), float(data[x_col].max()))
+    y_view = y_view or (float(data[y_col].min()), float(data[y_col].max()))
+    visible = filtered_df[filtered_df[x_col].between(*x_view) & filtered_df[y_col].between(*y_view)]
+    # Priority hashed from PetID so a pet shown zoomed out stays visible when zooming in
+    priority = (visible['PetID'].to_numpy(dtype='int64') * 2654435761) % 2**32
+    keep = stratified_decimation(visible[x_col], visible[y_col], SCATTER_POINT_BUDGET, x_view, y_view, priority)
+    return visible.iloc[keep][['PetID', 'PetType', x_col, y_col, 'AdoptionLikelihood']], len(visible)
+
+def filtered_scatter_points(x_col, y_col, x_view, y_view, pet_type, age_range, vaccine_status, health_condition):
+    age_range = tuple(age_range) if age_range else None
+    return _cached_scatter_points(x_col, y_col, x_view, y_view, pet_type, age_range, vaccine_status, health_condition,
+                                  store.version)
+
+# Visible axis ranges from a Graph's relayoutData, rounded so nearby zooms share a cache entry
+def view_ranges(relayout_data):
+    relayout_data = relayout_data or {}
+    ranges = []
+    for axis in ['xaxis', 'yaxis']:
+        bounds = [relayout_data.get(f'{axis}.range[0]'), relayout_data.get(f'{axis}.range[1]')]
+        if None in bounds and f'{axis}.range' in relayout_data:
+            bounds = relayout_data[f'{axis}.range']
+        ranges.append(tuple(sorted(round(float(b), 2) for b in bounds)) if None not in bounds else None)
+    return ranges
+
+# Stratified sample order, built once per dataset version
+@lru_cache(maxsize=2)
+def _cached_sampler(version):
+    return StratifiedSampler(current_data())
+
+# Seeded stratified subsample of the filtered pets, identical on every render of the same state
+@lru_cache(maxsize=256)
+def _cached_sample(n, pet_type, age_range, vaccine_status, health_condition, version):
+    data = current_data()
+    filtered_df = apply_filters(data, pet_type, list(age_range) if age_range else None, vaccine_status, health_condition)
+    mask = np.zeros(len(data), dtype=bool)
+    mask[data.index.get_indexer(filtered_df.index)] = True
+    return data.iloc[_cached_sampler(version).sample(mask, n)]
+
+def filtered_sample(n, pet_type, age_range, vaccine_status, health_condition):
+    age_range = tuple(age_range) if age_range else None
+    return _cached_sample(n, pet_type, age_range, vaccine_status, health_condition, store.version)
+
+# Attributes ranked by association with adoption, computed from the filtered cube cells
+INSIGHT_TOP_K = 3
+
+@lru_cache(maxsize=256)
+def _cached_feature_importance(pet_type, age_range, vaccine_status, health_condition, version):
+    cells = filter_cells(store.cube_frame(), pet_type, age_range, vaccine_status, health_condition)
+    return feature_importance(cells, CUBE_DIMENSIONS, AGE_GROUP_BINS, AGE_GROUP_LABELS)
+
+def filtered_feature_importance(pet_type, age_range, vaccine_status, health_condition):
+    age_range = tuple(age_range) if age_range else None
+    return _cached_feature_importance(pet_type, age_range, vaccine_status, health_condition, store.version)
+
+# Rows x columns pivot of a measure from the filtered cube cells, cached per selection and filter state
+@lru_cache(maxsize=256)
+def _cached_pivot(rows, columns, measure, pet_type, age_range, vaccine_status, health_condition, version):
+    cells = filter_cells(store.cube_frame(), pet_type, age_range, vaccine_status, health_condition)
+    return pivot_from_cells(cells, rows, columns, measure, AGE_GROUP_BINS, AGE_GROUP_LABELS)
+
+def filtered_pivot(rows, columns, measure, pet_type, age_range, vaccine_status, health_condition):
+    age_range = tuple(age_range) if age_range else None
+    return _cached_pivot(rows, columns, measure, pet_type, age_range, vaccine_status, health_condition, store.version)
+
+# Kaplan-Meier curves, cached per grouping, filter state and store version
+@lru_cache(maxsize=128)
+def _cached_survival_curves(group_by, pet_type, age_range, vaccine_status, health_condition, version):
+    filtered_df = apply_filters(current_data(), pet_type, list(age_range) if age_range else None,
+                                vaccine_status, health_condition)
+    return kaplan_meier(filtered_df, group_by)
+
+def filtered_survival_curves(group_by, pet_type, age_range, vaccine_status, health_condition):
+    age_range = tuple(age_range) if age_range else None
+    return _cached_survival_curves(group_by, pet_type, age_range, vaccine_status, health_condition, store.version)
+
+# Days at which the survival table reports the share still waiting, ending with the longest stay in the data
+SURVIVAL_MILESTONE_DAYS = [30, 60]
+
+def survival_milestone_days():
+    longest = int(current_data()['TimeInShelterDays'].max())
+    return [day for day in SURVIVAL_MILESTONE_DAYS if day < longest] + [longest]
+
+# Sort permutations of every table column, built once per dataset version
+@lru_cache(maxsize=2)
+def _cached_sorted_table(version):
+    return SortedTable(current_data(), COLUMNS)
+
+# Row positions of one sorted, filtered table view; every page of it is then a slice
+@lru_cache(maxsize=32)
+def _cached_table_view(sort_by, descending, filter_query, pet_type, age_range, vaccine_status, health_condition, version):
+    data = current_data()
+    table = _cached_sorted_table(version)
+    filtered_df = apply_filters(data, pet_type, list(age_range) if age_range else None, vaccine_status, health_condition)
+    mask = np.zeros(len(data), dtype=bool)
+    mask[data.index.get_indexer(filtered_df.index)] = True
+    mask &= filter_mask(table.frame, parse_filter_query(filter_query, COLUMNS))
+    return table, table.view(mask, sort_by, descending)
+
+def filtered_table_view(sort_by, descending, filter_query, pet_type, age_range, vaccine_status, health_condition):
+    age_range = tuple(age_range) if age_range else None
+    return _cached_table_view(sort_by, descending, filter_query or '', pet_type, age_range, vaccine_status,
+                              health_condition, store.version)
 
 # Create Dash app
-app = dash.Dash(__name__)
+app = dash.Dash(__name__, suppress_callback_exceptions=True)
+
+# Ingested records train the model and are pushed to open dashboards as cube deltas over /api/stream
+broadcaster = DeltaBroadcaster()
+publish_deltas = register_live_updates(app.server, broadcaster)
+
+def on_ingest(result):
+    model.partial_fit(pd.DataFrame(result['records']))
+    publish_deltas(result)
+
+register_ingestion_routes(app.server, store, on_ingest=on_ingest)
+
+# Prometheus metrics for callbacks, chart builders and payload sizes on /metrics
+register_metrics_endpoint(app)
+
+# Admin-only profiling of single requests (X-Profile: 1 + X-Admin-Token) into ./profiles
+register_profiling(app)
 
 # Function to apply filters
+@timed_stage
 def apply_filters(data, pet_type, age_range, vaccine_status, health_condition):
     filtered_data = data.copy()
     
@@ -194,12 +415,18 @@ app.layout = html.Div([
             dcc.Tab(label='🏆 Adoption Rates', value='adoption-rates', style={'fontWeight': '500'}),
             dcc.Tab(label='📈 Trends', value='trends', style={'fontWeight': '500'}),
             dcc.Tab(label='🔍 Deep Analysis', value='deep-analysis', style={'fontWeight': '500'}),
+            dcc.Tab(label='⏳ Length of Stay', value='length-of-stay', style={'fontWeight': '500'}),
+            dcc.Tab(label='🧮 Pivot', value='pivot', style={'fontWeight': '500'}),
+            dcc.Tab(label='📋 Data', value='data-table', style={'fontWeight': '500'}),
             dcc.Tab(label='💡 Insights', value='insights', style={'fontWeight': '500'})
         ], id='tabs', style={'fontWeight': '500'})
     ], style={'background': 'white', 'padding': '0 30px', 'borderBottom': '1px solid #e1e8ed'}),
     
     # Tab content
-    html.Div(id='tab-content', style={'padding': '30px', 'background': 'white'})
+    html.Div(id='tab-content', style={'padding': '30px', 'background': 'white'}),
+    
+    # Bumped by assets/live_updates.js to re-render the tab after the live stream missed deltas
+    dcc.Store(id='live-refresh')
 ], style={
     'background': 'linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%)',
     'minHeight': '100vh',
@@ -212,8 +439,10 @@ app.layout = html.Div([
            Input('pet-type-filter', 'value'),
            Input('age-filter', 'value'),
            Input('vaccine-filter', 'value'),
-           Input('health-filter', 'value')])
-def render_tab_content(selected_tab, pet_type, age_range, vaccine_status, health_condition):
+           Input('health-filter', 'value'),
+           Input('live-refresh', 'data')])
+@timed_callback
+def render_tab_content(selected_tab, pet_type, age_range, vaccine_status, health_condition, refresh=None):
     if selected_tab == 'overview':
         return render_overview_tab(pet_type, age_range, vaccine_status, health_condition)
     elif selected_tab == 'adoption-rates':
@@ -222,20 +451,30 @@ def render_tab_content(selected_tab, pet_type, age_range, vaccine_status, health
         return render_trends_tab(pet_type, age_range, vaccine_status, health_condition)
     elif selected_tab == 'deep-analysis':
         return render_deep_analysis_tab(pet_type, age_range, vaccine_status, health_condition)
+    elif selected_tab == 'length-of-stay':
+        return render_length_of_stay_tab()
+    elif selected_tab == 'pivot':
+        return render_pivot_tab()
+    elif selected_tab == 'data-table':
+        return render_data_table_tab()
     elif selected_tab == 'insights':
         return render_insights_tab(pet_type, age_range, vaccine_status, health_condition)
 
 # Overview tab - with filter functionality
 def render_overview_tab(pet_type, age_range, vaccine_status, health_condition):
     # Apply filters to data
-    filtered_df = apply_filters(df, pet_type, age_range, vaccine_status, health_condition)
+    data, version = current_snapshot()
+    filtered_df = apply_filters(data, pet_type, age_range, vaccine_status, health_condition)
     
     return html.Div([
+        # Filter, base totals and their store version read by assets/live_updates.js to apply pushed deltas
+        live_filter_state(filtered_df, version, pet_type, age_range, vaccine_status, health_condition),
+        
         # Key metrics cards - now showing filtered data
         html.Div([
             html.Div([
                 html.Div("🐾", style={'fontSize': '2rem', 'marginBottom': '15px'}),
-                html.Div(f"{len(filtered_df):,}", style={'fontSize': '2.2rem', 'fontWeight': '600', 'margin': '10px 0'}),
+                html.Div(f"{len(filtered_df):,}", id='kpi-total-pets', style={'fontSize': '2.2rem', 'fontWeight': '600', 'margin': '10px 0'}),
                 html.Div("Total Pets", style={'fontSize': '0.85rem', 'opacity': '0.8', 'textTransform': 'uppercase', 'letterSpacing': '0.5px'})
             ], style={
                 'background': 'linear-gradient(135deg, #667eea 0%, #764ba2 100%)',
@@ -248,7 +487,7 @@ def render_overview_tab(pet_type, age_range, vaccine_status, health_condition):
             
             html.Div([
                 html.Div("❤️", style={'fontSize': '2rem', 'marginBottom': '15px'}),
-                html.Div(f"{filtered_df['AdoptionLikelihood'].mean()*100:.1f}%", style={'fontSize': '2.2rem', 'fontWeight': '600', 'margin': '10px 0'}),
+                html.Div(f"{filtered_df['AdoptionLikelihood'].mean()*100:.1f}%", id='kpi-adoption-rate', style={'fontSize': '2.2rem', 'fontWeight': '600', 'margin': '10px 0'}),
                 html.Div("Adoption Rate", style={'fontSize': '0.85rem', 'opacity': '0.8', 'textTransform': 'uppercase', 'letterSpacing': '0.5px'})
             ], style={
                 'background': 'linear-gradient(135deg, #667eea 0%, #764ba2 100%)',
@@ -261,7 +500,7 @@ def render_overview_tab(pet_type, age_range, vaccine_status, health_condition):
             
             html.Div([
                 html.Div("💉", style={'fontSize': '2rem', 'marginBottom': '15px'}),
-                html.Div(f"{filtered_df['Vaccinated'].mean()*100:.1f}%", style={'fontSize': '2.2rem', 'fontWeight': '600', 'margin': '10px 0'}),
+                html.Div(f"{filtered_df['Vaccinated'].mean()*100:.1f}%", id='kpi-vaccination-rate', style={'fontSize': '2.2rem', 'fontWeight': '600', 'margin': '10px 0'}),
                 html.Div("Vaccination Rate", style={'fontSize': '0.85rem', 'opacity': '0.8', 'textTransform': 'uppercase', 'letterSpacing': '0.5px'})
             ], style={
                 'background': 'linear-gradient(135deg, #667eea 0%, #764ba2 100%)',
@@ -274,7 +513,7 @@ def render_overview_tab(pet_type, age_range, vaccine_status, health_condition):
             
             html.Div([
                 html.Div("💰", style={'fontSize': '2rem', 'marginBottom': '15px'}),
-                html.Div(f"${filtered_df['AdoptionFee'].mean():.0f}", style={'fontSize': '2.2rem', 'fontWeight': '600', 'margin': '10px 0'}),
+                html.Div(f"${filtered_df['AdoptionFee'].mean():.0f}", id='kpi-avg-fee', style={'fontSize': '2.2rem', 'fontWeight': '600', 'margin': '10px 0'}),
                 html.Div("Avg. Adoption Fee", style={'fontSize': '0.85rem', 'opacity': '0.8', 'textTransform': 'uppercase', 'letterSpacing': '0.5px'})
             ], style={
                 'background': 'linear-gradient(135deg, #667eea 0%, #764ba2 100%)',
@@ -403,7 +642,7 @@ def render_overview_tab(pet_type, age_range, vaccine_status, health_condition):
 
 # Other tab functions (simplified)
 def render_adoption_rates_tab(pet_type, age_range, vaccine_status, health_condition):
-    filtered_df = apply_filters(df, pet_type, age_range, vaccine_status, health_condition)
+    filters = (pet_type, age_range, vaccine_status, health_condition)
     return html.Div([
         html.Div([
             html.Div([
@@ -412,7 +651,7 @@ def render_adoption_rates_tab(pet_type, age_range, vaccine_status, health_condit
             ], style={'fontSize': '1rem', 'fontWeight': '600', 'color': '#2c3e50', 'marginBottom': '15px'}),
             dcc.Graph(
                 id='pet-type-adoption-rates',
-                figure=create_pet_type_adoption_rates(filtered_df),
+                figure=create_pet_type_adoption_rates(filtered_rate_table('PetType', *filters)),
                 style={'height': '350px'},
                 config={'displayModeBar': False, 'staticPlot': True}
             )
@@ -423,11 +662,67 @@ def render_adoption_rates_tab(pet_type, age_range, vaccine_status, health_condit
             'boxShadow': '0 1px 5px rgba(0,0,0,0.08)',
             'border': '1px solid #e1e8ed',
             'gridColumn': '1 / -1'
+        }),
+        
+        # Color and breed rates side by side - error bars show 95% Jeffreys intervals
+        html.Div([
+            html.Div([
+                html.Div([
+                    html.Span("🎨", style={'fontSize': '1.2rem', 'marginRight': '8px', 'color': '#1e3c72'}),
+                    "Adoption Rate by Pet Color"
+                ], style={'fontSize': '1rem', 'fontWeight': '600', 'color': '#2c3e50', 'marginBottom': '15px'}),
+                dcc.Graph(
+                    id='color-adoption-rates',
+                    figure=create_color_adoption_rates(filtered_rate_table('Color', *filters)),
+                    style={'height': '350px'},
+                    config={'displayModeBar': False, 'staticPlot': True}
+                )
+            ], style={
+                'background': 'white',
+                'borderRadius': '8px',
+                'padding': '20px',
+                'boxShadow': '0 1px 5px rgba(0,0,0,0.08)',
+                'border': '1px solid #e1e8ed'
+            }),
+            
+            html.Div([
+                html.Div([
+                    html.Span("🐕", style={'fontSize': '1.2rem', 'marginRight': '8px', 'color': '#1e3c72'}),
+                    "Adoption Rate by Breed"
+                ], style={'fontSize': '1rem', 'fontWeight': '600', 'color': '#2c3e50', 'marginBottom': '15px'}),
+                dcc.Graph(
+                    id='breed-adoption-rates',
+                    figure=create_breed_adoption_rates(filtered_rate_table('Breed', *filters)),
+                    style={'height': '350px'},
+                    config={'displayModeBar': False, 'staticPlot': True}
+                )
+            ], style={
+                'background': 'white',
+                'borderRadius': '8px',
+                'padding': '20px',
+                'boxShadow': '0 1px 5px rgba(0,0,0,0.08)',
+                'border': '1px solid #e1e8ed'
+            })
+        ], style={
+            'display': 'grid',
+            'gridTemplateColumns': '1fr 1fr',
+            'gap': '20px',
+            'marginTop': '20px'
         })
     ])
 
 def render_trends_tab(pet_type, age_range, vaccine_status, health_condition):
-    filtered_df = apply_filters(df, pet_type, age_range, vaccine_status, health_condition)
+    filtered_df = apply_filters(current_data(), pet_type, age_range, vaccine_status, health_condition)
+    filters = (pet_type, age_range, vaccine_status, health_condition)
+    
+    # Distribution charts are built from merged per-cell histograms (payload is O(bins))
+    distributions = [
+        ("🎂", "Age Distribution", 'age-distribution', create_age_distribution(filtered_histogram('AgeMonths', *filters))),
+        ("⚖️", "Weight Distribution", 'weight-distribution', create_weight_distribution(filtered_histogram('WeightKg', *filters))),
+        ("💰", "Adoption Fee Distribution", 'adoption-fee-analysis', create_adoption_fee_analysis(filtered_histogram('AdoptionFee', *filters))),
+        ("🏠", "Time in Shelter Distribution", 'shelter-days-distribution', create_shelter_days_distribution(filtered_histogram('TimeInShelterDays', *filters)))
+    ]
+    
     return html.Div([
         html.Div([
             html.Div([
@@ -447,11 +742,39 @@ def render_trends_tab(pet_type, age_range, vaccine_status, health_condition):
             'boxShadow': '0 1px 5px rgba(0,0,0,0.08)',
             'border': '1px solid #e1e8ed',
             'gridColumn': '1 / -1'
+        }),
+        
+        html.Div([
+            html.Div([
+                html.Div([
+                    html.Span(icon, style={'fontSize': '1.2rem', 'marginRight': '8px', 'color': '#1e3c72'}),
+                    title
+                ], style={'fontSize': '1rem', 'fontWeight': '600', 'color': '#2c3e50', 'marginBottom': '15px'}),
+                dcc.Graph(
+                    id=graph_id,
+                    figure=figure,
+                    style={'height': '300px'},
+                    config={'displayModeBar': False, 'staticPlot': True}
+                )
+            ], style={
+                'background': 'white',
+                'borderRadius': '8px',
+                'padding': '20px',
+                'boxShadow': '0 1px 5px rgba(0,0,0,0.08)',
+                'border': '1px solid #e1e8ed'
+            })
+            for icon, title, graph_id, figure in distributions
+        ], style={
+            'display': 'grid',
+            'gridTemplateColumns': 'repeat(auto-fit, minmax(350px, 1fr))',
+            'gap': '20px',
+            'marginTop': '20px'
         })
     ])
 
 def render_deep_analysis_tab(pet_type, age_range, vaccine_status, health_condition):
-    filtered_df = apply_filters(df, pet_type, age_range, vaccine_status, health_condition)
+    filtered_df = apply_filters(current_data(), pet_type, age_range, vaccine_status, health_condition)
+    cells = filter_cells(store.cube_frame(), pet_type, age_range, vaccine_status, health_condition)
     return html.Div([
         html.Div([
             html.Div([
@@ -471,11 +794,446 @@ def render_deep_analysis_tab(pet_type, age_range, vaccine_status, health_conditi
             'boxShadow': '0 1px 5px rgba(0,0,0,0.08)',
             'border': '1px solid #e1e8ed',
             'gridColumn': '1 / -1'
+        }),
+        
+        # Box plots built server-side from merged histograms (fixed payload per group)
+        html.Div([
+            html.Div([
+                html.Div([
+                    html.Span(icon, style={'fontSize': '1.2rem', 'marginRight': '8px', 'color': '#1e3c72'}),
+                    title
+                ], style={'fontSize': '1rem', 'fontWeight': '600', 'color': '#2c3e50', 'marginBottom': '15px'}),
+                dcc.Graph(
+                    id=graph_id,
+                    figure=builder(filtered_box_summaries(column, 'PetType', pet_type, age_range, vaccine_status, health_condition)),
+                    style={'height': '350px'},
+                    config={'displayModeBar': False, 'staticPlot': True}
+                )
+            ], style={
+                'background': 'white',
+                'borderRadius': '8px',
+                'padding': '20px',
+                'boxShadow': '0 1px 5px rgba(0,0,0,0.08)',
+                'border': '1px solid #e1e8ed'
+            })
+            for icon, title, graph_id, column, builder in [
+                ("🏠", "Time in Shelter by Pet Type", 'shelter-time-analysis', 'TimeInShelterDays', create_shelter_time_analysis),
+                ("💰", "Adoption Fee by Pet Type", 'fee-box-plot', 'AdoptionFee', create_fee_box_plot),
+                ("🎂", "Age by Pet Type", 'age-box-plot', 'AgeMonths', create_age_box_plot)
+            ]
+        ], style={
+            'display': 'grid',
+            'gridTemplateColumns': 'repeat(auto-fit, minmax(350px, 1fr))',
+            'gap': '20px',
+            'marginTop': '20px'
+        }),
+        
+        # Density views aggregate every point server-side; point mode shows decimated WebGL markers
+        html.Div([
+            html.Label("SCATTER VIEW", style={
+                'fontWeight': '700',
+                'color': '#1e3c72',
+                'fontSize': '0.9rem',
+                'textTransform': 'uppercase',
+                'letterSpacing': '1px',
+                'marginRight': '20px'
+            }),
+            dcc.RadioItems(
+                id='scatter-mode',
+                options=[
+                    {'label': 'Density', 'value': 'density'},
+                    {'label': f'Points (up to {SCATTER_POINT_BUDGET:,}, zoom for detail)', 'value': 'points'}
+                ],
+                value='density',
+                inline=True,
+                inputStyle={'marginRight': '6px', 'marginLeft': '14px'}
+            )
+        ], style={'display': 'flex', 'alignItems': 'center', 'marginTop': '20px'}),
+        html.Div([
+            html.Div([
+                html.Div([
+                    html.Span(icon, style={'fontSize': '1.2rem', 'marginRight': '8px', 'color': '#1e3c72'}),
+                    title
+                ], style={'fontSize': '1rem', 'fontWeight': '600', 'color': '#2c3e50', 'marginBottom': '15px'}),
+                dcc.Graph(
+                    id=graph_id,
+                    style={'height': '400px'},
+                    config={'displayModeBar': False}
+                )
+            ], style={
+                'background': 'white',
+                'borderRadius': '8px',
+                'padding': '20px',
+                'boxShadow': '0 1px 5px rgba(0,0,0,0.08)',
+                'border': '1px solid #e1e8ed'
+            })
+            for icon, title, graph_id in [
+                ("⚖️", "Weight vs Adoption Fee (color = adoption)", 'weight-fee-scatter'),
+                ("🎂", "Age vs Weight (color = adoption)", 'weight-age-analysis')
+            ]
+        ], style={
+            'display': 'grid',
+            'gridTemplateColumns': 'repeat(auto-fit, minmax(450px, 1fr))',
+            'gap': '20px',
+            'marginTop': '20px'
+        }),
+        
+        # 3D view of a reproducible stratified sample (by pet type and adoption outcome)
+        html.Div([
+            html.Div([
+                html.Span("🧊", style={'fontSize': '1.2rem', 'marginRight': '8px', 'color': '#1e3c72'}),
+                "Age, Weight & Fee (stratified sample of 300)"
+            ], style={'fontSize': '1rem', 'fontWeight': '600', 'color': '#2c3e50', 'marginBottom': '15px'}),
+            dcc.Graph(
+                id='age-weight-fee-3d',
+                figure=create_age_weight_fee_3d(filtered_sample(300, pet_type, age_range, vaccine_status, health_condition)),
+                style={'height': '500px'},
+                config={'displayModeBar': False}
+            )
+        ], style={
+            'background': 'white',
+            'borderRadius': '8px',
+            'padding': '20px',
+            'boxShadow': '0 1px 5px rgba(0,0,0,0.08)',
+            'border': '1px solid #e1e8ed',
+            'gridColumn': '1 / -1',
+            'marginTop': '20px'
+        }),
+        
+        # Correlation matrix assembled from cube sufficient statistics
+        html.Div([
+            html.Div([
+                html.Span("🧮", style={'fontSize': '1.2rem', 'marginRight': '8px', 'color': '#1e3c72'}),
+                "Numeric Variable Correlations"
+            ], style={'fontSize': '1rem', 'fontWeight': '600', 'color': '#2c3e50', 'marginBottom': '15px'}),
+            dcc.Graph(
+                id='correlation-matrix',
+                figure=create_correlation_matrix(correlation_from_cells(cells)),
+                style={'height': '400px'},
+                config={'displayModeBar': False, 'staticPlot': True}
+            )
+        ], style={
+            'background': 'white',
+            'borderRadius': '8px',
+            'padding': '20px',
+            'boxShadow': '0 1px 5px rgba(0,0,0,0.08)',
+            'border': '1px solid #e1e8ed',
+            'gridColumn': '1 / -1',
+            'marginTop': '20px'
+        })
+    ])
+
+# Density image or decimated points for one scatter view; zooming in point mode refetches the visible range
+def scatter_view_figure(graph_id, x_col, y_col, mode, relayout_data, pet_type, age_range, vaccine_status, health_condition):
+    density_builder, points_builder = SCATTER_VIEWS[graph_id]
+    if mode == 'density':
+        if ctx.triggered_id == graph_id:
+            return no_update
+        return density_builder(filtered_density_grid(x_col, y_col, pet_type, age_range, vaccine_status, health_condition))
+    x_view, y_view = view_ranges(relayout_data) if ctx.triggered_id == graph_id else (None, None)
+    points, visible = filtered_scatter_points(x_col, y_col, x_view, y_view, pet_type, age_range, vaccine_status, health_condition)
+    return points_builder(points, visible, x_view, y_view)
+
+@callback(Output('weight-fee-scatter', 'figure'),
+          [Input('scatter-mode', 'value'),
+           Input('weight-fee-scatter', 'relayoutData'),
+           Input('pet-type-filter', 'value'),
+           Input('age-filter', 'value'),
+           Input('vaccine-filter', 'value'),
+           Input('health-filter', 'value')])
+@timed_callback
+def update_weight_fee_scatter(mode, relayout_data, pet_type, age_range, vaccine_status, health_condition):
+    return scatter_view_figure('weight-fee-scatter', 'WeightKg', 'AdoptionFee', mode, relayout_data,
+                               pet_type, age_range, vaccine_status, health_condition)
+
+@callback(Output('weight-age-analysis', 'figure'),
+          [Input('scatter-mode', 'value'),
+           Input('weight-age-analysis', 'relayoutData'),
+           Input('pet-type-filter', 'value'),
+           Input('age-filter', 'value'),
+           Input('vaccine-filter', 'value'),
+           Input('health-filter', 'value')])
+@timed_callback
+def update_weight_age_analysis(mode, relayout_data, pet_type, age_range, vaccine_status, health_condition):
+    return scatter_view_figure('weight-age-analysis', 'AgeMonths', 'WeightKg', mode, relayout_data,
+                               pet_type, age_range, vaccine_status, health_condition)
+
+# Length of stay tab - grouping selector, content filled by update_length_of_stay
+def render_length_of_stay_tab():
+    return html.Div([
+        html.Div([
+            html.Label("GROUP CURVES BY", style={
+                'fontWeight': '700',
+                'color': '#1e3c72',
+                'fontSize': '0.9rem',
+                'textTransform': 'uppercase',
+                'letterSpacing': '1px',
+                'marginRight': '20px'
+            }),
+            dcc.RadioItems(
+                id='survival-group-by',
+                options=[
+                    {'label': 'Pet Type', 'value': 'PetType'},
+                    {'label': 'Breed', 'value': 'Breed'},
+                    {'label': 'Size', 'value': 'Size'},
+                    {'label': 'Age Group', 'value': 'AgeGroup'},
+                    {'label': 'Vaccinated', 'value': 'Vaccinated'},
+                    {'label': 'Health', 'value': 'HealthCondition'},
+                    {'label': 'Previous Owner', 'value': 'PreviousOwner'}
+                ],
+                value='PetType',
+                inline=True,
+                inputStyle={'marginRight': '6px', 'marginLeft': '14px'}
+            )
+        ], style={'display': 'flex', 'alignItems': 'center', 'marginBottom': '20px'}),
+        html.Div(id='survival-content')
+    ])
+
+@callback(Output('survival-content', 'children'),
+          [Input('survival-group-by', 'value'),
+           Input('pet-type-filter', 'value'),
+           Input('age-filter', 'value'),
+           Input('vaccine-filter', 'value'),
+           Input('health-filter', 'value')])
+@timed_callback
+def update_length_of_stay(group_by, pet_type, age_range, vaccine_status, health_condition):
+    curves = filtered_survival_curves(group_by, pet_type, age_range, vaccine_status, health_condition)
+    days = survival_milestone_days()
+    milestones = survival_at(curves, days)
+    return html.Div([
+        html.Div([
+            html.Div([
+                html.Span("⏳", style={'fontSize': '1.2rem', 'marginRight': '8px', 'color': '#1e3c72'}),
+                "Share Still Waiting for Adoption (Kaplan-Meier)"
+            ], style={'fontSize': '1rem', 'fontWeight': '600', 'color': '#2c3e50', 'marginBottom': '15px'}),
+            dcc.Graph(
+                id='survival-curves',
+                figure=create_survival_curves(curves),
+                style={'height': '400px'},
+                config={'displayModeBar': False}
+            )
+        ], style={
+            'background': 'white',
+            'borderRadius': '8px',
+            'padding': '20px',
+            'boxShadow': '0 1px 5px rgba(0,0,0,0.08)',
+            'border': '1px solid #e1e8ed'
+        }),
+        html.Div([
+            html.Div(f"Still in shelter after {' / '.join(map(str, days))} days", style={'fontWeight': '600', 'color': '#2c3e50', 'marginBottom': '10px'}),
+            html.Table(
+                [html.Tr([html.Th("Group")] + [html.Th(col) for col in milestones.columns])] +
+                [html.Tr([html.Td(str(group))] + [html.Td(f"{value*100:.1f}%") for value in row])
+                 for group, row in milestones.iterrows()],
+                style={'width': '100%', 'textAlign': 'left'}
+            )
+        ], style={
+            'background': 'white',
+            'borderRadius': '8px',
+            'padding': '20px',
+            'boxShadow': '0 1px 5px rgba(0,0,0,0.08)',
+            'border': '1px solid #e1e8ed',
+            'marginTop': '20px'
+        })
+    ])
+
+# Pivot tab - dimension and measure selectors, content filled by update_pivot
+PIVOT_DIMENSIONS = [
+    {'label': 'Pet Type', 'value': 'PetType'},
+    {'label': 'Breed', 'value': 'Breed'},
+    {'label': 'Color', 'value': 'Color'},
+    {'label': 'Size', 'value': 'Size'},
+    {'label': 'Age Group', 'value': 'AgeGroup'},
+    {'label': 'Vaccinated', 'value': 'Vaccinated'},
+    {'label': 'Health', 'value': 'HealthCondition'},
+    {'label': 'Previous Owner', 'value': 'PreviousOwner'}
+]
+PIVOT_MEASURE_OPTIONS = [
+    {'label': 'Adoption Rate', 'value': 'AdoptionRate'},
+    {'label': 'Count', 'value': 'Count'},
+    {'label': 'Mean Adoption Fee', 'value': 'MeanFee'},
+    {'label': 'Mean Time in Shelter', 'value': 'MeanShelterDays'},
+    {'label': 'Mean Age (months)', 'value': 'MeanAgeMonths'},
+    {'label': 'Mean Weight (kg)', 'value': 'MeanWeightKg'}
+]
+PIVOT_FORMATS = {
+    'AdoptionRate': lambda v: f"{v*100:.1f}%",
+    'Count': lambda v: f"{v:,.0f}",
+    'MeanFee': lambda v: f"${v:.0f}",
+    'MeanShelterDays': lambda v: f"{v:.1f} d",
+    'MeanAgeMonths': lambda v: f"{v:.1f}",
+    'MeanWeightKg': lambda v: f"{v:.1f}"
+}
+
+def render_pivot_tab():
+    label_style = {
+        'fontWeight': '700',
+        'color': '#1e3c72',
+        'fontSize': '0.9rem',
+        'textTransform': 'uppercase',
+        'letterSpacing': '1px',
+        'marginBottom': '8px',
+        'display': 'block'
+    }
+    return html.Div([
+        html.Div([
+            html.Div([
+                html.Label("ROWS", style=label_style),
+                dcc.Dropdown(id='pivot-rows', options=PIVOT_DIMENSIONS, value='PetType', clearable=False)
+            ], style={'flex': '1', 'minWidth': '200px'}),
+            html.Div([
+                html.Label("COLUMNS", style=label_style),
+                dcc.Dropdown(id='pivot-columns', options=[{'label': 'None', 'value': 'None'}] + PIVOT_DIMENSIONS,
+                             value='Size', clearable=False)
+            ], style={'flex': '1', 'minWidth': '200px'}),
+            html.Div([
+                html.Label("MEASURE", style=label_style),
+                dcc.Dropdown(id='pivot-measure', options=PIVOT_MEASURE_OPTIONS, value='AdoptionRate', clearable=False)
+            ], style={'flex': '1', 'minWidth': '200px'})
+        ], style={'display': 'flex', 'gap': '20px', 'flexWrap': 'wrap', 'marginBottom': '20px'}),
+        html.Div(id='pivot-content')
+    ])
+
+@callback(Output('pivot-content', 'children'),
+          [Input('pivot-rows', 'value'),
+           Input('pivot-columns', 'value'),
+           Input('pivot-measure', 'value'),
+           Input('pet-type-filter', 'value'),
+           Input('age-filter', 'value'),
+           Input('vaccine-filter', 'value'),
+           Input('health-filter', 'value')])
+@timed_callback
+def update_pivot(rows, columns, measure, pet_type, age_range, vaccine_status, health_condition):
+    columns = None if columns == 'None' or columns == rows else columns
+    values, counts = filtered_pivot(rows, columns, measure, pet_type, age_range, vaccine_status, health_condition)
+    fmt = PIVOT_FORMATS[measure]
+    measure_label = next(option['label'] for option in PIVOT_MEASURE_OPTIONS if option['value'] == measure)
+    return html.Div([
+        html.Div([
+            html.Div([
+                html.Span("🧮", style={'fontSize': '1.2rem', 'marginRight': '8px', 'color': '#1e3c72'}),
+                f"{measure_label} by {rows}" + (f" and {columns}" if columns else "")
+            ], style={'fontSize': '1rem', 'fontWeight': '600', 'color': '#2c3e50', 'marginBottom': '15px'}),
+            dcc.Graph(
+                id='pivot-heatmap',
+                figure=create_pivot_heatmap(values, counts, rows, columns, fmt),
+                style={'height': '450px'},
+                config={'displayModeBar': False}
+            )
+        ], style={
+            'background': 'white',
+            'borderRadius': '8px',
+            'padding': '20px',
+            'boxShadow': '0 1px 5px rgba(0,0,0,0.08)',
+            'border': '1px solid #e1e8ed'
+        }),
+        html.Div([
+            html.Table(
+                [html.Tr([html.Th(rows)] + [html.Th(level_label(columns, col) if columns else measure_label)
+                                            for col in values.columns])] +
+                [html.Tr([html.Td(level_label(rows, index))] +
+                         [html.Td(fmt(value) if pd.notna(value) else "–") for value in row])
+                 for index, row in zip(values.index, values.to_numpy())],
+                style={'width': '100%', 'textAlign': 'left'}
+            )
+        ], style={
+            'background': 'white',
+            'borderRadius': '8px',
+            'padding': '20px',
+            'boxShadow': '0 1px 5px rgba(0,0,0,0.08)',
+            'border': '1px solid #e1e8ed',
+            'marginTop': '20px'
+        })
+    ])
+
+# Data tab - every pet, paged, sorted and filtered on the server by update_data_table
+TABLE_COLUMN_FORMATS = {
+    'WeightKg': dash_table.Format.Format(precision=2, scheme=dash_table.Format.Scheme.fixed)
+}
+
+def render_data_table_tab():
+    return html.Div([
+        html.Div([
+            html.Label("ROWS PER PAGE", style={
+                'fontWeight': '700',
+                'color': '#1e3c72',
+                'fontSize': '0.9rem',
+                'textTransform': 'uppercase',
+                'letterSpacing': '1px',
+                'marginRight': '20px'
+            }),
+            dcc.RadioItems(
+                id='data-table-page-size',
+                options=[{'label': str(size), 'value': size} for size in TABLE_PAGE_SIZES],
+                value=TABLE_PAGE_SIZES[0],
+                inline=True,
+                inputStyle={'marginRight': '6px', 'marginLeft': '14px'}
+            ),
+            html.Div(id='data-table-summary', style={'marginLeft': 'auto', 'color': '#7f8c8d', 'fontSize': '0.9rem'})
+        ], style={'display': 'flex', 'alignItems': 'center', 'marginBottom': '20px'}),
+        html.Div([
+            dash_table.DataTable(
+                id='data-table',
+                columns=[{'name': col, 'id': col, 'type': 'text' if col in CATEGORICAL_COLUMNS else 'numeric',
+                          **({'format': TABLE_COLUMN_FORMATS[col]} if col in TABLE_COLUMN_FORMATS else {})}
+                         for col in COLUMNS],
+                page_current=0,
+                page_size=TABLE_PAGE_SIZES[0],
+                page_action='custom',
+                sort_action='custom',
+                sort_mode='single',
+                filter_action='custom',
+                filter_query='',
+                # Only the visible rows of a large page are rendered in the browser
+                virtualization=True,
+                fixed_rows={'headers': True},
+                style_table={'height': '600px', 'overflowY': 'auto'},
+                style_header={'backgroundColor': '#1e3c72', 'color': 'white', 'fontWeight': '600'},
+                style_cell={'fontFamily': 'Inter, sans-serif', 'fontSize': '0.9rem', 'padding': '6px 10px',
+                            'minWidth': '90px'},
+                style_data_conditional=[{'if': {'row_index': 'odd'}, 'backgroundColor': '#f8f9fa'}]
+            )
+        ], style={
+            'background': 'white',
+            'borderRadius': '8px',
+            'padding': '20px',
+            'boxShadow': '0 1px 5px rgba(0,0,0,0.08)',
+            'border': '1px solid #e1e8ed'
         })
     ])
 
+@callback([Output('data-table', 'data'),
+           Output('data-table', 'page_count'),
+           Output('data-table', 'page_current'),
+           Output('data-table', 'page_size'),
+           Output('data-table-summary', 'children')],
+          [Input('data-table', 'page_current'),
+           Input('data-table-page-size', 'value'),
+           Input('data-table', 'sort_by'),
+           Input('data-table', 'filter_query'),
+           Input('pet-type-filter', 'value'),
+           Input('age-filter', 'value'),
+           Input('vaccine-filter', 'value'),
+           Input('health-filter', 'value')])
+@timed_callback
+def update_data_table(page_current, page_size, sort_by, filter_query, pet_type, age_range, vaccine_status, health_condition):
+    sort = sort_by[0] if sort_by else {}
+    table, positions = filtered_table_view(sort.get('column_id'), sort.get('direction') == 'desc', filter_query,
+                                           pet_type, age_range, vaccine_status, health_condition)
+    page_count = max(1, -(-len(positions) // page_size))
+    # A new view starts on its first page; paging within a view keeps the requested page
+    page_current = min(page_current or 0, page_count - 1) if 'data-table.page_current' in ctx.triggered_prop_ids else 0
+    summary = f"{len(positions):,} of {len(table):,} pets · page {page_current + 1:,} of {page_count:,}"
+    return table.page(positions, page_current, page_size), page_count, page_current, page_size, summary
+
 def render_insights_tab(pet_type, age_range, vaccine_status, health_condition):
-    filtered_df = apply_filters(df, pet_type, age_range, vaccine_status, health_condition)
+    ranking = filtered_feature_importance(pet_type, age_range, vaccine_status, health_condition)
+    card_style = {
+        'background': 'rgba(255, 255, 255, 0.15)',
+        'padding': '20px',
+        'borderRadius': '10px',
+        'backdropFilter': 'blur(10px)'
+    }
     return html.Div([
         html.Div([
             html.Div([
@@ -483,55 +1241,40 @@ def render_insights_tab(pet_type, age_range, vaccine_status, health_condition):
                 "Key Insights & Recommendations"
             ], style={'fontSize': '1.3rem', 'fontWeight': '600', 'marginBottom': '25px', 'textAlign': 'center'}),
             
+            # Top drivers of adoption for the current filter, ranked by mutual information
             html.Div([
                 html.Div([
-                    html.Div("🏥 Vaccination Impact", style={'fontWeight': '600', 'marginBottom': '12px', 'fontSize': '1.1rem'}),
-                    html.Div([
-                        "Vaccinated pets have ",
-                        html.Span(f"{filtered_df[filtered_df['Vaccinated']==1]['AdoptionLikelihood'].mean()*100:.1f}%", style={'fontWeight': 'bold', 'color': '#667eea'}),
-                        " higher adoption rate than non-vaccinated pets. Prioritize vaccination programs."
-                    ], style={'opacity': '0.9', 'lineHeight': '1.6'})
-                ], style={
-                    'background': 'rgba(255, 255, 255, 0.15)',
-                    'padding': '20px',
-                    'borderRadius': '10px',
-                    'backdropFilter': 'blur(10px)'
-                }),
-                
-                html.Div([
-                    html.Div("🐕 Pet Type Preference", style={'fontWeight': '600', 'marginBottom': '12px', 'fontSize': '1.1rem'}),
-                    html.Div([
-                        "Dogs show highest adoption rate at ",
-                        html.Span(f"{filtered_df[filtered_df['PetType']=='Dog']['AdoptionLikelihood'].mean()*100:.1f}%", style={'fontWeight': 'bold', 'color': '#667eea'}),
-                        ", while rabbits have lowest at ",
-                        html.Span(f"{filtered_df[filtered_df['PetType']=='Rabbit']['AdoptionLikelihood'].mean()*100:.1f}%", style={'fontWeight': 'bold', 'color': '#667eea'}),
-                        "."
-                    ], style={'opacity': '0.9', 'lineHeight': '1.6'})
-                ], style={
-                    'background': 'rgba(255, 255, 255, 0.15)',
-                    'padding': '20px',
-                    'borderRadius': '10px',
-                    'backdropFilter': 'blur(10px)'
-                }),
-                
-                html.Div([
-                    html.Div("📊 Age Factor", style={'fontWeight': '600', 'marginBottom': '12px', 'fontSize': '1.1rem'}),
+                    html.Div(f"{INSIGHT_ICONS.get(row.Attribute, '📊')} #{rank} Driver: {ATTRIBUTE_NAMES.get(row.Attribute, row.Attribute)}",
+                             style={'fontWeight': '600', 'marginBottom': '12px', 'fontSize': '1.1rem'}),
                     html.Div([
-                        "Young pets (under 1 year) have ",
-                        html.Span(f"{(filtered_df[filtered_df['AgeYears']<1]['AdoptionLikelihood'].mean() - filtered_df[filtered_df['AgeYears']>7]['AdoptionLikelihood'].mean())*100:.1f}%", style={'fontWeight': 'bold', 'color': '#667eea'}),
-                        " higher adoption rate than senior pets."
-                    ], style={'opacity': '0.9', 'lineHeight': '1.6'})
-                ], style={
-                    'background': 'rgba(255, 255, 255, 0.15)',
-                    'padding': '20px',
-                    'borderRadius': '10px',
-                    'backdropFilter': 'blur(10px)'
-                })
-            ], style={
+                        f"{level_label(row.Attribute, row.BestLevel)} pets are adopted at ",
+                        html.Span(f"{row.BestRate*100:.1f}%", style={'fontWeight': 'bold', 'color': '#fdfd96'}),
+                        " versus ",
+                        html.Span(f"{row.WorstRate*100:.1f}%", style={'fontWeight': 'bold', 'color': '#fdfd96'}),
+                        f" for {level_label(row.Attribute, row.WorstLevel)} pets."
+                    ], style={'opacity': '0.9', 'lineHeight': '1.6'}),
+                    html.Div(f"MI {row.MutualInfo:.3f} bits · χ² {row.ChiSquare:.1f} · Cramér's V {row.CramersV:.2f}",
+                             style={'opacity': '0.7', 'fontSize': '0.85rem', 'marginTop': '10px'})
+                ], style=card_style)
+                for rank, row in enumerate(ranking.head(INSIGHT_TOP_K).itertuples(), start=1)
+            ] or [html.Div("Not enough pets in the current filter to rank adoption drivers.", style=card_style)], style={
                 'display': 'grid',
                 'gridTemplateColumns': 'repeat(auto-fit, minmax(300px, 1fr))',
                 'gap': '20px'
-            })
+            }),
+            
+            # Full ranking of every attribute
+            html.Table(
+                [html.Tr([html.Th(col) for col in ["Attribute", "Mutual Info (bits)", "χ²", "Cramér's V", "Rate Spread"]])] +
+                [html.Tr([
+                    html.Td(ATTRIBUTE_NAMES.get(row.Attribute, row.Attribute)),
+                    html.Td(f"{row.MutualInfo:.4f}"),
+                    html.Td(f"{row.ChiSquare:.1f}"),
+                    html.Td(f"{row.CramersV:.3f}"),
+                    html.Td(f"{row.RateSpread*100:.1f} pts")
+                ]) for row in ranking.itertuples()],
+                style={'width': '100%', 'textAlign': 'left', 'marginTop': '25px', 'opacity': '0.9'}
+            )
         ], style={
             'background': 'linear-gradient(135deg, #667eea 0%, #764ba2 100%)',
             'color': 'white',
@@ -541,9 +1284,56 @@ def render_insights_tab(pet_type, age_range, vaccine_status, health_condition):
         })
     ])
 
+# Display names for ranked attributes and their binary levels
+ATTRIBUTE_NAMES = {
+    'PetType': 'Pet Type', 'Breed': 'Breed', 'Color': 'Color', 'Size': 'Size', 'Vaccinated': 'Vaccination',
+    'HealthCondition': 'Health', 'PreviousOwner': 'Previous Owner', 'AgeGroup': 'Age'
+}
+INSIGHT_ICONS = {
+    'PetType': '🐕', 'Breed': '🐾', 'Color': '🎨', 'Size': '📏', 'Vaccinated': '🏥',
+    'HealthCondition': '❤️', 'PreviousOwner': '🏠', 'AgeGroup': '🎂'
+}
+BINARY_LEVELS = {
+    'Vaccinated': {1: 'Vaccinated', 0: 'Non-vaccinated'},
+    'HealthCondition': {0: 'Healthy', 1: 'Health-issue'},
+    'PreviousOwner': {1: 'Previously owned', 0: 'First-time'}
+}
+
+def level_label(attribute, level):
+    return BINARY_LEVELS.get(attribute, {}).get(level, str(level))
+
+# Hidden element describing the current filter for the live update script; deltas of ingests up to
+# `version` are already in the base totals
+def live_filter_state(filtered_df, version, pet_type, age_range, vaccine_status, health_condition):
+    state = {
+        'version': version,
+        'filter': {
+            'PetType': pet_type,
+            'AgeRange': age_range,
+            'Vaccinated': vaccine_status,
+            'HealthCondition': health_condition
+        },
+        'base': {
+            'Count': len(filtered_df),
+            'Adopted': int(filtered_df['AdoptionLikelihood'].sum()),
+            'VaccinatedSum': int(filtered_df['Vaccinated'].sum()),
+            'FeeSum': float(filtered_df['AdoptionFee'].sum())
+        }
+    }
+    return html.Div(id='live-filter-state', style={'display': 'none'}, **{'data-state': json.dumps(state)})
+
+# Per-group (count, adopted) sums attached to a rate trace so pushed deltas can update it in place
+def live_rate_meta(group_stats, dimension):
+    return {
+        'customdata': group_stats[['count', 'sum']].values.tolist(),
+        'meta': {'dimension': dimension, 'groups': [g.item() if hasattr(g, 'item') else str(g) for g in group_stats.index]}
+    }
+
 # Chart creation functions for Overview tab
+@timed_chart
 def create_pet_type_adoption_overview(filtered_df):
-    adoption_rates = filtered_df.groupby('PetType')['AdoptionLikelihood'].mean().sort_values(ascending=True)
+    group_stats = filtered_df.groupby('PetType')['AdoptionLikelihood'].agg(['count', 'sum', 'mean']).sort_values('mean')
+    adoption_rates = group_stats['mean']
     
     fig = go.Figure()
     fig.add_trace(go.Bar(
@@ -552,7 +1342,8 @@ def create_pet_type_adoption_overview(filtered_df):
         orientation='h',
         marker_color='#1e3c72',
         text=[f"{val*100:.1f}%" for val in adoption_rates.values],
-        textposition='auto'
+        textposition='auto',
+        **live_rate_meta(group_stats, 'PetType')
     ))
     
     fig.update_layout(
@@ -565,8 +1356,10 @@ def create_pet_type_adoption_overview(filtered_df):
     )
     return fig
 
+@timed_chart
 def create_vaccine_adoption_overview(filtered_df):
-    vaccine_rates = filtered_df.groupby('Vaccinated')['AdoptionLikelihood'].mean()
+    group_stats = filtered_df.groupby('Vaccinated')['AdoptionLikelihood'].agg(['count', 'sum', 'mean'])
+    vaccine_rates = group_stats['mean']
     
     fig = go.Figure()
     fig.add_trace(go.Bar(
@@ -574,7 +1367,8 @@ def create_vaccine_adoption_overview(filtered_df):
         y=vaccine_rates.values * 100,
         marker_color=['#2a5298', '#1e3c72'],
         text=[f"{val*100:.1f}%" for val in vaccine_rates.values],
-        textposition='auto'
+        textposition='auto',
+        **live_rate_meta(group_stats, 'Vaccinated')
     ))
     
     fig.update_layout(
@@ -587,8 +1381,10 @@ def create_vaccine_adoption_overview(filtered_df):
     )
     return fig
 
+@timed_chart
 def create_health_adoption_overview(filtered_df):
-    health_rates = filtered_df.groupby('HealthCondition')['AdoptionLikelihood'].mean()
+    group_stats = filtered_df.groupby('HealthCondition')['AdoptionLikelihood'].agg(['count', 'sum', 'mean'])
+    health_rates = group_stats['mean']
     
     fig = go.Figure()
     fig.add_trace(go.Bar(
@@ -596,7 +1392,8 @@ def create_health_adoption_overview(filtered_df):
         y=health_rates.values * 100,
         marker_color=['#1e3c72', '#2a5298'],
         text=[f"{val*100:.1f}%" for val in health_rates.values],
-        textposition='auto'
+        textposition='auto',
+        **live_rate_meta(group_stats, 'HealthCondition')
     ))
     
     fig.update_layout(
@@ -609,13 +1406,15 @@ def create_health_adoption_overview(filtered_df):
     )
     return fig
 
+@timed_chart
 def create_age_adoption_overview(filtered_df):
     # Create age groups
     age_bins = [0, 1, 3, 7, 15, 100]
     age_labels = ['0-1y', '1-3y', '3-7y', '7-15y', '15+y']
     filtered_df['AgeGroup2'] = pd.cut(filtered_df['AgeYears'], bins=age_bins, labels=age_labels)
     
-    age_group_rates = filtered_df.groupby('AgeGroup2')['AdoptionLikelihood'].mean()
+    group_stats = filtered_df.groupby('AgeGroup2', observed=True)['AdoptionLikelihood'].agg(['count', 'sum', 'mean'])
+    age_group_rates = group_stats['mean']
     
     fig = px.line(
         x=age_group_rates.index,
@@ -624,6 +1423,10 @@ def create_age_adoption_overview(filtered_df):
         markers=True,
         color_discrete_sequence=['#1e3c72']
     )
+    live_meta = live_rate_meta(group_stats, 'AgeMonths')
+    live_meta['meta']['bins'] = age_bins
+    live_meta['meta']['labels'] = age_labels
+    fig.update_traces(**live_meta)
     
     fig.update_layout(
         xaxis_title="Age Group",
@@ -634,8 +1437,10 @@ def create_age_adoption_overview(filtered_df):
     )
     return fig
 
+@timed_chart
 def create_size_adoption_overview(filtered_df):
-    size_rates = filtered_df.groupby('Size')['AdoptionLikelihood'].mean()
+    group_stats = filtered_df.groupby('Size')['AdoptionLikelihood'].agg(['count', 'sum', 'mean'])
+    size_rates = group_stats['mean']
     
     fig = go.Figure()
     fig.add_trace(go.Bar(
@@ -643,7 +1448,8 @@ def create_size_adoption_overview(filtered_df):
         y=size_rates.values * 100,
         marker_color='#1e3c72',
         text=[f"{val*100:.1f}%" for val in size_rates.values],
-        textposition='auto'
+        textposition='auto',
+        **live_rate_meta(group_stats, 'Size')
     ))
     
     fig.update_layout(
@@ -657,17 +1463,33 @@ def create_size_adoption_overview(filtered_df):
     return fig
 
 # Chart creation functions for other tabs
-def create_pet_type_adoption_rates(filtered_df):
-    adoption_rates = filtered_df.groupby('PetType')['AdoptionLikelihood'].mean().sort_values(ascending=True)
+# Asymmetric error bars (in %) from a rate_table's interval bounds
+def rate_error_bars(rates):
+    return dict(
+        type='data',
+        symmetric=False,
+        array=(rates['Upper'] - rates['Rate']) * 100,
+        arrayminus=(rates['Rate'] - rates['Lower']) * 100,
+        color='#7f8c8d',
+        thickness=1.5,
+        width=4
+    )
+
+@timed_chart
+def create_pet_type_adoption_rates(rates):
+    rates = rates.sort_values('Rate')
     
     fig = go.Figure()
     fig.add_trace(go.Bar(
-        y=adoption_rates.index,
-        x=adoption_rates.values * 100,
+        y=rates.index,
+        x=rates['Rate'] * 100,
         orientation='h',
         marker_color='#1e3c72',
-        text=[f"{val*100:.1f}%" for val in adoption_rates.values],
-        textposition='auto'
+        error_x=rate_error_bars(rates),
+        customdata=rates[['Count', 'Lower', 'Upper']].values,
+        hovertemplate="%{y}: %{x:.1f}% (95% Jeffreys interval %{customdata[1]:.1%}-%{customdata[2]:.1%}, n=%{customdata[0]})<extra></extra>",
+        text=[f"{val*100:.1f}%" for val in rates['Rate']],
+        textposition='inside'
     ))
     
     fig.update_layout(
@@ -680,30 +1502,353 @@ def create_pet_type_adoption_rates(filtered_df):
     )
     return fig
 
+@timed_chart
+def create_color_adoption_rates(rates):
+    rates = rates.sort_values('Rate', ascending=False)
+    
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=rates.index,
+        y=rates['Rate'] * 100,
+        marker=dict(color=rates['Rate'] * 100, colorscale='Blues'),
+        error_y=rate_error_bars(rates)
+    ))
+    
+    fig.update_layout(
+        title="",
+        xaxis_title="Color",
+        yaxis_title="Adoption Rate (%)",
+        showlegend=False,
+        height=300,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+@timed_chart
+def create_breed_adoption_rates(rates):
+    rates = rates.sort_values('Rate')
+    
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        y=rates.index,
+        x=rates['Rate'] * 100,
+        orientation='h',
+        marker_color='#1e3c72',
+        error_x=rate_error_bars(rates),
+        text=[f"{val*100:.1f}% (n={n})" for val, n in zip(rates['Rate'], rates['Count'])],
+        textposition='inside'
+    ))
+    
+    fig.update_layout(
+        title="",
+        xaxis_title="Adoption Rate (%)",
+        yaxis_title="Breed",
+        height=300,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+@timed_chart
 def create_age_adoption_trend(filtered_df):
     age_bins = [0, 1, 3, 7, 15, 100]
     age_labels = ['0-1y', '1-3y', '3-7y', '7-15y', '15+y']
     filtered_df['AgeGroup2'] = pd.cut(filtered_df['AgeYears'], bins=age_bins, labels=age_labels)
     
-    age_group_rates = filtered_df.groupby('AgeGroup2')['AdoptionLikelihood'].mean()
+    age_group_rates = filtered_df.groupby('AgeGroup2', observed=True)[['AdoptionLikelihood', 'PredictedLikelihood']].mean()
     
-    fig = px.line(
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
         x=age_group_rates.index,
-        y=age_group_rates.values * 100,
-        title="",
-        markers=True,
-        color_discrete_sequence=['#1e3c72']
-    )
+        y=age_group_rates['AdoptionLikelihood'].values * 100,
+        mode='lines+markers',
+        name='Actual',
+        line=dict(color='#1e3c72')
+    ))
+    
+    # Model-predicted rate for the same animals
+    fig.add_trace(go.Scatter(
+        x=age_group_rates.index,
+        y=age_group_rates['PredictedLikelihood'].values * 100,
+        mode='lines+markers',
+        name='Predicted',
+        line=dict(color='#95a5a6', dash='dash')
+    ))
     
     fig.update_layout(
+        title="",
         xaxis_title="Age Group",
         yaxis_title="Adoption Rate (%)",
+        legend=dict(orientation='h', y=1.1),
         height=350,
         plot_bgcolor='rgba(0,0,0,0)',
         paper_bgcolor='rgba(0,0,0,0)'
     )
     return fig
 
+# Stacked adopted / not adopted bars from a re-binned histogram
+def histogram_figure(hist, xaxis_title, scale=1.0):
+    centers = (hist['BinStart'] + hist['BinEnd']) / 2 * scale
+    widths = (hist['BinEnd'] - hist['BinStart']) * scale
+    
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=centers, y=hist['NotAdopted'], width=widths, name='Not Adopted', marker_color='#2a5298'))
+    fig.add_trace(go.Bar(x=centers, y=hist['Adopted'], width=widths, name='Adopted', marker_color='#f093fb'))
+    
+    fig.update_layout(
+        barmode='stack',
+        bargap=0,
+        xaxis_title=xaxis_title,
+        yaxis_title="Count",
+        legend=dict(orientation='h', y=1.1),
+        height=300,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+@timed_chart
+def create_age_distribution(hist):
+    return histogram_figure(hist, "Age (years)", scale=1 / 12)
+
+@timed_chart
+def create_weight_distribution(hist):
+    return histogram_figure(hist, "Weight (kg)")
+
+@timed_chart
+def create_adoption_fee_analysis(hist):
+    return histogram_figure(hist, "Adoption Fee ($)")
+
+@timed_chart
+def create_shelter_days_distribution(hist):
+    return histogram_figure(hist, "Time in Shelter (days)")
+
+# One precomputed box per group (q1/median/q3/fences from box_summary)
+def box_plot_figure(summaries, yaxis_title, xaxis_title="Pet Type"):
+    fig = go.Figure()
+    for group, summary in summaries.items():
+        fig.add_trace(go.Box(
+            name=str(group),
+            q1=[summary['q1']],
+            median=[summary['median']],
+            q3=[summary['q3']],
+            lowerfence=[summary['lowerfence']],
+            upperfence=[summary['upperfence']],
+            mean=[summary['mean']],
+            boxpoints=False
+        ))
+    
+    fig.update_layout(
+        xaxis_title=xaxis_title,
+        yaxis_title=yaxis_title,
+        showlegend=False,
+        height=350,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+@timed_chart
+def create_shelter_time_analysis(summaries):
+    return box_plot_figure(summaries, "Time in Shelter (days)")
+
+@timed_chart
+def create_fee_box_plot(summaries):
+    return box_plot_figure(summaries, "Adoption Fee ($)")
+
+@timed_chart
+def create_age_box_plot(summaries):
+    return box_plot_figure(summaries, "Age (months)")
+
+# RGBA image of a density grid: hue from adoption rate (blue = low, pink = high), opacity from log density
+def density_image_figure(grid, xaxis_title, yaxis_title):
+    counts, rates = grid['counts'], grid['rates']
+    low, high = np.array([42, 82, 152]), np.array([240, 147, 251])
+    rate = np.nan_to_num(rates)[..., None]
+    rgb = low + (high - low) * rate
+    alpha = np.where(counts > 0, 0.25 + 0.75 * np.log1p(counts) / np.log1p(max(counts.max(), 1)), 0.0)
+    image = np.dstack([rgb, alpha[..., None] * 255]).astype(np.uint8)
+    
+    x_edges, y_edges = grid['x_edges'], grid['y_edges']
+    dx, dy = x_edges[1] - x_edges[0], y_edges[1] - y_edges[0]
+    hover = [[f"n={int(c)}, adoption {r*100:.0f}%" if c > 0 else "" for c, r in zip(count_row, rate_row)]
+             for count_row, rate_row in zip(counts, rates)]
+    
+    fig = go.Figure(go.Image(
+        z=image,
+        colormodel='rgba256',
+        x0=x_edges[0] + dx / 2,
+        dx=dx,
+        y0=y_edges[0] + dy / 2,
+        dy=dy,
+        hovertext=hover,
+        hoverinfo='text'
+    ))
+    
+    fig.update_layout(
+        xaxis_title=xaxis_title,
+        yaxis_title=yaxis_title,
+        yaxis=dict(autorange=True),
+        height=400,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+@timed_chart
+def create_weight_fee_scatter(grid):
+    return density_image_figure(grid, "Weight (kg)", "Adoption Fee ($)")
+
+@timed_chart
+def create_weight_age_analysis(grid):
+    return density_image_figure(grid, "Age (months)", "Weight (kg)")
+
+# Individual markers split by adoption outcome; WebGL (Scattergl) once the point count passes the threshold
+def scatter_points_figure(points, visible, x_col, y_col, xaxis_title, yaxis_title, x_view=None, y_view=None):
+    trace_type = go.Scattergl if len(points) > WEBGL_THRESHOLD else go.Scatter
+    fig = go.Figure()
+    for outcome, name, color in [(0, 'Not Adopted', '#2a5298'), (1, 'Adopted', '#f093fb')]:
+        group = points[points['AdoptionLikelihood'] == outcome]
+        fig.add_trace(trace_type(
+            x=group[x_col],
+            y=group[y_col],
+            mode='markers',
+            name=name,
+            text='Pet ' + group['PetID'].astype(str) + ' (' + group['PetType'] + ')',
+            hoverinfo='text+x+y',
+            marker=dict(color=color, size=5, opacity=0.6)
+        ))
+    
+    fig.update_layout(
+        title=dict(text=f"{len(points):,} of {visible:,} pets shown", font=dict(size=12), x=0.99, xanchor='right'),
+        xaxis_title=xaxis_title,
+        yaxis_title=yaxis_title,
+        legend=dict(orientation='h', y=1.1),
+        height=400,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    # Keep the user's zoom when the denser points for that range come back
+    if x_view:
+        fig.update_xaxes(range=list(x_view))
+    if y_view:
+        fig.update_yaxes(range=list(y_view))
+    return fig
+
+@timed_chart
+def create_weight_fee_points(points, visible, x_view=None, y_view=None):
+    return scatter_points_figure(points, visible, 'WeightKg', 'AdoptionFee', "Weight (kg)", "Adoption Fee ($)", x_view, y_view)
+
+@timed_chart
+def create_weight_age_points(points, visible, x_view=None, y_view=None):
+    return scatter_points_figure(points, visible, 'AgeMonths', 'WeightKg', "Age (months)", "Weight (kg)", x_view, y_view)
+
+SCATTER_VIEWS = {
+    'weight-fee-scatter': (create_weight_fee_scatter, create_weight_fee_points),
+    'weight-age-analysis': (create_weight_age_analysis, create_weight_age_points)
+}
+
+@timed_chart
+def create_age_weight_fee_3d(sample):
+    fig = go.Figure()
+    for outcome, name, color in [(0, 'Not Adopted', '#2a5298'), (1, 'Adopted', '#f093fb')]:
+        group = sample[sample['AdoptionLikelihood'] == outcome]
+        fig.add_trace(go.Scatter3d(
+            x=group['AgeYears'],
+            y=group['WeightKg'],
+            z=group['AdoptionFee'],
+            mode='markers',
+            name=name,
+            marker=dict(color=color, size=3 + group['TimeInShelterDays'] / 15, opacity=0.7)
+        ))
+    
+    fig.update_layout(
+        scene=dict(
+            xaxis_title="Age (years)",
+            yaxis_title="Weight (kg)",
+            zaxis_title="Adoption Fee ($)"
+        ),
+        legend=dict(orientation='h', y=1.05),
+        margin=dict(t=0, b=0, l=0, r=0),
+        height=500,
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+@timed_chart
+def create_correlation_matrix(correlation):
+    fig = px.imshow(
+        correlation.values,
+        x=list(correlation.columns),
+        y=list(correlation.index),
+        title="",
+        color_continuous_scale='RdBu',
+        zmin=-1,
+        zmax=1,
+        text_auto='.2f',
+        aspect="auto"
+    )
+    
+    fig.update_layout(
+        height=400,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+@timed_chart
+def create_pivot_heatmap(values, counts, rows, columns, fmt):
+    x = [level_label(columns, col) for col in values.columns] if columns else list(values.columns)
+    y = [level_label(rows, index) for index in values.index]
+    z = values.to_numpy(dtype=float)
+    text = [[fmt(v) if np.isfinite(v) else "" for v in row] for row in z]
+    fig = go.Figure(go.Heatmap(
+        z=z,
+        x=x,
+        y=y,
+        text=text,
+        texttemplate='%{text}',
+        customdata=counts.reindex(index=values.index, columns=values.columns).to_numpy(),
+        hovertemplate='%{y} / %{x}<br>%{text}<br>n=%{customdata}<extra></extra>',
+        colorscale=[[0, '#e8eaf6'], [1, '#1e3c72']],
+        showscale=False
+    ))
+    
+    fig.update_layout(
+        xaxis_title=columns or "",
+        yaxis_title=rows,
+        yaxis=dict(autorange='reversed'),
+        height=450,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+@timed_chart
+def create_survival_curves(curves):
+    fig = go.Figure()
+    for group, curve in curves.groupby('Group'):
+        # Start every curve at day 0 with everyone still waiting
+        fig.add_trace(go.Scatter(
+            x=[0] + curve['Time'].tolist(),
+            y=[100] + (curve['Survival'] * 100).tolist(),
+            mode='lines',
+            line_shape='hv',
+            name=str(group)
+        ))
+    
+    fig.update_layout(
+        xaxis_title="Days in Shelter",
+        yaxis_title="Not Yet Adopted (%)",
+        yaxis_range=[0, 100],
+        height=400,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+@timed_chart
 def create_vaccine_health_interaction(filtered_df):
     cross_table = pd.pivot_table(
         filtered_df, 